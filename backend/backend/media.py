@@ -0,0 +1,230 @@
+import mimetypes
+import os
+import re
+
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils._os import safe_join
+from django.utils.http import http_date, parse_http_date_safe
+from django.views.decorators.http import require_http_methods
+
+_RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+_VERSION_RE = re.compile(r'^[0-9a-f]+$')
+_CHUNK_SIZE = 64 * 1024
+# Files under these dirs are named after the hash of the image they were rendered from.
+_HASHED_SUBDIRS = ('exercise_image_variants/',)
+# Shortest ``?v=`` hash prefix accepted as a content version (audio URLs use 12).
+MIN_VERSION_LENGTH = 12
+IMMUTABLE_MAX_AGE = 60 * 60 * 24 * 365
+
+
+def _catalog_hash(rel_path: str, size: int):
+    """Content hash already recorded for catalogued images, word and sentence audio, if it still matches."""
+    from daily_routine.models import SentenceAudio
+    from daily_routine.services.sentence_audio import SENTENCE_AUDIO_SUBDIR
+    from vocabulary.models import AudioManifest, ExerciseImage
+    from vocabulary.services.audio import AUDIO_SUBDIR
+    from vocabulary.services.image_catalog import IMAGES_SUBDIR
+
+    directory, name = os.path.split(rel_path)
+    if directory == IMAGES_SUBDIR:
+        qs = ExerciseImage.objects.filter(name=name, size=size)
+    elif directory == AUDIO_SUBDIR:
+        qs = AudioManifest.objects.filter(file_name=name, byte_size=size)
+    elif directory.startswith(SENTENCE_AUDIO_SUBDIR + '/'):
+        qs = SentenceAudio.objects.filter(file_name=rel_path, byte_size=size)
+    else:
+        return None
+    return qs.exclude(content_hash='').values_list('content_hash', flat=True).first()
+
+
+def _image_storage_path(rel_path: str):
+    """Storage path of a catalogued exercise image when it is not stored under its own name.
+
+    Duplicate uploads point at the file of the image they duplicate, and
+    replacements are saved under a fresh storage name.
+    """
+    from vocabulary.models import ExerciseImage
+    from vocabulary.services.image_catalog import IMAGES_SUBDIR
+
+    directory, name = os.path.split(rel_path)
+    if directory != IMAGES_SUBDIR:
+        return None
+    storage_path = ExerciseImage.objects.filter(name=name).values_list('storage_path', flat=True).first()
+    if not storage_path or storage_path.replace(os.sep, '/') == rel_path:
+        return None
+    return storage_path.replace(os.sep, '/')
+
+
+def validators(rel_path: str, st):
+    """Return ``(etag, digest)`` for a media file without reading it.
+
+    Catalog rows supply a SHA-256 for exercise images, word audio and
+    sentence audio, which becomes a strong ETag and ``digest``. Other files
+    get an ETag built from mtime and size, and ``digest`` is ``None``.
+    """
+    digest = _catalog_hash(rel_path, st.st_size)
+    if digest:
+        return f'"{digest}"', digest
+    return f'"{st.st_mtime_ns:x}-{st.st_size:x}"', None
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    tags = [t.strip() for t in header.split(',')]
+    return '*' in tags or etag in tags or f'W/{etag}' in tags
+
+
+def _parse_range(header: str, size: int):
+    """Return ``(start, end)`` for a single byte range, ``None`` to serve the whole
+    file, or ``False`` when the range cannot be satisfied."""
+    m = _RANGE_RE.match(header.strip())
+    if not m:
+        # Multiple ranges or other units: answering with the full body is allowed.
+        return None
+    first, last = m.groups()
+    if not first and not last:
+        return None
+    if not first:
+        length = int(last)
+        if length == 0:
+            return False
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def _iter_range(full_path: str, start: int, length: int):
+    with open(full_path, 'rb') as fh:
+        fh.seek(start)
+        remaining = length
+        while remaining > 0:
+            data = fh.read(min(_CHUNK_SIZE, remaining))
+            if not data:
+                break
+            remaining -= len(data)
+            yield data
+
+
+def _cache_control(request, rel_path: str, digest) -> str:
+    version = (request.GET.get('v') or '').lower()
+    versioned = (
+        digest is not None and len(version) >= MIN_VERSION_LENGTH
+        and _VERSION_RE.match(version) and digest.startswith(version)
+    )
+    if rel_path.startswith(_HASHED_SUBDIRS) or versioned:
+        return f'public, max-age={IMMUTABLE_MAX_AGE}, immutable'
+    return f'public, max-age={settings.MEDIA_CACHE_MAX_AGE}'
+
+
+@require_http_methods(['GET', 'HEAD'])
+def serve_media(request, path: str):
+    """Serve a file from ``MEDIA_ROOT`` with validators, ranges and proxy hand-off.
+
+    ETags come from catalogued content hashes, or mtime and size for other
+    files. ``If-None-Match`` and ``If-Modified-Since`` answer 304, single byte
+    ranges answer 206 (honouring ``If-Range``), and variant files or
+    ``?v=<hash prefix>`` URLs of at least ``MIN_VERSION_LENGTH`` hex digits
+    that match the catalogued hash are marked immutable. With ``MEDIA_SENDFILE_BACKEND`` set, the body is left to nginx
+    (``X-Accel-Redirect``) or Apache (``X-Sendfile``).
+    """
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+    except Exception:
+        raise Http404('Not found')
+    rel_path = os.path.relpath(full_path, settings.MEDIA_ROOT).replace(os.sep, '/')
+    # ``rel_path`` names the resource; ``stored_path`` is where its bytes live.
+    stored_path = _image_storage_path(rel_path) or rel_path
+    if stored_path != rel_path:
+        full_path = safe_join(settings.MEDIA_ROOT, stored_path)
+    try:
+        st = os.stat(full_path)
+    except OSError:
+        raise Http404('Not found')
+    if not os.path.isfile(full_path) or os.path.basename(full_path).startswith('.'):
+        raise Http404('Not found')
+
+    etag, digest = validators(rel_path, st)
+    last_modified = http_date(st.st_mtime)
+    headers = {
+        'ETag': etag,
+        'Last-Modified': last_modified,
+        'Cache-Control': _cache_control(request, rel_path, digest),
+        'Accept-Ranges': 'bytes',
+    }
+
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match:
+        not_modified = _etag_matches(if_none_match, etag)
+    else:
+        since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE', ''))
+        not_modified = since is not None and int(st.st_mtime) <= since
+    if not_modified:
+        response = HttpResponseNotModified()
+        for k, v in headers.items():
+            response[k] = v
+        return response
+
+    content_type, encoding = mimetypes.guess_type(full_path)
+    content_type = content_type or 'application/octet-stream'
+
+    backend = settings.MEDIA_SENDFILE_BACKEND
+    if backend in ('nginx', 'apache'):
+        # The proxy streams the body and answers Range itself.
+        response = HttpResponse(content_type=content_type)
+        if backend == 'nginx':
+            response['X-Accel-Redirect'] = settings.MEDIA_ACCEL_REDIRECT_PREFIX.rstrip('/') + '/' + stored_path
+        else:
+            response['X-Sendfile'] = full_path
+        for k, v in headers.items():
+            response[k] = v
+        return response
+
+    size = st.st_size
+    byte_range = None
+    range_header = request.META.get('HTTP_RANGE')
+    if range_header:
+        if_range = request.META.get('HTTP_IF_RANGE')
+        if not if_range or if_range.strip() in (etag, last_modified):
+            byte_range = _parse_range(range_header, size)
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        for k, v in headers.items():
+            response[k] = v
+        return response
+
+    if byte_range is None:
+        if request.method == 'HEAD':
+            response = HttpResponse(content_type=content_type)
+        else:
+            response = FileResponse(open(full_path, 'rb'), content_type=content_type)
+        response['Content-Length'] = str(size)
+    else:
+        start, end = byte_range
+        length = end - start + 1
+        body = () if request.method == 'HEAD' else _iter_range(full_path, start, length)
+        response = StreamingHttpResponse(body, status=206, content_type=content_type)
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Length'] = str(length)
+    if encoding:
+        response['Content-Encoding'] = encoding
+    for k, v in headers.items():
+        response[k] = v
+    return response
+
+
+@require_http_methods(['GET', 'HEAD'])
+def serve_public_media(request, path: str):
+    """Unauthenticated ``MEDIA_URL`` route, limited to ``MEDIA_PUBLIC_SUBDIRS``.
+
+    Everything else under ``MEDIA_ROOT`` (lesson videos and PDFs, partial
+    uploads) is only served here with ``DEBUG`` on, as ``static()`` did before;
+    lesson files are served to signed-in users by ``lessons.views.lesson_media``.
+    """
+    top = path.lstrip('/').split('/', 1)[0]
+    if top not in settings.MEDIA_PUBLIC_SUBDIRS and not settings.DEBUG:
+        raise Http404('Not found')
+    return serve_media(request, path)
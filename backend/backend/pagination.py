@@ -0,0 +1,92 @@
+import base64
+import binascii
+import json
+from typing import Iterable, List, Optional, Tuple
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q, QuerySet
+from django.utils.dateparse import parse_datetime
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+class InvalidPageRequest(ValueError):
+    pass
+
+
+def wants_page(request) -> bool:
+    """Listings stay unpaginated unless the client passes ``limit`` or ``cursor``."""
+    return 'limit' in request.query_params or 'cursor' in request.query_params
+
+
+def parse_fields(request, allowed: Iterable[str]) -> Optional[List[str]]:
+    """Return the requested ``fields=a,b`` subset of ``allowed``, or ``None`` for all."""
+    raw = request.query_params.get('fields')
+    if not raw:
+        return None
+    allowed = list(allowed)
+    wanted = [f.strip() for f in raw.split(',') if f.strip()]
+    unknown = [f for f in wanted if f not in allowed]
+    if unknown:
+        raise InvalidPageRequest(f'Unknown fields: {", ".join(unknown)}')
+    return [f for f in allowed if f in wanted]
+
+
+def encode_cursor(created_at, pk) -> str:
+    raw = json.dumps([created_at.isoformat(), pk], separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token: str, pk_field=None):
+    """Return ``(created_at, pk)`` from a cursor, with ``pk`` cleaned by ``pk_field``.
+
+    Anything that would not survive the page query, such as a non-numeric pk
+    for an integer key, is rejected here as :class:`InvalidPageRequest`.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        created_at, pk = json.loads(raw)
+        ts = parse_datetime(created_at)
+        if pk_field is not None:
+            pk = pk_field.to_python(pk)
+    except (binascii.Error, ValueError, TypeError, ValidationError):
+        raise InvalidPageRequest('Invalid cursor')
+    if ts is None or pk is None or isinstance(pk, (list, dict)):
+        raise InvalidPageRequest('Invalid cursor')
+    return ts, pk
+
+
+def keyset_page(request, qs: QuerySet) -> Tuple[list, Optional[str]]:
+    """Fetch one page of ``qs`` newest first, keyed on ``(created_at, pk)``.
+
+    The cursor encodes the last row of the previous page, so pages stay stable
+    while rows are inserted or deleted. Returns the rows and the cursor for the
+    next page (``None`` on the last page).
+    """
+    try:
+        limit = int(request.query_params.get('limit') or DEFAULT_PAGE_SIZE)
+    except ValueError:
+        raise InvalidPageRequest('Invalid limit')
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    qs = qs.order_by('-created_at', '-pk')
+    cursor = request.query_params.get('cursor')
+    if cursor:
+        ts, pk = decode_cursor(cursor, qs.model._meta.pk)
+        qs = qs.filter(Q(created_at__lt=ts) | Q(created_at=ts, pk__lt=pk))
+    rows = list(qs[:limit + 1])
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1].created_at, rows[-1].pk)
+
+
+class DynamicFieldsMixin:
+    """Serializer mixin that keeps only ``context['fields']`` when it is set."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fields = self.context.get('fields')
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
@@ -0,0 +1,155 @@
+from datetime import timezone as dt_timezone
+from typing import Dict, List
+
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+MAX_SYNC_ITEMS = 500
+MAX_EVENT_ID_LENGTH = 64
+
+# Per-item outcomes
+SYNC_CREATED = 'created'
+SYNC_UPDATED = 'updated'
+SYNC_UNCHANGED = 'unchanged'
+SYNC_STALE = 'stale'
+SYNC_DUPLICATE = 'duplicate'
+SYNC_NOT_FOUND = 'not_found'
+SYNC_INVALID = 'invalid'
+
+
+def _clean_record(raw, now, kind):
+    if not isinstance(raw, dict):
+        raise ValueError('Record must be an object')
+    if raw.get('kind') not in (None, kind):
+        raise ValueError(f"Wrong kind for this endpoint (expected '{kind}')")
+    event_id = raw.get('event_id')
+    if event_id is not None and (
+        not isinstance(event_id, str) or not event_id.strip() or len(event_id.strip()) > MAX_EVENT_ID_LENGTH
+    ):
+        raise ValueError(f'event_id must be a non-empty string of at most {MAX_EVENT_ID_LENGTH} characters')
+    if event_id is None and not raw.get('completed_at'):
+        raise ValueError('completed_at is required when event_id is omitted')
+    try:
+        set_id = int(raw.get('set_id'))
+        correct = int(raw.get('correct_count') or 0)
+        total = int(raw.get('total_count') or 0)
+    except (TypeError, ValueError):
+        raise ValueError('Invalid set_id or counts')
+    completed_at = now
+    if raw.get('completed_at'):
+        completed_at = parse_datetime(str(raw['completed_at']))
+        if completed_at is None:
+            raise ValueError('Invalid completed_at')
+        if timezone.is_naive(completed_at):
+            completed_at = timezone.make_aware(completed_at, dt_timezone.utc)
+        completed_at = min(completed_at, now)
+    if event_id is None:
+        # Without a client id the record is deduplicated on (set_id, completed_at).
+        event_id = f'{set_id}@{completed_at.isoformat()}'
+    return event_id.strip(), set_id, max(0, correct), max(0, total), completed_at
+
+
+def sync_progress(user, records: List, set_model, progress_model, event_model, kind: str) -> List[Dict]:
+    """Record completions for many sets at once, as sent by an offline client.
+
+    Records are ``{kind, set_id, correct_count, total_count, completed_at}``
+    plus an optional client-generated ``event_id``. ``kind`` may be omitted
+    but must otherwise match the endpoint. A record without ``event_id`` must
+    carry ``completed_at`` and is keyed on ``(set_id, completed_at)`` instead.
+    Keys already applied for the user, kept in ``event_model``, are answered
+    as ``duplicate`` and skipped, so a retried batch is a no-op. Set ids are checked with one query and every changed row
+    is written with one bulk upsert. A record older than the stored completion
+    is reported as ``stale`` and ignored, so batches delivered out of order
+    never roll progress back. Run inside a transaction: the event insert
+    raises ``IntegrityError`` if the same events are being synced
+    concurrently. Returns one result dict per record, in input order.
+    """
+    now = timezone.now()
+    results = []
+    cleaned = []
+    batch_events = set()
+    for index, raw in enumerate(records):
+        try:
+            event_id, set_id, correct, total, completed_at = _clean_record(raw, now, kind)
+        except ValueError as e:
+            results.append({'index': index, 'status': SYNC_INVALID, 'error': str(e)})
+            continue
+        result = {'index': index, 'event_id': event_id, 'set_id': set_id}
+        results.append(result)
+        if event_id in batch_events:
+            result['status'] = SYNC_DUPLICATE
+            continue
+        batch_events.add(event_id)
+        cleaned.append((result, event_id, set_id, correct, total, completed_at))
+
+    applied = set(
+        event_model.objects.filter(user=user, event_id__in=batch_events).values_list('event_id', flat=True)
+    )
+    items = []
+    for item in cleaned:
+        if item[1] in applied:
+            item[0]['status'] = SYNC_DUPLICATE
+        else:
+            items.append(item)
+    if not items:
+        return results
+
+    ids = {c[2] for c in items}
+    valid_ids = set(set_model.objects.filter(pk__in=ids).values_list('pk', flat=True))
+    stored = {
+        p.exercise_set_id: p
+        for p in progress_model.objects.filter(user=user, exercise_set_id__in=valid_ids)
+    }
+    # The latest completion per set wins, within the batch and against stored rows.
+    latest = {}
+    events = []
+    for result, event_id, set_id, correct, total, completed_at in items:
+        if set_id not in valid_ids:
+            result['status'] = SYNC_NOT_FOUND
+            continue
+        events.append(event_model(user=user, event_id=event_id, exercise_set_id=set_id, created_at=now))
+        current = latest.get(set_id)
+        if current is not None and current[3] > completed_at:
+            result['status'] = SYNC_STALE
+            continue
+        if current is not None:
+            current[0]['status'] = SYNC_STALE
+        latest[set_id] = (result, correct, total, completed_at)
+    event_model.objects.bulk_create(events)
+
+    rows = []
+    for set_id, (result, correct, total, completed_at) in latest.items():
+        existing = stored.get(set_id)
+        if existing is None:
+            result['status'] = SYNC_CREATED
+        elif existing.completed_at and existing.completed_at > completed_at:
+            result['status'] = SYNC_STALE
+            continue
+        elif (existing.completed_at, existing.correct_count, existing.total_count) == (completed_at, correct, total):
+            result['status'] = SYNC_UNCHANGED
+            continue
+        else:
+            result['status'] = SYNC_UPDATED
+        rows.append(progress_model(
+            user=user,
+            exercise_set_id=set_id,
+            correct_count=correct,
+            total_count=total,
+            completed_at=completed_at,
+            updated_at=now,
+        ))
+    if rows:
+        progress_model.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=['user', 'exercise_set'],
+            update_fields=['correct_count', 'total_count', 'completed_at', 'updated_at'],
+        )
+    return results
+
+
+def sync_response_data(results: List[Dict]) -> Dict:
+    counts = {}
+    for r in results:
+        counts[r['status']] = counts.get(r['status'], 0) + 1
+    return {'results': results, 'counts': counts}
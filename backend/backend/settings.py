@@ -190,3 +190,68 @@ EMAIL_USE_TLS = True
 EMAIL_HOST_USER = config('EMAIL_HOST_USER', default='')
 EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', default='')
 DEFAULT_FROM_EMAIL = 'Dailyspanish'
+
+# Cache (per-process by default; point CACHE_BACKEND at Redis/Memcached to share across workers)
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='dailyspanish'),
+    }
+}
+
+# Vocabulary question banks: pre-shuffled question variants per set, keyed by set content_version
+VOCABULARY_QUESTION_BANK_TTL = config('VOCABULARY_QUESTION_BANK_TTL', default=60 * 60 * 24, cast=int)
+VOCABULARY_QUESTION_BANK_VARIANTS = config('VOCABULARY_QUESTION_BANK_VARIANTS', default=8, cast=int)
+
+# Daily routine drills: sentences and seeded sessions cached per set content version
+DAILY_ROUTINE_QUESTION_TTL = config('DAILY_ROUTINE_QUESTION_TTL', default=60 * 60 * 24, cast=int)
+# Rows per bulk_create/commit when importing CSV/XLSX sentence files
+DAILY_ROUTINE_IMPORT_BATCH_SIZE = config('DAILY_ROUTINE_IMPORT_BATCH_SIZE', default=2000, cast=int)
+
+# Vocabulary audio generation queue (processed by `manage.py run_audio_worker`)
+AUDIO_QUEUE_WORKERS = config('AUDIO_QUEUE_WORKERS', default=4, cast=int)
+AUDIO_QUEUE_MAX_ATTEMPTS = config('AUDIO_QUEUE_MAX_ATTEMPTS', default=5, cast=int)
+AUDIO_QUEUE_RETRY_BASE_SECONDS = config('AUDIO_QUEUE_RETRY_BASE_SECONDS', default=30, cast=int)
+AUDIO_QUEUE_LEASE_SECONDS = config('AUDIO_QUEUE_LEASE_SECONDS', default=600, cast=int)
+
+# Text-to-speech backend: 'gtts' (network), 'espeak' or 'piper' (local; MP3 encoding via ffmpeg)
+TTS_BACKEND = config('TTS_BACKEND', default='gtts')
+TTS_LANGUAGE = config('TTS_LANGUAGE', default='es')
+TTS_BATCH_SIZE = config('TTS_BATCH_SIZE', default=32, cast=int)
+TTS_ESPEAK_BINARY = config('TTS_ESPEAK_BINARY', default='espeak-ng')
+TTS_PIPER_BINARY = config('TTS_PIPER_BINARY', default='piper')
+TTS_PIPER_MODEL = config('TTS_PIPER_MODEL', default='')
+TTS_FFMPEG_BINARY = config('TTS_FFMPEG_BINARY', default='ffmpeg')
+
+# Parsed vocabulary documents are cached between the parse (preview) and upload (confirm) steps
+VOCABULARY_PARSE_CACHE_TTL = config('VOCABULARY_PARSE_CACHE_TTL', default=60 * 30, cast=int)
+
+# Threads used to stream a bulk image upload to disk
+IMAGE_UPLOAD_WORKERS = config('IMAGE_UPLOAD_WORKERS', default=4, cast=int)
+
+# Resized WebP/JPEG variants generated for exercise images (`manage.py generate_image_variants` backfills)
+IMAGE_VARIANT_WIDTHS = [int(w) for w in config('IMAGE_VARIANT_WIDTHS', default='160,320,640').split(',') if w.strip()]
+IMAGE_VARIANT_QUALITY = config('IMAGE_VARIANT_QUALITY', default=80, cast=int)
+
+# Answer event log: events are buffered per process and appended in bulk (COPY on PostgreSQL).
+# A failed batch is retried on later flushes, up to ANSWER_EVENT_WRITE_ATTEMPTS writes in total.
+ANSWER_EVENT_FLUSH_SIZE = config('ANSWER_EVENT_FLUSH_SIZE', default=1000, cast=int)
+ANSWER_EVENT_FLUSH_INTERVAL = config('ANSWER_EVENT_FLUSH_INTERVAL', default=2.0, cast=float)
+ANSWER_EVENT_BUFFER_MAX = config('ANSWER_EVENT_BUFFER_MAX', default=100000, cast=int)
+ANSWER_EVENT_WRITE_ATTEMPTS = config('ANSWER_EVENT_WRITE_ATTEMPTS', default=5, cast=int)
+
+# Media serving (backend.media.serve_media): max-age for unversioned files, and an optional
+# front-proxy hand-off: 'nginx' (X-Accel-Redirect to MEDIA_ACCEL_REDIRECT_PREFIX) or 'apache' (X-Sendfile)
+MEDIA_CACHE_MAX_AGE = config('MEDIA_CACHE_MAX_AGE', default=3600, cast=int)
+MEDIA_SENDFILE_BACKEND = config('MEDIA_SENDFILE_BACKEND', default='')
+MEDIA_ACCEL_REDIRECT_PREFIX = config('MEDIA_ACCEL_REDIRECT_PREFIX', default='/protected-media/')
+# Top-level MEDIA_ROOT directories the unauthenticated MEDIA_URL route serves outside DEBUG
+MEDIA_PUBLIC_SUBDIRS = [d.strip() for d in config(
+    'MEDIA_PUBLIC_SUBDIRS', default='exercise_images,exercise_image_variants,exercise_audio,routine_audio',
+).split(',') if d.strip()]
+
+# Resumable chunked lesson uploads (lessons.services.chunked_upload); stale ones are removed
+# by `manage.py purge_lesson_uploads`
+LESSON_UPLOAD_MAX_BYTES = config('LESSON_UPLOAD_MAX_BYTES', default=10 * 1024 ** 3, cast=int)
+LESSON_UPLOAD_MAX_CHUNK_BYTES = config('LESSON_UPLOAD_MAX_CHUNK_BYTES', default=64 * 1024 ** 2, cast=int)
+LESSON_UPLOAD_EXPIRY_HOURS = config('LESSON_UPLOAD_EXPIRY_HOURS', default=48, cast=int)
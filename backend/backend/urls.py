@@ -15,9 +15,10 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 from django.conf import settings
-from django.conf.urls.static import static
+
+from .media import serve_public_media
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -27,7 +28,5 @@ urlpatterns = [
     path('api/notifications/', include('notifications.urls')),
     path('api/v1/vocabulary-exercises/', include('vocabulary.urls')),
     path('api/v1/daily-routine-exercises/', include('daily_routine.urls')),
+    re_path(r'^%s(?P<path>.+)$' % settings.MEDIA_URL.lstrip('/'), serve_public_media),
 ]
-
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
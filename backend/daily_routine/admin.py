@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import DailyRoutineExerciseSet, DailyRoutineEntry
+from .models import DailyRoutineExerciseSet, DailyRoutineEntry, SentenceAudio
 
 
 @admin.register(DailyRoutineExerciseSet)
@@ -10,6 +10,12 @@ class DailyRoutineExerciseSetAdmin(admin.ModelAdmin):
 
 @admin.register(DailyRoutineEntry)
 class DailyRoutineEntryAdmin(admin.ModelAdmin):
-    list_display = ('spanish_sentence', 'english_sentence', 'created_at')
+    list_display = ('spanish_sentence', 'english_sentence', 'near_duplicate_of', 'created_at')
     search_fields = ('spanish_sentence', 'english_sentence')
 
+
+
+@admin.register(SentenceAudio)
+class SentenceAudioAdmin(admin.ModelAdmin):
+    list_display = ('sentence_key', 'file_name', 'duration_ms', 'byte_size', 'updated_at')
+    search_fields = ('sentence_key', 'file_name')
@@ -0,0 +1,44 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from daily_routine.services.sentence_import import SentenceImportError, import_sentences, iter_sentence_rows
+
+
+class Command(BaseCommand):
+    help = "Stream a CSV or XLSX file of Spanish/English sentence pairs into daily routine exercise sets."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV or XLSX file with spanish_sentence and english_sentence columns")
+        parser.add_argument("--user", required=True, help="Email of the user the sets are created by")
+        parser.add_argument("--group-by", help="Column whose value starts a new set (and titles it)")
+        parser.add_argument("--set-size", type=int, help="Sentences per set when not grouping by a column")
+        parser.add_argument("--batch-size", type=int, help="Rows per bulk insert and commit")
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        try:
+            user = User.objects.get(email=options["user"])
+        except User.DoesNotExist:
+            raise CommandError(f"No user with email {options['user']}")
+
+        start = time.perf_counter()
+        try:
+            with open(options["path"], "rb") as fh:
+                rows = iter_sentence_rows(fh, options["path"], group_column=options["group_by"])
+                summary = import_sentences(rows, user, set_size=options["set_size"], batch_size=options["batch_size"])
+        except (OSError, SentenceImportError) as e:
+            raise CommandError(str(e))
+        elapsed = time.perf_counter() - start
+
+        for error in summary["errors"]:
+            self.stderr.write(f"line {error['line']}: {error['error']}")
+        message = (
+            f"{summary['created']} sentences imported into {len(summary['sets'])} sets in {elapsed:.1f}s "
+            f"({summary['rows']} rows, {summary['duplicates']} duplicates, {summary['invalid']} invalid)."
+        )
+        if summary["error"]:
+            set_ids = ", ".join(str(s["id"]) for s in summary["sets"]) or "none"
+            raise CommandError(f"{summary['error']}. {message} Sets created: {set_ids}.")
+        self.stdout.write(self.style.SUCCESS(message))
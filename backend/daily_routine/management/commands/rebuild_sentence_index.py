@@ -0,0 +1,35 @@
+from django.db import connection, transaction
+from django.core.management.base import BaseCommand
+
+from daily_routine.models import DailyRoutineEntry
+from daily_routine.services.search import install_index, match_key, refresh_near_duplicates
+
+
+class Command(BaseCommand):
+    help = "Recreate the daily routine sentence search index and re-flag near-duplicate sentences across sets."
+
+    def handle(self, *args, **options):
+        with connection.schema_editor() as schema_editor:
+            install_index(schema_editor)
+        self.stdout.write(f"Search index ready on {connection.vendor}.")
+
+        stale = []
+        for entry in DailyRoutineEntry.objects.only('pk', 'spanish_sentence', 'match_key').iterator(chunk_size=1000):
+            key = match_key(entry.spanish_sentence)
+            if entry.match_key != key:
+                entry.match_key = key
+                stale.append(entry)
+        DailyRoutineEntry.objects.bulk_update(stale, ['match_key'], batch_size=1000)
+        self.stdout.write(f"{len(stale)} match keys refreshed.")
+
+        flagged = 0
+        ids = DailyRoutineEntry.objects.order_by('pk').values_list('pk', flat=True)
+        last = 0
+        while True:
+            chunk = list(ids.filter(pk__gt=last)[:1000])
+            if not chunk:
+                break
+            with transaction.atomic():
+                flagged += refresh_near_duplicates(chunk)
+            last = chunk[-1]
+        self.stdout.write(self.style.SUCCESS(f"{flagged} sentences flagged as near-duplicates."))
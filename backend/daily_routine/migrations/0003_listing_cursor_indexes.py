@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:42
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('daily_routine', '0002_daily_routine_progress'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='dailyroutineexerciseset',
+            index=models.Index(fields=['created_at', 'id'], name='routine_set_created_idx'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:43
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def populate_entry_counts(apps, schema_editor):
+    ExerciseSet = apps.get_model('daily_routine', 'DailyRoutineExerciseSet')
+    for pk, n in ExerciseSet.objects.annotate(n=Count('entries')).values_list('pk', 'n'):
+        ExerciseSet.objects.filter(pk=pk).update(entry_count=n)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('daily_routine', '0003_listing_cursor_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dailyroutineexerciseset',
+            name='entry_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(populate_entry_counts, migrations.RunPython.noop),
+    ]
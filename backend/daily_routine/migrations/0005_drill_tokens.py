@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:52
+
+from django.db import migrations, models
+
+
+def populate_tokens(apps, schema_editor):
+    from daily_routine.services.drills import tokenize_sentence
+
+    Entry = apps.get_model('daily_routine', 'DailyRoutineEntry')
+    batch = []
+    for entry in Entry.objects.only('pk', 'spanish_sentence').iterator(chunk_size=1000):
+        entry.spanish_tokens = tokenize_sentence(entry.spanish_sentence)
+        batch.append(entry)
+        if len(batch) >= 1000:
+            Entry.objects.bulk_update(batch, ['spanish_tokens'])
+            batch = []
+    if batch:
+        Entry.objects.bulk_update(batch, ['spanish_tokens'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('daily_routine', '0004_exercise_set_entry_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dailyroutineentry',
+            name='spanish_tokens',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name='dailyroutineexerciseset',
+            name='content_version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(populate_tokens, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,91 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:53
+
+import re
+import unicodedata
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# Frozen copy of daily_routine.services.search.match_key as of this migration.
+_COMBINING_RE = re.compile('[\u0300-\u036f\u1ab0-\u1aff\u1dc0-\u1dff\u20d0-\u20ff\ufe20-\ufe2f]')
+_SEPARATOR_RE = re.compile(r'[\W_]+')
+
+
+def _match_key(sentence):
+    decomposed = _COMBINING_RE.sub('', unicodedata.normalize('NFKD', sentence or ''))
+    return ' '.join(_SEPARATOR_RE.sub(' ', decomposed).split()).casefold()
+
+
+def _flag_group(Entry, group, batch):
+    # Oldest entry of the key, plus the oldest from a second set so entries of the first set have a match too.
+    firsts = []
+    for pk, set_id in group:
+        if len(firsts) < 2 and all(s != set_id for _, s in firsts):
+            firsts.append((pk, set_id))
+    for pk, set_id in group:
+        other = next((o for o, s in firsts if s != set_id), None)
+        if other is not None:
+            batch.append(Entry(pk=pk, near_duplicate_of_id=other))
+
+
+def populate_match_keys(apps, schema_editor):
+    Entry = apps.get_model('daily_routine', 'DailyRoutineEntry')
+    batch = []
+    for pk, sentence in Entry.objects.order_by('pk').values_list('pk', 'spanish_sentence').iterator(chunk_size=1000):
+        batch.append(Entry(pk=pk, match_key=_match_key(sentence)))
+        if len(batch) >= 1000:
+            Entry.objects.bulk_update(batch, ['match_key'])
+            batch = []
+    Entry.objects.bulk_update(batch, ['match_key'])
+
+    # One key's entries are held at a time.
+    batch = []
+    group = []
+    key = None
+    rows = Entry.objects.exclude(match_key='').order_by('match_key', 'pk').values_list('pk', 'exercise_set_id', 'match_key')
+    for pk, set_id, row_key in rows.iterator(chunk_size=1000):
+        if row_key != key:
+            _flag_group(Entry, group, batch)
+            group = []
+            key = row_key
+        group.append((pk, set_id))
+        if len(batch) >= 1000:
+            Entry.objects.bulk_update(batch, ['near_duplicate_of'])
+            batch = []
+    _flag_group(Entry, group, batch)
+    Entry.objects.bulk_update(batch, ['near_duplicate_of'])
+
+
+def install_index(apps, schema_editor):
+    from daily_routine.services.search import install_index
+
+    install_index(schema_editor)
+
+
+def uninstall_index(apps, schema_editor):
+    from daily_routine.services.search import uninstall_index
+
+    uninstall_index(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('daily_routine', '0005_drill_tokens'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dailyroutineentry',
+            name='match_key',
+            field=models.TextField(blank=True, db_index=True, default=''),
+        ),
+        migrations.AddField(
+            model_name='dailyroutineentry',
+            name='near_duplicate_of',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='daily_routine.dailyroutineentry'),
+        ),
+        migrations.RunPython(populate_match_keys, migrations.RunPython.noop),
+        migrations.RunPython(install_index, uninstall_index),
+    ]
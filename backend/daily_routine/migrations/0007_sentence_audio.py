@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:05
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('daily_routine', '0006_sentence_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SentenceAudio',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sentence_key', models.CharField(max_length=64, unique=True)),
+                ('file_name', models.CharField(max_length=255)),
+                ('duration_ms', models.IntegerField(blank=True, null=True)),
+                ('byte_size', models.BigIntegerField(default=0)),
+                ('content_hash', models.CharField(blank=True, default='', max_length=64)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+    ]
@@ -6,22 +6,47 @@ from django.conf import settings
 class DailyRoutineExerciseSet(models.Model):
     title = models.CharField(max_length=255)
     created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='daily_routine_exercise_sets')
+    entry_count = models.PositiveIntegerField(default=0)
+    # Bumped whenever entries change; keys cached drill sessions.
+    content_version = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(default=timezone.now)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='routine_set_created_idx'),
+        ]
 
 
 class DailyRoutineEntry(models.Model):
     exercise_set = models.ForeignKey(DailyRoutineExerciseSet, on_delete=models.CASCADE, related_name='entries')
     spanish_sentence = models.TextField()
     english_sentence = models.TextField()
+    # Word spans of spanish_sentence, see daily_routine.services.drills.tokenize_sentence
+    spanish_tokens = models.JSONField(default=list, blank=True)
+    # Accent/punctuation/case-folded spanish_sentence, see daily_routine.services.search.match_key
+    match_key = models.TextField(blank=True, default='', db_index=True)
+    # Oldest matching sentence in another set, flagged when the set is saved.
+    near_duplicate_of = models.ForeignKey('self', null=True, blank=True, on_delete=models.SET_NULL, related_name='+')
     created_at = models.DateTimeField(default=timezone.now)
 
     class Meta:
         unique_together = ('exercise_set', 'spanish_sentence')
         ordering = ['created_at']
 
+    @staticmethod
+    def derived_fields(spanish_sentence: str):
+        """Columns computed from the sentence when it is saved; pass them to bulk writes, which skip save()."""
+        from .services.drills import tokenize_sentence
+        from .services.search import match_key
+
+        return {'spanish_tokens': tokenize_sentence(spanish_sentence), 'match_key': match_key(spanish_sentence)}
+
+    def save(self, *args, **kwargs):
+        for name, value in self.derived_fields(self.spanish_sentence).items():
+            setattr(self, name, value)
+        super().save(*args, **kwargs)
+
 
 class DailyRoutineExerciseProgress(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='daily_routine_exercise_progress')
@@ -33,3 +58,26 @@ class DailyRoutineExerciseProgress(models.Model):
 
     class Meta:
         unique_together = ('user', 'exercise_set')
+
+
+class DailyRoutineProgressEvent(models.Model):
+    """Client event ids already applied by progress sync; replays of them are skipped."""
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='daily_routine_progress_events')
+    exercise_set = models.ForeignKey(DailyRoutineExerciseSet, on_delete=models.CASCADE, related_name='progress_events')
+    event_id = models.CharField(max_length=64)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        unique_together = ('user', 'event_id')
+
+
+class SentenceAudio(models.Model):
+    """Rendered audio for one sentence text, shared by every entry with that text."""
+    # sha256 of the stripped sentence; the file lives at routine_audio/<key[:2]>/<key>.mp3
+    sentence_key = models.CharField(max_length=64, unique=True)
+    file_name = models.CharField(max_length=255)
+    duration_ms = models.IntegerField(null=True, blank=True)
+    byte_size = models.BigIntegerField(default=0)
+    content_hash = models.CharField(max_length=64, blank=True, default='')
+    created_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(default=timezone.now)
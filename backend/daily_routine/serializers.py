@@ -1,15 +1,32 @@
 from rest_framework import serializers
+
+from backend.pagination import DynamicFieldsMixin
 from .models import DailyRoutineExerciseSet, DailyRoutineEntry
+from .services.sentence_audio import audio_for_set
+
+
+def _set_audio(context, set_id):
+    # Computed once per set and shared by the set and its entries.
+    cached = context.setdefault('sentence_audio', {})
+    if set_id not in cached:
+        cached[set_id] = audio_for_set(set_id)
+    return cached[set_id]
 
 
 class DailyRoutineEntrySerializer(serializers.ModelSerializer):
+    audio = serializers.SerializerMethodField()
+
     class Meta:
         model = DailyRoutineEntry
-        fields = ['id', 'spanish_sentence', 'english_sentence', 'created_at']
+        fields = ['id', 'spanish_sentence', 'english_sentence', 'near_duplicate_of', 'audio', 'created_at']
+
+    def get_audio(self, obj):
+        by_entry, _ = _set_audio(self.context, obj.exercise_set_id)
+        return by_entry.get(obj.id)
 
 
-class DailyRoutineExerciseSetSerializer(serializers.ModelSerializer):
-    sentence_count = serializers.IntegerField(read_only=True)
+class DailyRoutineExerciseSetSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    sentence_count = serializers.IntegerField(source='entry_count', read_only=True)
 
     class Meta:
         model = DailyRoutineExerciseSet
@@ -18,8 +35,13 @@ class DailyRoutineExerciseSetSerializer(serializers.ModelSerializer):
 
 class DailyRoutineExerciseSetDetailSerializer(serializers.ModelSerializer):
     entries = DailyRoutineEntrySerializer(many=True, read_only=True)
+    audio_status = serializers.SerializerMethodField()
 
     class Meta:
         model = DailyRoutineExerciseSet
-        fields = ['id', 'title', 'entries', 'created_at']
+        fields = ['id', 'title', 'entries', 'audio_status', 'created_at']
+
+    def get_audio_status(self, obj):
+        _, summary = _set_audio(self.context, obj.id)
+        return summary
 
@@ -0,0 +1,139 @@
+import hashlib
+import random
+import re
+from typing import Dict, List
+
+from django.conf import settings
+from django.core.cache import cache
+
+from ..models import DailyRoutineEntry
+
+# Runs of letters; hyphenated or apostrophised compounds stay one word.
+_WORD_RE = re.compile(r"[^\W\d_]+(?:['’-][^\W\d_]+)*")
+# Shorter words make poor cloze gaps ("a", "el", "de").
+CLOZE_MIN_LENGTH = 3
+TRANSLATION_OPTIONS = 3
+CLOZE_OPTIONS = 3
+MODES = ('scramble', 'translation', 'cloze')
+
+
+def tokenize_sentence(sentence: str) -> List[List[int]]:
+    """Word spans of a sentence as ``[start, end]`` offsets; punctuation and digits are skipped."""
+    return [[m.start(), m.end()] for m in _WORD_RE.finditer(sentence or '')]
+
+
+def _words(entry: Dict) -> List[str]:
+    sentence = entry['spanish_sentence']
+    return [sentence[s:e] for s, e in entry['spanish_tokens']]
+
+
+def _bank_key(set_id: int, version: int) -> str:
+    return f'daily_routine:drill_bank:{set_id}:{version}'
+
+
+def get_drill_bank(set_id: int, version: int) -> List[Dict]:
+    """Entries of a set with their stored tokens, cached per set version."""
+    key = _bank_key(set_id, version)
+    entries = cache.get(key)
+    if entries is None:
+        entries = list(
+            DailyRoutineEntry.objects
+            .filter(exercise_set_id=set_id)
+            .order_by('id')
+            .values('id', 'spanish_sentence', 'english_sentence', 'spanish_tokens')
+        )
+        cache.set(key, entries, settings.DAILY_ROUTINE_QUESTION_TTL)
+    return entries
+
+
+def _scramble(entry: Dict, rng) -> Dict:
+    words = _words(entry)
+    shuffled = list(words)
+    # A shuffle that happens to give the sentence back is no drill; retry a few times.
+    for _ in range(5):
+        rng.shuffle(shuffled)
+        if shuffled != words:
+            break
+    return {
+        'mode': 'scramble',
+        'prompt': {'english_sentence': entry['english_sentence']},
+        'options': [{'word': w} for w in shuffled],
+        'answer': {'words': words, 'spanish_sentence': entry['spanish_sentence']},
+    }
+
+
+def _translation(entry: Dict, entries: List[Dict], rng) -> Dict:
+    others = sorted({
+        e['english_sentence'] for e in entries
+        if e['english_sentence'].casefold() != entry['english_sentence'].casefold()
+    })
+    options = [entry['english_sentence'], *rng.sample(others, min(len(others), TRANSLATION_OPTIONS - 1))]
+    rng.shuffle(options)
+    return {
+        'mode': 'translation',
+        'prompt': {'spanish_sentence': entry['spanish_sentence']},
+        'options': [{'english_sentence': s} for s in options],
+        'answer': {'english_sentence': entry['english_sentence']},
+    }
+
+
+def _cloze(entry: Dict, pool: List[str], rng) -> Dict:
+    sentence = entry['spanish_sentence']
+    spans = [t for t in entry['spanish_tokens'] if t[1] - t[0] >= CLOZE_MIN_LENGTH] or entry['spanish_tokens']
+    start, end = rng.choice(spans)
+    word = sentence[start:end]
+    others = [w for w in pool if w.casefold() != word.casefold()]
+    options = [word, *rng.sample(others, min(len(others), CLOZE_OPTIONS - 1))]
+    rng.shuffle(options)
+    return {
+        'mode': 'cloze',
+        'prompt': {
+            'text': sentence[:start] + '____' + sentence[end:],
+            'english_sentence': entry['english_sentence'],
+        },
+        'options': [{'word': w} for w in options],
+        'answer': {'word': word},
+    }
+
+
+def build_drills(entries: List[Dict], rng) -> List[Dict]:
+    """Cycle scramble, translation and cloze drills over ``entries`` using only stored tokens.
+
+    Sentences with fewer than two words cannot be scrambled or gapped
+    meaningfully and fall back to translation.
+    """
+    pool = sorted({
+        w for e in entries for w in _words(e) if len(w) >= CLOZE_MIN_LENGTH
+    }, key=lambda w: (w.casefold(), w))
+    questions = []
+    for idx, entry in enumerate(entries):
+        mode = MODES[idx % len(MODES)]
+        if len(entry['spanish_tokens']) < 2:
+            mode = 'translation'
+        if mode == 'scramble':
+            q = _scramble(entry, rng)
+        elif mode == 'cloze':
+            q = _cloze(entry, pool, rng)
+        else:
+            q = _translation(entry, entries, rng)
+        q['entry_id'] = entry['id']
+        questions.append(q)
+    rng.shuffle(questions)
+    return questions
+
+
+def seeded_drills(ex_set, seed: str):
+    """Drills for a set generated from ``random.Random(seed)``.
+
+    Only the tokenized bank is cached, per ``(set, content_version)``; the
+    drills are rebuilt from it on every request, so client seeds never add
+    cache entries. The bank is fixed for a version, so the ETag comes from
+    ``(set, version, seed)`` alone. Returns ``(questions, etag)``, or
+    ``(None, None)`` when the set has no entries.
+    """
+    entries = get_drill_bank(ex_set.pk, ex_set.content_version)
+    if not entries:
+        return None, None
+    questions = build_drills(entries, random.Random(seed))
+    etag = '"%s"' % hashlib.sha256(f'{ex_set.pk}:{ex_set.content_version}:{seed}'.encode('utf-8')).hexdigest()[:32]
+    return questions, etag
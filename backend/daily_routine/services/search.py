@@ -0,0 +1,339 @@
+import re
+import unicodedata
+from typing import Dict, Iterable, List
+
+from django.db import connection
+from django.db.models import Q
+
+from ..models import DailyRoutineEntry
+
+FTS_TABLE = 'daily_routine_entry_fts'
+SEARCH_DEFAULT_LIMIT = 20
+SEARCH_MAX_LIMIT = 100
+# pg_trgm similarity above which two sentences in different sets count as near-duplicates.
+NEAR_DUPLICATE_SIMILARITY = 0.8
+# Below this, trigram matches add more noise than recall to search results.
+FUZZY_SIMILARITY = 0.3
+
+_QUERY_TERM_RE = re.compile(r'\w+')
+_COMBINING_RE = re.compile('[\u0300-\u036f\u1ab0-\u1aff\u1dc0-\u1dff\u20d0-\u20ff\ufe20-\ufe2f]')
+_SEPARATOR_RE = re.compile(r'[\W_]+')
+
+
+def match_key(sentence: str) -> str:
+    """Accent-, punctuation- and case-insensitive form of a sentence used to spot duplicates."""
+    decomposed = _COMBINING_RE.sub('', unicodedata.normalize('NFKD', sentence or ''))
+    return ' '.join(_SEPARATOR_RE.sub(' ', decomposed).split()).casefold()
+
+
+def exact_duplicates(set_id: int, keys) -> Dict[str, int]:
+    """Oldest entry outside ``set_id`` for each match key that has one."""
+    keys = sorted({k for k in keys if k})
+    first = {}
+    for i in range(0, len(keys), 500):
+        for pk, key in (
+            DailyRoutineEntry.objects
+            .filter(match_key__in=keys[i:i + 500])
+            .exclude(exercise_set_id=set_id)
+            .order_by('id')
+            .values_list('pk', 'match_key')
+        ):
+            first.setdefault(key, pk)
+    return first
+
+
+def unflagged_matches(set_id: int, keys) -> List[int]:
+    """Unflagged entries outside ``set_id`` whose match key is among ``keys``.
+
+    New sentences are the newest of their key, so only these change target
+    when sentences with ``keys`` are added to ``set_id``.
+    """
+    keys = sorted({k for k in keys if k})
+    ids = []
+    for i in range(0, len(keys), 500):
+        ids.extend(
+            DailyRoutineEntry.objects
+            .filter(match_key__in=keys[i:i + 500], near_duplicate_of__isnull=True)
+            .exclude(exercise_set_id=set_id)
+            .values_list('pk', flat=True)
+        )
+    return ids
+
+
+def install_index(schema_editor):
+    """Create the backend-specific search structures for ``DailyRoutineEntry``.
+
+    PostgreSQL gets a generated ``search_vector`` column (Spanish and English
+    configurations) with a GIN index and a trigram GIN index on
+    ``match_key``. SQLite gets an external-content FTS5 table kept in step by
+    triggers. Safe to run again, e.g. after a table rebuild dropped triggers.
+    """
+    table = DailyRoutineEntry._meta.db_table
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        for sql in (
+            'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+            f"""ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+                setweight(to_tsvector('spanish', coalesce(spanish_sentence, '')), 'A') ||
+                setweight(to_tsvector('english', coalesce(english_sentence, '')), 'B')
+            ) STORED""",
+            f'CREATE INDEX IF NOT EXISTS routine_entry_search_idx ON {table} USING gin (search_vector)',
+            f'CREATE INDEX IF NOT EXISTS routine_entry_trgm_idx ON {table} USING gin (match_key gin_trgm_ops)',
+        ):
+            schema_editor.execute(sql)
+    elif vendor == 'sqlite':
+        for sql in (
+            f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+                spanish_sentence, english_sentence,
+                content='{table}', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+            )""",
+            f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON {table} BEGIN
+                INSERT INTO {FTS_TABLE}(rowid, spanish_sentence, english_sentence)
+                VALUES (new.id, new.spanish_sentence, new.english_sentence);
+            END""",
+            f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON {table} BEGIN
+                INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, spanish_sentence, english_sentence)
+                VALUES ('delete', old.id, old.spanish_sentence, old.english_sentence);
+            END""",
+            f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF spanish_sentence, english_sentence ON {table} BEGIN
+                INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, spanish_sentence, english_sentence)
+                VALUES ('delete', old.id, old.spanish_sentence, old.english_sentence);
+                INSERT INTO {FTS_TABLE}(rowid, spanish_sentence, english_sentence)
+                VALUES (new.id, new.spanish_sentence, new.english_sentence);
+            END""",
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+        ):
+            schema_editor.execute(sql)
+
+
+def uninstall_index(schema_editor):
+    table = DailyRoutineEntry._meta.db_table
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS routine_entry_trgm_idx')
+        schema_editor.execute(f'ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector')
+    elif vendor == 'sqlite':
+        for suffix in ('ai', 'ad', 'au'):
+            schema_editor.execute(f'DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}')
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+def _has_fts5() -> bool:
+    if connection.vendor != 'sqlite':
+        return False
+    with connection.cursor() as cur:
+        cur.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE])
+        return cur.fetchone() is not None
+
+
+def _fts5_query(query: str) -> str:
+    # Quote every term so user input can't use FTS5 syntax; the last one matches as a prefix.
+    terms = [t.replace('"', '') for t in _QUERY_TERM_RE.findall(query)]
+    if not terms:
+        return ''
+    return ' '.join(f'"{t}"' for t in terms[:-1]) + (' ' if len(terms) > 1 else '') + f'"{terms[-1]}"*'
+
+
+def _postgres_ids(query: str, limit: int) -> List[int]:
+    table = DailyRoutineEntry._meta.db_table
+    with connection.cursor() as cur:
+        cur.execute(
+            f"""
+            SELECT id FROM {table}
+            WHERE search_vector @@ (websearch_to_tsquery('spanish', %s) || websearch_to_tsquery('english', %s))
+            ORDER BY ts_rank(search_vector, websearch_to_tsquery('spanish', %s) || websearch_to_tsquery('english', %s)) DESC, id
+            LIMIT %s
+            """,
+            [query, query, query, query, limit],
+        )
+        ids = [row[0] for row in cur.fetchall()]
+        if len(ids) < limit:
+            # Fuzzy matches catch typos and missing accents the stemmer can't.
+            cur.execute('SELECT set_limit(%s)', [FUZZY_SIMILARITY])
+            cur.execute(
+                f"""
+                SELECT id FROM {table}
+                WHERE match_key %% %s AND NOT (id = ANY(%s))
+                ORDER BY similarity(match_key, %s) DESC, id
+                LIMIT %s
+                """,
+                [match_key(query), ids, match_key(query), limit - len(ids)],
+            )
+            ids += [row[0] for row in cur.fetchall()]
+    return ids
+
+
+def _fts5_ids(query: str, limit: int) -> List[int]:
+    expression = _fts5_query(query)
+    if not expression:
+        return []
+    with connection.cursor() as cur:
+        cur.execute(
+            f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s ORDER BY bm25({FTS_TABLE}), rowid LIMIT %s',
+            [expression, limit],
+        )
+        return [row[0] for row in cur.fetchall()]
+
+
+def search_entries(query: str, limit: int = SEARCH_DEFAULT_LIMIT) -> List[Dict]:
+    """Sentences matching ``query`` in Spanish or English, best matches first.
+
+    PostgreSQL ranks the ``search_vector`` GIN index and tops up with
+    trigram matches; SQLite uses the FTS5 table; other backends fall back to
+    ``icontains``.
+    """
+    query = (query or '').strip()
+    if not query:
+        return []
+    if connection.vendor == 'postgresql':
+        ids = _postgres_ids(query, limit)
+    elif _has_fts5():
+        ids = _fts5_ids(query, limit)
+    else:
+        ids = list(
+            DailyRoutineEntry.objects
+            .filter(Q(spanish_sentence__icontains=query) | Q(english_sentence__icontains=query))
+            .order_by('id')
+            .values_list('id', flat=True)[:limit]
+        )
+    rows = {
+        r['id']: r
+        for r in DailyRoutineEntry.objects.filter(pk__in=ids).values(
+            'id', 'exercise_set_id', 'exercise_set__title', 'spanish_sentence', 'english_sentence', 'near_duplicate_of_id',
+        )
+    }
+    return [
+        {
+            'id': r['id'],
+            'exercise_set_id': r['exercise_set_id'],
+            'exercise_set_title': r['exercise_set__title'],
+            'spanish_sentence': r['spanish_sentence'],
+            'english_sentence': r['english_sentence'],
+            'near_duplicate_of': r['near_duplicate_of_id'],
+        }
+        for r in (rows.get(pk) for pk in ids) if r is not None
+    ]
+
+
+def _trigram_duplicates(entries: List[DailyRoutineEntry]) -> Dict[int, int]:
+    if not entries:
+        return {}
+    table = DailyRoutineEntry._meta.db_table
+    with connection.cursor() as cur:
+        # set_limit() sets the threshold of the % operator for this session.
+        cur.execute('SELECT set_limit(%s)', [NEAR_DUPLICATE_SIMILARITY])
+        cur.execute(
+            f"""
+            SELECT e.id, d.id FROM {table} e
+            CROSS JOIN LATERAL (
+                SELECT o.id FROM {table} o
+                WHERE o.match_key %% e.match_key AND o.exercise_set_id <> e.exercise_set_id
+                ORDER BY similarity(o.match_key, e.match_key) DESC, o.id
+                LIMIT 1
+            ) d
+            WHERE e.id = ANY(%s)
+            """,
+            [[e.pk for e in entries]],
+        )
+        return dict(cur.fetchall())
+
+
+def _duplicate_targets(entries: List[DailyRoutineEntry]) -> Dict[int, int]:
+    """Oldest matching entry in another set for each of ``entries`` that has one."""
+    keys = sorted({e.match_key for e in entries if e.match_key})
+    # Oldest entry per key, plus the oldest from a second set so entries of the first set have a match too.
+    firsts = {}
+    for i in range(0, len(keys), 500):
+        for pk, key, set_id in (
+            DailyRoutineEntry.objects
+            .filter(match_key__in=keys[i:i + 500])
+            .order_by('id')
+            .values_list('pk', 'match_key', 'exercise_set_id')
+        ):
+            seen = firsts.setdefault(key, [])
+            if len(seen) < 2 and all(s != set_id for _, s in seen):
+                seen.append((pk, set_id))
+    found = {}
+    for e in entries:
+        other = next((pk for pk, set_id in firsts.get(e.match_key, ()) if set_id != e.exercise_set_id), None)
+        if other is not None:
+            found[e.pk] = other
+    if connection.vendor == 'postgresql':
+        found.update(_trigram_duplicates([e for e in entries if e.pk not in found]))
+    return found
+
+
+def _apply_flags(entries: List[DailyRoutineEntry], found: Dict[int, int]):
+    changed = []
+    for e in entries:
+        target = found.get(e.pk)
+        if e.near_duplicate_of_id != target:
+            e.near_duplicate_of_id = target
+            changed.append(e)
+    if changed:
+        DailyRoutineEntry.objects.bulk_update(changed, ['near_duplicate_of'], batch_size=500)
+
+
+def related_entry_ids(set_id: int) -> List[int]:
+    """Entries in other sets that point at, or match, a sentence of ``set_id``.
+
+    Their flags depend on this set, so they are re-checked when it changes.
+    Collect them before deleting entries: deleted targets are nulled out.
+    """
+    own = DailyRoutineEntry.objects.filter(exercise_set_id=set_id)
+    ids = set(
+        DailyRoutineEntry.objects
+        .filter(Q(near_duplicate_of__exercise_set_id=set_id) | Q(match_key__in=own.exclude(match_key='').values('match_key')))
+        .exclude(exercise_set_id=set_id)
+        .values_list('pk', flat=True)
+    )
+    if connection.vendor == 'postgresql':
+        table = DailyRoutineEntry._meta.db_table
+        with connection.cursor() as cur:
+            cur.execute('SELECT set_limit(%s)', [NEAR_DUPLICATE_SIMILARITY])
+            cur.execute(
+                f"""
+                SELECT DISTINCT o.id FROM {table} e
+                JOIN {table} o ON o.match_key %% e.match_key AND o.exercise_set_id <> e.exercise_set_id
+                WHERE e.exercise_set_id = %s
+                """,
+                [set_id],
+            )
+            ids.update(row[0] for row in cur.fetchall())
+    return sorted(ids)
+
+
+def refresh_near_duplicates(entry_ids: Iterable[int]) -> int:
+    """Recompute the near-duplicate flag of the given entries. Returns how many are flagged."""
+    entry_ids = sorted(set(entry_ids))
+    flagged = 0
+    for i in range(0, len(entry_ids), 1000):
+        entries = list(
+            DailyRoutineEntry.objects.filter(pk__in=entry_ids[i:i + 1000])
+            .only('pk', 'exercise_set_id', 'match_key', 'near_duplicate_of')
+        )
+        found = _duplicate_targets(entries)
+        _apply_flags(entries, found)
+        flagged += len(found)
+    return flagged
+
+
+def flag_near_duplicates(set_id: int, related: Iterable[int] = ()) -> int:
+    """Point entries of a set at the oldest matching sentence in another set, both ways.
+
+    Matches on ``match_key`` everywhere and, on PostgreSQL, on trigram
+    similarity too. Entries of other sets that match this set or point at it
+    are re-checked as well, so flags appear on both sides and go away when
+    the matching sentence is edited. Pass ``related`` (from
+    ``related_entry_ids``, taken before entries were deleted) to also re-check
+    entries whose target is gone. Returns the number of flagged entries in
+    the set.
+    """
+    entries = list(
+        DailyRoutineEntry.objects.filter(exercise_set_id=set_id)
+        .only('pk', 'exercise_set_id', 'match_key', 'near_duplicate_of')
+    )
+    found = _duplicate_targets(entries)
+    _apply_flags(entries, found)
+    refresh_near_duplicates(set(related_entry_ids(set_id)) | set(related))
+    return len(found)
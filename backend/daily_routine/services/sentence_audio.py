@@ -0,0 +1,83 @@
+import hashlib
+import os
+from typing import Dict, Iterable, List, Set, Tuple
+
+from django.conf import settings
+from django.utils import timezone
+
+from vocabulary.models import AudioGenerationJob
+from vocabulary.services.audio import mp3_duration_ms
+from vocabulary.services.audio_queue import AUDIO_MISSING, AUDIO_READY, enqueue_texts, job_statuses
+
+from ..models import DailyRoutineEntry, SentenceAudio
+
+SENTENCE_AUDIO_SUBDIR = 'routine_audio'
+
+
+def sentence_key(sentence: str) -> str:
+    """sha256 of the stripped sentence; identical sentences in any set share it."""
+    raw = (sentence or '').strip()
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest() if raw else ''
+
+
+def sentence_audio_path(sentence: str):
+    key = sentence_key(sentence)
+    if not key:
+        return None
+    return os.path.join(SENTENCE_AUDIO_SUBDIR, key[:2], f'{key}.mp3')
+
+
+def sentence_audio_url(audio: SentenceAudio) -> str:
+    # The name hashes the text, not the audio; ``?v=`` pins the rendered bytes.
+    version = audio.content_hash[:12]
+    url = f'{settings.MEDIA_URL}{audio.file_name}'
+    return f'{url}?v={version}' if version else url
+
+
+def enqueue_sentences(sentences: Iterable[str]) -> int:
+    """Queue rendering for sentences with no audio job; the audio worker does the synthesis."""
+    return enqueue_texts(sentences, sentence_audio_path, AudioGenerationJob.KIND_SENTENCE)
+
+
+def known_sentences(jobs: List[AudioGenerationJob]) -> Set[str]:
+    keys = {sentence_key(job.word): job.word for job in jobs}
+    return {keys[k] for k in SentenceAudio.objects.filter(sentence_key__in=list(keys)).values_list('sentence_key', flat=True)}
+
+
+def record_sentence_audio(sentence: str, data: bytes, storage_name: str = None) -> SentenceAudio:
+    """Store size, duration and hash of a rendered sentence saved as ``storage_name``."""
+    obj, _ = SentenceAudio.objects.update_or_create(
+        sentence_key=sentence_key(sentence),
+        defaults={
+            'file_name': (storage_name or sentence_audio_path(sentence)).replace(os.sep, '/'),
+            'duration_ms': mp3_duration_ms(data),
+            'byte_size': len(data),
+            'content_hash': hashlib.sha256(data).hexdigest(),
+            'updated_at': timezone.now(),
+        },
+    )
+    return obj
+
+
+def audio_for_set(set_id: int) -> Tuple[Dict[int, Dict], Dict[str, int]]:
+    """Per-entry audio (``status``, ``url``, ``duration_ms``) and a readiness summary for a set."""
+    entries = list(DailyRoutineEntry.objects.filter(exercise_set_id=set_id).values_list('id', 'spanish_sentence'))
+    paths = {pk: sentence_audio_path(s) for pk, s in entries}
+    statuses = job_statuses(p for p in paths.values() if p)
+    keys = {pk: sentence_key(s) for pk, s in entries}
+    rendered = {a.sentence_key: a for a in SentenceAudio.objects.filter(sentence_key__in=set(keys.values()))}
+    by_entry = {}
+    summary = {'total': len(entries), 'ready': 0, 'pending': 0, 'failed': 0, 'missing': 0}
+    for pk, _ in entries:
+        audio = rendered.get(keys[pk])
+        status = AUDIO_READY if audio is not None else statuses.get(paths[pk], AUDIO_MISSING)
+        if status == AUDIO_READY and audio is None:
+            # Job finished but the manifest row is gone; report it as not rendered.
+            status = AUDIO_MISSING
+        summary[status] += 1
+        by_entry[pk] = {
+            'status': status,
+            'url': sentence_audio_url(audio) if audio is not None else None,
+            'duration_ms': audio.duration_ms if audio is not None else None,
+        }
+    return by_entry, summary
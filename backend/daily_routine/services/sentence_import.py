@@ -0,0 +1,255 @@
+import codecs
+import csv
+import io
+import json
+import os
+import re
+from typing import Dict, Iterator, List, Optional
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from vocabulary.services.entry_diff import bump_entry_count, normalize_key
+
+from ..models import DailyRoutineEntry, DailyRoutineExerciseSet
+from .search import exact_duplicates, flag_near_duplicates, refresh_near_duplicates, unflagged_matches
+from .sentence_audio import enqueue_sentences
+
+IMPORT_EXTENSIONS = ('.csv', '.xlsx')
+SPANISH_COLUMNS = ('spanish_sentence', 'spanish', 'es')
+ENGLISH_COLUMNS = ('english_sentence', 'english', 'en')
+# Rejected rows reported back; the rest are only counted.
+MAX_REPORTED_ERRORS = 50
+_COPY_COLUMNS = (
+    'exercise_set_id', 'spanish_sentence', 'english_sentence', 'spanish_tokens', 'match_key', 'near_duplicate_of_id', 'created_at',
+)
+
+
+class SentenceImportError(Exception):
+    pass
+
+
+def next_exercise_number() -> int:
+    """Number after the highest ``Exercise N`` title."""
+    max_n = 0
+    for t in DailyRoutineExerciseSet.objects.values_list('title', flat=True):
+        if not isinstance(t, str):
+            continue
+        m = re.match(r'^\s*Exercise\s+(\d+)\s*$', t, flags=re.IGNORECASE)
+        if m:
+            max_n = max(max_n, int(m.group(1)))
+    return max_n + 1
+
+
+def _iter_csv(file) -> Iterator[List]:
+    file.seek(0)
+    # utf-8-sig drops the BOM spreadsheet exports put in front of the header.
+    reader = csv.reader(codecs.iterdecode(file, 'utf-8-sig'))
+    try:
+        yield from reader
+    except (csv.Error, UnicodeDecodeError) as e:
+        raise SentenceImportError(f'Invalid CSV: {e}')
+
+
+def _iter_xlsx(file) -> Iterator[List]:
+    from openpyxl import load_workbook
+
+    file.seek(0)
+    try:
+        workbook = load_workbook(file, read_only=True, data_only=True)
+    except Exception as e:
+        raise SentenceImportError(f'Invalid XLSX: {e}')
+    try:
+        for row in workbook.worksheets[0].iter_rows(values_only=True):
+            yield ['' if v is None else str(v) for v in row]
+    finally:
+        workbook.close()
+
+
+def iter_sentence_rows(file, name: str, group_column: Optional[str] = None) -> Iterator[Dict]:
+    """Stream ``{line, spanish_sentence, english_sentence, group}`` dicts from a CSV or XLSX file.
+
+    The first row is the header. Spanish and English columns are found by name
+    (``spanish_sentence``/``spanish``/``es`` and the English equivalents).
+    Rows are read one at a time: CSV through the csv module, XLSX through
+    openpyxl's read-only mode.
+    """
+    ext = os.path.splitext(name or '')[1].lower()
+    if ext not in IMPORT_EXTENSIONS:
+        raise SentenceImportError('Only .csv and .xlsx files can be imported')
+    rows = _iter_csv(file) if ext == '.csv' else _iter_xlsx(file)
+    header = next(rows, None)
+    if not header:
+        raise SentenceImportError('File is empty')
+    columns = {str(h).strip().lower(): i for i, h in enumerate(header)}
+    es_idx = next((columns[c] for c in SPANISH_COLUMNS if c in columns), None)
+    en_idx = next((columns[c] for c in ENGLISH_COLUMNS if c in columns), None)
+    if es_idx is None or en_idx is None:
+        raise SentenceImportError('Header needs spanish_sentence and english_sentence columns')
+    group_idx = None
+    if group_column:
+        group_idx = columns.get(group_column.strip().lower())
+        if group_idx is None:
+            raise SentenceImportError(f'Column "{group_column}" not found')
+    for line, row in enumerate(rows, start=2):
+        def cell(i):
+            return (row[i] if i is not None and i < len(row) else '').strip()
+        yield {
+            'line': line,
+            'spanish_sentence': cell(es_idx),
+            'english_sentence': cell(en_idx),
+            'group': cell(group_idx),
+        }
+
+
+def write_entries(rows: List[Dict]) -> int:
+    """Insert entry rows (dicts keyed by ``_COPY_COLUMNS``) in one statement.
+
+    Uses ``COPY ... FROM STDIN`` on PostgreSQL and ``bulk_create`` elsewhere.
+    """
+    if not rows:
+        return 0
+    if connection.vendor == 'postgresql':
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        for row in rows:
+            writer.writerow([
+                json.dumps(row['spanish_tokens']) if col == 'spanish_tokens'
+                else row['created_at'].isoformat() if col == 'created_at'
+                else '' if row[col] is None else row[col]
+                for col in _COPY_COLUMNS
+            ])
+        buf.seek(0)
+        columns = ', '.join(_COPY_COLUMNS)
+        with connection.cursor() as cur:
+            cur.copy_expert(
+                f"COPY {DailyRoutineEntry._meta.db_table} ({columns}) FROM STDIN WITH "
+                f"(FORMAT csv, NULL '', FORCE_NOT_NULL (spanish_sentence, english_sentence, match_key))",
+                buf,
+            )
+    else:
+        DailyRoutineEntry.objects.bulk_create([DailyRoutineEntry(**row) for row in rows], batch_size=500)
+    return len(rows)
+
+
+class _OpenSet:
+    def __init__(self, ex_set, seen_keys):
+        self.ex_set = ex_set
+        self.seen = seen_keys
+        self.pending = []
+        self.size = len(seen_keys)
+        self.created = 0
+
+
+def import_sentences(rows, user, set_size: Optional[int] = None, batch_size: Optional[int] = None) -> Dict:
+    """Write streamed rows into daily routine sets with batched inserts.
+
+    Rows with a ``group`` go to a set titled after it, and a new set starts
+    whenever the group changes. A group seen earlier in the file is appended
+    to its existing set. Without groups, a new ``Exercise N`` set starts every
+    ``set_size`` sentences, or never when ``set_size`` is unset. Each batch of
+    ``batch_size`` rows is written with ``write_entries`` and committed on its
+    own, so only the open set's dedup keys and one batch are held in memory.
+    Exact near-duplicates are flagged on both sides as each batch is
+    inserted, and its sentences are queued for audio once it is committed.
+
+    A ``SentenceImportError`` from ``rows`` (a bad header or an unreadable
+    row) stops the import without undoing committed batches: the rows read
+    before it are written and the summary comes back with ``error`` set, its
+    ``sets`` listing what was created.
+    """
+    batch_size = max(1, batch_size or settings.DAILY_ROUTINE_IMPORT_BATCH_SIZE)
+    set_size = max(1, set_size) if set_size else None
+    number = next_exercise_number()
+    group_sets = {}
+    sets = {}
+    summary = {'rows': 0, 'created': 0, 'duplicates': 0, 'invalid': 0, 'errors': [], 'sets': [], 'error': None}
+    current = None
+    current_group = None
+
+    def flush(open_set):
+        if not open_set.pending:
+            return
+        duplicates = exact_duplicates(open_set.ex_set.pk, (row['match_key'] for row in open_set.pending))
+        for row in open_set.pending:
+            row['near_duplicate_of_id'] = duplicates.get(row['match_key'])
+        with transaction.atomic():
+            write_entries(open_set.pending)
+            refresh_near_duplicates(unflagged_matches(open_set.ex_set.pk, duplicates))
+            bump_entry_count(DailyRoutineExerciseSet, open_set.ex_set.pk, len(open_set.pending))
+            DailyRoutineExerciseSet.objects.filter(pk=open_set.ex_set.pk).update(content_version=F('content_version') + 1)
+        enqueue_sentences(row['spanish_sentence'] for row in open_set.pending)
+        open_set.created += len(open_set.pending)
+        summary['created'] += len(open_set.pending)
+        open_set.pending = []
+
+    def close(open_set):
+        flush(open_set)
+        if connection.vendor == 'postgresql':
+            # Exact matches were flagged per batch; this adds the trigram ones.
+            with transaction.atomic():
+                flag_near_duplicates(open_set.ex_set.pk)
+        # Only the open set keeps its keys; a reopened group reloads them.
+        open_set.seen = None
+
+    def open_set_for(group):
+        nonlocal number
+        if group and group in group_sets:
+            ex_set = DailyRoutineExerciseSet.objects.get(pk=group_sets[group])
+            keys = {
+                normalize_key(s)
+                for s in DailyRoutineEntry.objects.filter(exercise_set=ex_set).values_list('spanish_sentence', flat=True)
+            }
+            return _OpenSet(ex_set, keys)
+        if group:
+            title = group[:255]
+        else:
+            title = f'Exercise {number}'
+            number += 1
+        ex_set = DailyRoutineExerciseSet.objects.create(title=title, created_by=user)
+        if group:
+            group_sets[group] = ex_set.pk
+        sets[ex_set.pk] = {'id': ex_set.pk, 'title': title, 'group': group or None, 'created': 0}
+        summary['sets'].append(sets[ex_set.pk])
+        return _OpenSet(ex_set, set())
+
+    try:
+        for row in rows:
+            summary['rows'] += 1
+            es, en, group = row['spanish_sentence'], row['english_sentence'], row['group']
+            if not es or not en:
+                summary['invalid'] += 1
+                if len(summary['errors']) < MAX_REPORTED_ERRORS:
+                    summary['errors'].append({'line': row['line'], 'error': 'Missing spanish or english sentence'})
+                continue
+            if current is None or group != current_group or (not group and set_size and current.size >= set_size):
+                if current is not None:
+                    close(current)
+                    sets[current.ex_set.pk]['created'] += current.created
+                current = open_set_for(group)
+                current_group = group
+            key = normalize_key(es)
+            if key in current.seen:
+                summary['duplicates'] += 1
+                continue
+            current.seen.add(key)
+            current.size += 1
+            current.pending.append({
+                'exercise_set_id': current.ex_set.pk,
+                'spanish_sentence': es,
+                'english_sentence': en,
+                'near_duplicate_of_id': None,
+                'created_at': timezone.now(),
+                **DailyRoutineEntry.derived_fields(es),
+            })
+            if len(current.pending) >= batch_size:
+                flush(current)
+    except SentenceImportError as e:
+        # Committed batches stay; the rows read before the error are written below.
+        summary['error'] = str(e)
+    if current is not None:
+        close(current)
+        sets[current.ex_set.pk]['created'] += current.created
+    return summary
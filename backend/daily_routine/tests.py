@@ -0,0 +1,153 @@
+from unittest import mock
+
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from authentication.models import User
+
+from .models import DailyRoutineEntry, DailyRoutineExerciseSet
+from .services import sentence_import
+from .services.sentence_import import import_sentences
+
+
+class DrillTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(email='staff@example.com', username='staff@example.com', is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        response = self.client.post('/api/v1/daily-routine-exercises/exercise-sets', {'sentences': [
+            {'spanish_sentence': 'Me levanto a las siete.', 'english_sentence': 'I get up at seven.'},
+            {'spanish_sentence': 'Desayuno café con leche.', 'english_sentence': 'I have coffee with milk for breakfast.'},
+            {'spanish_sentence': 'Salgo de casa temprano.', 'english_sentence': 'I leave home early.'},
+        ]}, format='json')
+        self.set_id = response.json()['id']
+
+    def test_seeds_share_one_cached_bank(self):
+        cache = LocMemCache('drills', {})
+        url = f'/api/v1/daily-routine-exercises/exercise-sets/{self.set_id}/questions'
+        with mock.patch('daily_routine.services.drills.cache', cache):
+            first = self.client.get(f'{url}?seed=a')
+            self.assertEqual(first.status_code, 200)
+            for seed in range(20):
+                self.client.get(f'{url}?seed={seed}')
+            self.assertEqual(len(cache._cache), 1)
+
+            again = self.client.get(f'{url}?seed=a')
+            self.assertEqual(again.json()['questions'], first.json()['questions'])
+            self.assertEqual(self.client.get(f'{url}?seed=a', HTTP_IF_NONE_MATCH=first['ETag']).status_code, 304)
+            self.assertNotEqual(self.client.get(f'{url}?seed=b')['ETag'], first['ETag'])
+
+
+class SentenceSearchTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(email='staff@example.com', username='staff@example.com', is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _create(self, *pairs):
+        response = self.client.post('/api/v1/daily-routine-exercises/exercise-sets', {'sentences': [
+            {'spanish_sentence': es, 'english_sentence': en} for es, en in pairs
+        ]}, format='json')
+        self.assertEqual(response.status_code, 201)
+        return response.json()['id']
+
+    def _search(self, q):
+        response = self.client.get('/api/v1/daily-routine-exercises/sentences/search', {'q': q})
+        self.assertEqual(response.status_code, 200)
+        return [r['spanish_sentence'] for r in response.json()['results']]
+
+    def _flag(self, set_id, sentence):
+        return DailyRoutineEntry.objects.get(exercise_set_id=set_id, spanish_sentence=sentence).near_duplicate_of_id
+
+    def test_search_matches_both_languages_prefixes_and_accents(self):
+        self._create(
+            ('Desayuno café con leche.', 'I have coffee with milk.'),
+            ('Me levanto a las siete.', 'I get up at seven.'),
+        )
+        self.assertEqual(self._search('cafe'), ['Desayuno café con leche.'])
+        self.assertEqual(self._search('levan'), ['Me levanto a las siete.'])
+        self.assertEqual(self._search('coffee milk'), ['Desayuno café con leche.'])
+        # FTS5 operators in user input are searched as plain words.
+        self.assertEqual(self._search('seven OR "milk'), [])
+        self.assertEqual(self.client.get('/api/v1/daily-routine-exercises/sentences/search').status_code, 400)
+
+    def test_near_duplicates_are_flagged_both_ways_and_cleared(self):
+        first = self._create(('Me levanto a las siete.', 'I get up at seven.'), ('Salgo temprano.', 'I leave early.'))
+        second = self._create(('me levanto, a las siete', 'I get up at 7.'))
+        first_id = DailyRoutineEntry.objects.get(exercise_set_id=first, spanish_sentence='Me levanto a las siete.').pk
+        second_id = DailyRoutineEntry.objects.get(exercise_set_id=second).pk
+        self.assertEqual(self._flag(second, 'me levanto, a las siete'), first_id)
+        self.assertEqual(self._flag(first, 'Me levanto a las siete.'), second_id)
+        self.assertIsNone(self._flag(first, 'Salgo temprano.'))
+
+        self.client.put(f'/api/v1/daily-routine-exercises/exercise-sets/{second}', {'sentences': [
+            {'spanish_sentence': 'Me acuesto a las once.', 'english_sentence': 'I go to bed at eleven.'},
+        ]}, format='json')
+        self.assertIsNone(self._flag(first, 'Me levanto a las siete.'))
+
+        third = self._create(('Me levanto a las siete', 'I get up at seven.'))
+        self.assertIsNotNone(self._flag(first, 'Me levanto a las siete.'))
+        self.client.delete(f'/api/v1/daily-routine-exercises/exercise-sets/{third}')
+        self.assertIsNone(self._flag(first, 'Me levanto a las siete.'))
+
+
+class SentenceImportTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(email='staff@example.com', username='staff@example.com', is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _rows(self, *rows):
+        return [
+            {'line': line, 'spanish_sentence': es, 'english_sentence': en, 'group': group}
+            for line, (es, en, group) in enumerate(rows, start=2)
+        ]
+
+    def test_rows_are_written_in_batches_and_split_into_sets(self):
+        rows = self._rows(
+            ('Uno.', 'One.', ''), ('Dos.', 'Two.', ''), ('uno.', 'One again.', ''),
+            ('', 'Missing.', ''), ('Tres.', 'Three.', ''), ('Cuatro.', 'Four.', ''),
+        )
+        with mock.patch.object(sentence_import, 'write_entries', wraps=sentence_import.write_entries) as write:
+            summary = import_sentences(rows, self.user, set_size=3, batch_size=2)
+        self.assertEqual([len(call.args[0]) for call in write.call_args_list], [2, 1, 1])
+        self.assertEqual(
+            {k: summary[k] for k in ('rows', 'created', 'duplicates', 'invalid', 'error')},
+            {'rows': 6, 'created': 4, 'duplicates': 1, 'invalid': 1, 'error': None},
+        )
+        self.assertEqual(summary['errors'], [{'line': 5, 'error': 'Missing spanish or english sentence'}])
+        self.assertEqual([(s['title'], s['created']) for s in summary['sets']], [('Exercise 1', 3), ('Exercise 2', 1)])
+        first = DailyRoutineExerciseSet.objects.get(pk=summary['sets'][0]['id'])
+        self.assertEqual((first.entry_count, first.content_version), (3, 2))
+
+    def test_a_group_seen_again_is_appended_to_its_set(self):
+        summary = import_sentences(self._rows(
+            ('Hola.', 'Hello.', 'Greetings'), ('Lunes.', 'Monday.', 'Days'),
+            ('Adiós.', 'Goodbye.', 'Greetings'), ('hola.', 'Hi.', 'Greetings'),
+        ), self.user)
+        self.assertEqual([(s['title'], s['created']) for s in summary['sets']], [('Greetings', 2), ('Days', 1)])
+        self.assertEqual(summary['duplicates'], 1)
+        self.assertEqual(DailyRoutineEntry.objects.filter(exercise_set_id=summary['sets'][0]['id']).count(), 2)
+
+    def test_an_unreadable_row_keeps_earlier_sets_and_reports_them(self):
+        body = 'spanish,english\nUno.,One.\nDos.,Two.\n'.encode('utf-8') + b'Tr\xe9s.,Three.\n'
+        upload = SimpleUploadedFile('sentences.csv', body, content_type='text/csv')
+        response = self.client.post(
+            '/api/v1/daily-routine-exercises/exercise-sets/import', {'file': upload, 'set_size': 1}, format='multipart',
+        )
+        self.assertEqual(response.status_code, 400)
+        data = response.json()
+        self.assertIn('Invalid CSV', data['detail'])
+        self.assertEqual(data['error'], data['detail'])
+        self.assertEqual(data['created'], 2)
+        self.assertEqual([s['created'] for s in data['sets']], [1, 1])
+        self.assertEqual(DailyRoutineEntry.objects.count(), 2)
+
+    def test_imported_sentences_flag_earlier_copies(self):
+        earlier = import_sentences(self._rows(('Me levanto temprano.', 'I get up early.', '')), self.user)
+        later = import_sentences(self._rows(('me levanto temprano', 'I get up early.', '')), self.user)
+        old = DailyRoutineEntry.objects.get(exercise_set_id=earlier['sets'][0]['id'])
+        new = DailyRoutineEntry.objects.get(exercise_set_id=later['sets'][0]['id'])
+        self.assertEqual((old.near_duplicate_of_id, new.near_duplicate_of_id), (new.pk, old.pk))
@@ -3,7 +3,12 @@ from . import views
 
 urlpatterns = [
     path('exercise-sets', views.exercise_sets),
+    path('exercise-sets/import', views.import_exercise_sets),
     path('exercise-sets/<int:set_id>', views.exercise_set_detail),
+    path('exercise-sets/<int:set_id>/questions', views.exercise_set_questions),
+    path('entries/<int:entry_id>/audio', views.entry_audio),
+    path('sentences/search', views.search_sentences),
     path('progress', views.progress_summary),
     path('progress/<int:set_id>/complete', views.mark_completed),
+    path('progress/sync', views.progress_sync),
 ]
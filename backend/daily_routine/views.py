@@ -2,30 +2,29 @@ from rest_framework.decorators import api_view, permission_classes, parser_class
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework.parsers import JSONParser
-from django.db import transaction
-from django.db.models import Count
-import re
+from rest_framework.parsers import JSONParser, MultiPartParser, FormParser
+from django.db import IntegrityError, transaction
+from django.db.models import F
 from django.utils import timezone
 
-from .models import DailyRoutineExerciseSet, DailyRoutineEntry, DailyRoutineExerciseProgress
+from backend.media import serve_media
+from backend.pagination import InvalidPageRequest, keyset_page, parse_fields, wants_page
+from backend.progress_sync import MAX_SYNC_ITEMS, sync_progress, sync_response_data
+from vocabulary.services.entry_diff import bump_entry_count, normalize_key, sync_entries
+from vocabulary.services.question_bank import default_seed
+
+from .models import (
+    DailyRoutineExerciseSet, DailyRoutineEntry, DailyRoutineExerciseProgress, DailyRoutineProgressEvent, SentenceAudio,
+)
 from .serializers import DailyRoutineExerciseSetSerializer, DailyRoutineExerciseSetDetailSerializer
+from .services.drills import seeded_drills
+from .services.sentence_import import SentenceImportError, import_sentences, iter_sentence_rows, next_exercise_number
+from .services.sentence_audio import enqueue_sentences, sentence_key
+from .services.search import SEARCH_DEFAULT_LIMIT, SEARCH_MAX_LIMIT, flag_near_duplicates, refresh_near_duplicates, related_entry_ids, search_entries
 
 
 def _next_exercise_title():
-    titles = DailyRoutineExerciseSet.objects.values_list('title', flat=True)
-    max_n = 0
-    for t in titles:
-        if not isinstance(t, str):
-            continue
-        m = re.match(r'^\s*Exercise\s+(\d+)\s*$', t, flags=re.IGNORECASE)
-        if not m:
-            continue
-        try:
-            max_n = max(max_n, int(m.group(1)))
-        except Exception:
-            continue
-    return f'Exercise {max_n + 1}'
+    return f'Exercise {next_exercise_number()}'
 
 
 def _parse_sentences_payload(payload):
@@ -48,8 +47,18 @@ def _parse_sentences_payload(payload):
 @parser_classes([JSONParser])
 def exercise_sets(request):
     if request.method == 'GET':
-        qs = DailyRoutineExerciseSet.objects.annotate(sentence_count=Count('entries')).order_by('-created_at')
-        return Response(DailyRoutineExerciseSetSerializer(qs, many=True).data)
+        try:
+            fields = parse_fields(request, DailyRoutineExerciseSetSerializer.Meta.fields)
+            qs = DailyRoutineExerciseSet.objects.order_by('-created_at')
+            if not wants_page(request):
+                return Response(DailyRoutineExerciseSetSerializer(qs, many=True, context={'fields': fields}).data)
+            rows, next_cursor = keyset_page(request, qs)
+        except InvalidPageRequest as e:
+            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({
+            'results': DailyRoutineExerciseSetSerializer(rows, many=True, context={'fields': fields}).data,
+            'next_cursor': next_cursor,
+        })
 
     items = _parse_sentences_payload(request.data.get('sentences'))
     if not items:
@@ -58,7 +67,7 @@ def exercise_sets(request):
     seen = set()
     valid = []
     for es, en in items:
-        key = es.lower()
+        key = normalize_key(es)
         if key in seen:
             continue
         seen.add(key)
@@ -68,13 +77,45 @@ def exercise_sets(request):
         return Response({'detail': 'No valid rows'}, status=status.HTTP_400_BAD_REQUEST)
 
     with transaction.atomic():
-        ex_set = DailyRoutineExerciseSet.objects.create(title=_next_exercise_title(), created_by=request.user)
+        ex_set = DailyRoutineExerciseSet.objects.create(
+            title=_next_exercise_title(), created_by=request.user, entry_count=len(valid),
+        )
         DailyRoutineEntry.objects.bulk_create([
-            DailyRoutineEntry(exercise_set=ex_set, spanish_sentence=es, english_sentence=en) for (es, en) in valid
+            DailyRoutineEntry(exercise_set=ex_set, spanish_sentence=es, english_sentence=en, **DailyRoutineEntry.derived_fields(es))
+            for (es, en) in valid
         ])
+        flag_near_duplicates(ex_set.pk)
+        transaction.on_commit(lambda: enqueue_sentences(es for (es, _) in valid))
     return Response(DailyRoutineExerciseSetDetailSerializer(ex_set).data, status=status.HTTP_201_CREATED)
 
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+@parser_classes([MultiPartParser, FormParser])
+def import_exercise_sets(request):
+    if not request.user.is_staff:
+        return Response({'detail': 'Forbidden'}, status=status.HTTP_403_FORBIDDEN)
+
+    upload = request.FILES.get('file')
+    if not upload:
+        return Response({'detail': 'File is required'}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        set_size = int(request.data.get('set_size') or 0) or None
+    except (TypeError, ValueError):
+        return Response({'detail': 'Invalid set_size'}, status=status.HTTP_400_BAD_REQUEST)
+    group_by = (request.data.get('group_by') or '').strip() or None
+
+    try:
+        rows = iter_sentence_rows(upload, upload.name, group_column=group_by)
+        summary = import_sentences(rows, request.user, set_size=set_size)
+    except SentenceImportError as e:
+        return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    if summary['error']:
+        # Sets written before the error are kept; report them with it.
+        return Response({'detail': summary['error'], **summary}, status=status.HTTP_400_BAD_REQUEST)
+    return Response(summary, status=status.HTTP_201_CREATED if summary['created'] else status.HTTP_200_OK)
+
+
 @api_view(['GET', 'PUT', 'DELETE'])
 @permission_classes([IsAuthenticated])
 @parser_classes([JSONParser])
@@ -88,7 +129,10 @@ def exercise_set_detail(request, set_id: int):
         return Response(DailyRoutineExerciseSetDetailSerializer(ex_set).data)
 
     if request.method == 'DELETE':
-        ex_set.delete()
+        with transaction.atomic():
+            related = related_entry_ids(ex_set.pk)
+            ex_set.delete()
+            refresh_near_duplicates(related)
         return Response({'detail': 'Deleted'}, status=status.HTTP_200_OK)
 
     items = _parse_sentences_payload(request.data.get('sentences'))
@@ -98,7 +142,7 @@ def exercise_set_detail(request, set_id: int):
     seen = set()
     valid = []
     for es, en in items:
-        key = es.lower()
+        key = normalize_key(es)
         if key in seen:
             continue
         seen.add(key)
@@ -108,11 +152,84 @@ def exercise_set_detail(request, set_id: int):
         return Response({'detail': 'No valid rows'}, status=status.HTTP_400_BAD_REQUEST)
 
     with transaction.atomic():
-        DailyRoutineEntry.objects.filter(exercise_set=ex_set).delete()
-        DailyRoutineEntry.objects.bulk_create([
-            DailyRoutineEntry(exercise_set=ex_set, spanish_sentence=es, english_sentence=en) for (es, en) in valid
-        ])
-    return Response(DailyRoutineExerciseSetDetailSerializer(ex_set).data, status=status.HTTP_200_OK)
+        ex_set = DailyRoutineExerciseSet.objects.select_for_update().get(pk=ex_set.pk)
+        related = related_entry_ids(ex_set.pk)
+        changes, touched = sync_entries(
+            DailyRoutineEntry.objects.filter(exercise_set=ex_set),
+            [{'spanish_sentence': es, 'english_sentence': en, **DailyRoutineEntry.derived_fields(es)} for (es, en) in valid],
+            key='spanish_sentence',
+            fields=('spanish_sentence', 'english_sentence', 'spanish_tokens', 'match_key'),
+            build=lambda row: DailyRoutineEntry(exercise_set=ex_set, **row),
+        )
+        bump_entry_count(DailyRoutineExerciseSet, ex_set.pk, changes['created'] - changes['deleted'])
+        if changes['created'] or changes['updated'] or changes['deleted']:
+            DailyRoutineExerciseSet.objects.filter(pk=ex_set.pk).update(content_version=F('content_version') + 1)
+            flag_near_duplicates(ex_set.pk, related=related)
+        if touched:
+            transaction.on_commit(lambda: enqueue_sentences(row['spanish_sentence'] for row in touched))
+    data = DailyRoutineExerciseSetDetailSerializer(ex_set).data
+    data['changes'] = changes
+    return Response(data, status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def exercise_set_questions(request, set_id: int):
+    try:
+        ex_set = DailyRoutineExerciseSet.objects.only('id', 'title', 'content_version').get(pk=set_id)
+    except DailyRoutineExerciseSet.DoesNotExist:
+        return Response({'detail': 'Not found'}, status=status.HTTP_404_NOT_FOUND)
+
+    seed = (request.query_params.get('seed') or '').strip()[:64] or default_seed(request.user, ex_set.id)
+    questions, etag = seeded_drills(ex_set, seed)
+    if not questions:
+        return Response({'detail': 'No sentences in this exercise'}, status=status.HTTP_400_BAD_REQUEST)
+
+    if etag in [t.strip() for t in request.META.get('HTTP_IF_NONE_MATCH', '').split(',')]:
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = Response({
+            'id': ex_set.id,
+            'title': ex_set.title,
+            'seed': seed,
+            'count': len(questions),
+            'questions': questions,
+        })
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def entry_audio(request, entry_id: int):
+    """Stream an entry's sentence audio with range and conditional request support."""
+    try:
+        sentence = DailyRoutineEntry.objects.values_list('spanish_sentence', flat=True).get(pk=entry_id)
+    except DailyRoutineEntry.DoesNotExist:
+        return Response({'detail': 'Not found'}, status=status.HTTP_404_NOT_FOUND)
+    audio = SentenceAudio.objects.filter(sentence_key=sentence_key(sentence)).only('file_name').first()
+    if audio is None:
+        return Response({'detail': 'Audio not ready'}, status=status.HTTP_404_NOT_FOUND)
+    return serve_media(request._request, audio.file_name)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def search_sentences(request):
+    if not request.user.is_staff:
+        return Response({'detail': 'Forbidden'}, status=status.HTTP_403_FORBIDDEN)
+
+    query = (request.query_params.get('q') or '').strip()
+    if not query:
+        return Response({'detail': 'q is required'}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        limit = int(request.query_params.get('limit') or SEARCH_DEFAULT_LIMIT)
+    except ValueError:
+        return Response({'detail': 'Invalid limit'}, status=status.HTTP_400_BAD_REQUEST)
+    limit = max(1, min(limit, SEARCH_MAX_LIMIT))
+    results = search_entries(query, limit)
+    return Response({'query': query, 'count': len(results), 'results': results})
 
 
 @api_view(['GET'])
@@ -147,3 +264,23 @@ def mark_completed(request, set_id: int):
     obj.updated_at = timezone.now()
     obj.save(update_fields=['correct_count', 'total_count', 'completed_at', 'updated_at'])
     return Response({'detail': 'Saved'})
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+@parser_classes([JSONParser])
+def progress_sync(request):
+    records = request.data.get('records')
+    if not isinstance(records, list) or not records:
+        return Response({'detail': 'No records provided'}, status=status.HTTP_400_BAD_REQUEST)
+    if len(records) > MAX_SYNC_ITEMS:
+        return Response({'detail': f'At most {MAX_SYNC_ITEMS} records per request'}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        with transaction.atomic():
+            results = sync_progress(
+                request.user, records, DailyRoutineExerciseSet, DailyRoutineExerciseProgress, DailyRoutineProgressEvent,
+                'daily_routine',
+            )
+    except IntegrityError:
+        return Response({'detail': 'These events are already being synced; retry'}, status=status.HTTP_409_CONFLICT)
+    return Response(sync_response_data(results))
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Lesson
+from .models import Lesson, LessonUpload
 
 
 @admin.register(Lesson)
@@ -7,3 +7,10 @@ class LessonAdmin(admin.ModelAdmin):
     list_display = ('id', 'block', 'created_by', 'created_at')
     search_fields = ('id', 'block', 'created_by__email')
     list_filter = ('block',)
+
+
+@admin.register(LessonUpload)
+class LessonUploadAdmin(admin.ModelAdmin):
+    list_display = ('id', 'field', 'file_name', 'lesson', 'received', 'total_size', 'status', 'updated_at')
+    search_fields = ('id', 'file_name', 'created_by__email')
+    list_filter = ('status', 'field')
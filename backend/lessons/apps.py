@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+from django.core import checks
+
+
+class LessonsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'lessons'
+
+    def ready(self):
+        from .services.chunked_upload import check_upload_storage
+
+        checks.register(check_upload_storage)
@@ -0,0 +1,17 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from lessons.services.chunked_upload import purge_stale_uploads
+
+
+class Command(BaseCommand):
+    help = "Delete unfinished chunked lesson uploads (and their partial files) that have gone stale."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--hours", type=int, help="Idle hours before an upload is purged (default LESSON_UPLOAD_EXPIRY_HOURS)")
+
+    def handle(self, *args, **options):
+        max_age = timedelta(hours=options["hours"]) if options["hours"] else None
+        purged = purge_stale_uploads(max_age)
+        self.stdout.write(self.style.SUCCESS(f"{purged} stale uploads purged."))
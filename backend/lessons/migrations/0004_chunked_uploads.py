@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:07
+
+import django.db.models.deletion
+import django.utils.timezone
+import lessons.models
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lessons', '0003_listing_cursor_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LessonUpload',
+            fields=[
+                ('id', models.CharField(default=lessons.models.generate_upload_id, max_length=32, primary_key=True, serialize=False)),
+                ('block', models.CharField(blank=True, choices=[('A1', 'A1 – Beginner'), ('A2', 'A2 – Basic'), ('B1', 'B1 – Intermediate'), ('B2', 'B2 – Upper Intermediate'), ('C1', 'C1 – Advanced')], default='', max_length=3)),
+                ('field', models.CharField(choices=[('video_file', 'Video'), ('lesson_pdf', 'Lesson PDF'), ('keys_pdf', 'Keys PDF')], max_length=20)),
+                ('file_name', models.CharField(max_length=255)),
+                ('total_size', models.BigIntegerField()),
+                ('received', models.BigIntegerField(default=0)),
+                ('sha256', models.CharField(blank=True, default='', max_length=64)),
+                ('status', models.CharField(choices=[('uploading', 'Uploading'), ('complete', 'Complete')], default='uploading', max_length=10)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('created_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lesson_uploads', to=settings.AUTH_USER_MODEL)),
+                ('lesson', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='uploads', to='lessons.lesson')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'updated_at'], name='lesson_upload_status_idx')],
+            },
+        ),
+    ]
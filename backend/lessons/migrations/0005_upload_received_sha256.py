@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lessons', '0004_chunked_uploads'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lessonupload',
+            name='received_sha256',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+    ]
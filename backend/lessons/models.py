@@ -27,5 +27,51 @@ class Lesson(models.Model):
     created_at = models.DateTimeField(default=timezone.now)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='lesson_created_idx'),
+        ]
+
     def __str__(self):
         return f"{self.block} ({self.id})"
+
+
+def generate_upload_id():
+    return uuid.uuid4().hex
+
+
+class LessonUpload(models.Model):
+    """A resumable, chunked upload of one lesson file (see lessons.services.chunked_upload)."""
+
+    FIELD_CHOICES = [
+        ('video_file', 'Video'),
+        ('lesson_pdf', 'Lesson PDF'),
+        ('keys_pdf', 'Keys PDF'),
+    ]
+    STATUS_UPLOADING = 'uploading'
+    STATUS_COMPLETE = 'complete'
+    STATUS_CHOICES = [
+        (STATUS_UPLOADING, 'Uploading'),
+        (STATUS_COMPLETE, 'Complete'),
+    ]
+
+    id = models.CharField(max_length=32, primary_key=True, default=generate_upload_id)
+    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='lesson_uploads')
+    # Existing lesson to attach to; when empty, finalizing creates a lesson in ``block``.
+    lesson = models.ForeignKey(Lesson, null=True, blank=True, on_delete=models.CASCADE, related_name='uploads')
+    block = models.CharField(max_length=3, choices=Lesson.BLOCK_CHOICES, blank=True, default='')
+    field = models.CharField(max_length=20, choices=FIELD_CHOICES)
+    file_name = models.CharField(max_length=255)
+    total_size = models.BigIntegerField()
+    received = models.BigIntegerField(default=0)
+    sha256 = models.CharField(max_length=64, blank=True, default='')
+    # SHA-256 of the received bytes, when the chunks arrived in order and were hashed as they were written
+    received_sha256 = models.CharField(max_length=64, blank=True, default='')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_UPLOADING)
+    created_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'updated_at'], name='lesson_upload_status_idx'),
+        ]
@@ -1,8 +1,10 @@
 from rest_framework import serializers
+
+from backend.pagination import DynamicFieldsMixin
 from .models import Lesson
 
 
-class LessonSerializer(serializers.ModelSerializer):
+class LessonSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     created_by_email = serializers.CharField(source='created_by.email', read_only=True)
     video_type = serializers.SerializerMethodField()
     has_lesson_pdf = serializers.SerializerMethodField()
@@ -0,0 +1,290 @@
+import hashlib
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from datetime import timedelta
+
+from django.conf import settings
+from django.core import checks
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+from django.utils.text import get_valid_filename
+
+from ..models import Lesson, LessonUpload
+
+logger = logging.getLogger(__name__)
+
+UPLOADS_SUBDIR = 'lesson_uploads'
+VIDEO_EXTENSIONS = ('.mp4', '.webm', '.mov', '.m4v', '.ogg')
+_READ_SIZE = 1024 * 1024
+_CONTENT_RANGE_RE = re.compile(r'^bytes (\d+)-(\d+)/(\d+|\*)$')
+# Running SHA-256 of the contiguous prefix of uploads whose chunks reached
+# this process in order: upload id -> (bytes hashed, hash object).
+_hashers = OrderedDict()
+_hashers_lock = threading.Lock()
+_MAX_HASHERS = 256
+
+
+class UploadError(Exception):
+    status = 400
+
+
+class UploadConflict(UploadError):
+    """A chunk does not start at the next byte the server expects."""
+    status = 409
+
+    def __init__(self, message, offset):
+        super().__init__(message)
+        self.offset = offset
+
+
+def check_upload_storage(app_configs=None, **kwargs):
+    """System check: part files are written in place and renamed into ``default_storage``."""
+    try:
+        default_storage.path('')
+    except NotImplementedError:
+        return [checks.Error(
+            'Chunked lesson uploads need a filesystem default storage.',
+            hint=f'{default_storage.__class__.__name__} has no local path; the upload endpoints write part '
+                 'files on disk and rename them into place.',
+            id='lessons.E001',
+        )]
+    return []
+
+
+def part_path(upload: LessonUpload) -> str:
+    # Dot-prefixed, so serve_media never exposes a partial file.
+    return default_storage.path(os.path.join(UPLOADS_SUBDIR, f'.{upload.id}.part'))
+
+
+def _take_hasher(upload_id: str, offset: int):
+    """Claim the running hash of an upload if it stops exactly at ``offset``."""
+    with _hashers_lock:
+        state = _hashers.pop(upload_id, None)
+    if offset == 0:
+        return hashlib.sha256()
+    if state is not None and state[0] == offset:
+        return state[1]
+    return None
+
+
+def _keep_hasher(upload_id: str, offset: int, hasher):
+    with _hashers_lock:
+        _hashers[upload_id] = (offset, hasher)
+        while len(_hashers) > _MAX_HASHERS:
+            _hashers.popitem(last=False)
+
+
+def validate_file(field: str, file_name: str, content_type: str = ''):
+    """Apply the checks the multipart lesson endpoints use to a file about to be uploaded."""
+    name = (file_name or '').lower()
+    if field == 'video_file':
+        if not (content_type.startswith('video/') or name.endswith(VIDEO_EXTENSIONS)):
+            raise UploadError('Only video files are allowed')
+    elif field in ('lesson_pdf', 'keys_pdf'):
+        if not (content_type == 'application/pdf' or name.endswith('.pdf')):
+            raise UploadError(f"{'Lesson' if field == 'lesson_pdf' else 'Keys'} PDF must be a PDF file")
+    else:
+        raise UploadError('Invalid field')
+
+
+def create_upload(user, field: str, file_name: str, total_size, content_type: str = '', sha256: str = '',
+                  lesson: Lesson = None, block: str = '') -> LessonUpload:
+    """Register an upload and create its empty part file in ``default_storage``'s directory."""
+    validate_file(field, file_name, content_type)
+    try:
+        total_size = int(total_size)
+    except (TypeError, ValueError):
+        raise UploadError('Invalid size')
+    if total_size <= 0 or total_size > settings.LESSON_UPLOAD_MAX_BYTES:
+        raise UploadError(f'Size must be between 1 and {settings.LESSON_UPLOAD_MAX_BYTES} bytes')
+    sha256 = (sha256 or '').strip().lower()
+    if sha256 and not re.fullmatch(r'[0-9a-f]{64}', sha256):
+        raise UploadError('sha256 must be 64 hex characters')
+    if lesson is None and block not in dict(Lesson.BLOCK_CHOICES):
+        raise UploadError('Provide lesson_id or a valid block')
+    if lesson is None and field != 'video_file':
+        raise UploadError('A new lesson needs a video; upload the PDFs to the created lesson')
+    upload = LessonUpload.objects.create(
+        created_by=user,
+        lesson=lesson,
+        block='' if lesson is not None else block,
+        field=field,
+        file_name=os.path.basename(file_name)[:255],
+        total_size=total_size,
+        sha256=sha256,
+    )
+    os.makedirs(os.path.dirname(part_path(upload)), exist_ok=True)
+    open(part_path(upload), 'wb').close()
+    return upload
+
+
+def parse_chunk_offset(content_range: str, offset_param):
+    """Start offset of a chunk from ``Content-Range: bytes a-b/total`` or an ``offset`` query value."""
+    if content_range:
+        m = _CONTENT_RANGE_RE.match(content_range.strip())
+        if not m:
+            raise UploadError('Invalid Content-Range')
+        return int(m.group(1))
+    try:
+        return int(offset_param)
+    except (TypeError, ValueError):
+        raise UploadError('Provide Content-Range or offset')
+
+
+def write_chunk(upload: LessonUpload, offset: int, stream, length: int) -> LessonUpload:
+    """Write ``length`` bytes read from ``stream`` at ``offset`` of the part file.
+
+    A chunk may start anywhere up to the bytes already received, so a resent
+    chunk just overwrites. No transaction is open while the body is read.
+    ``received`` only ever advances over contiguous bytes, and only by what
+    actually arrived, so a dropped connection resumes from the last byte on
+    disk.
+    """
+    if upload.status != LessonUpload.STATUS_UPLOADING:
+        raise UploadError('Upload is already complete')
+    if offset < 0 or offset > upload.received:
+        raise UploadConflict('Chunk does not continue the upload', upload.received)
+    if length <= 0:
+        raise UploadError('Empty chunk')
+    if length > settings.LESSON_UPLOAD_MAX_CHUNK_BYTES:
+        raise UploadError(f'Chunks are limited to {settings.LESSON_UPLOAD_MAX_CHUNK_BYTES} bytes')
+    if offset + length > upload.total_size:
+        raise UploadError('Chunk goes past the declared size')
+
+    # Bytes are hashed as they are written when the chunk extends the prefix
+    # this process has already hashed; anything else drops the running hash.
+    hasher = _take_hasher(upload.pk, offset)
+    written = 0
+    with open(part_path(upload), 'r+b') as fh:
+        fh.seek(offset)
+        while written < length:
+            data = stream.read(min(_READ_SIZE, length - written))
+            if not data:
+                break
+            fh.write(data)
+            if hasher is not None:
+                hasher.update(data)
+            written += len(data)
+
+    with transaction.atomic():
+        upload = LessonUpload.objects.select_for_update().get(pk=upload.pk)
+        if offset < upload.received:
+            # A resent chunk may have changed bytes that were already hashed.
+            upload.received_sha256 = ''
+        if offset <= upload.received:
+            upload.received = max(upload.received, offset + written)
+        if hasher is not None and upload.received == offset + written:
+            if upload.received == upload.total_size:
+                upload.received_sha256 = hasher.hexdigest()
+            else:
+                _keep_hasher(upload.pk, upload.received, hasher)
+        upload.updated_at = timezone.now()
+        upload.save(update_fields=['received', 'received_sha256', 'updated_at'])
+    if written < length:
+        raise UploadConflict('Chunk was cut short; resume from the returned offset', upload.received)
+    return upload
+
+
+def _file_sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, 'rb') as fh:
+        for chunk in iter(lambda: fh.read(_READ_SIZE), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def finalize_upload(upload: LessonUpload, sha256: str = '') -> Lesson:
+    """Verify the assembled file and attach it to its lesson in one transaction.
+
+    The checksum recorded while the chunks arrived is used when there is one;
+    otherwise the part file is hashed here. The upload is claimed with a
+    conditional status update before the part file is moved, so of two
+    concurrent completes only one attaches the file. Attaching is a rename
+    into the field's ``upload_to`` directory, never a copy. The file replaced
+    on the lesson is deleted only after the transaction commits.
+    """
+    if upload.status != LessonUpload.STATUS_UPLOADING:
+        raise UploadError('Upload is already complete')
+    if upload.received != upload.total_size:
+        raise UploadConflict('Upload is incomplete', upload.received)
+    expected = (sha256 or upload.sha256 or '').strip().lower()
+    if not expected:
+        raise UploadError('sha256 is required')
+    src = part_path(upload)
+    try:
+        actual = upload.received_sha256 or _file_sha256(src)
+    except FileNotFoundError:
+        # A concurrent complete already moved the part file.
+        raise UploadError('Upload is already complete')
+    if actual != expected:
+        # Something was corrupted in transit; the client has to upload again.
+        updated = LessonUpload.objects.filter(pk=upload.pk, status=LessonUpload.STATUS_UPLOADING).update(
+            received=0, received_sha256='', updated_at=timezone.now(),
+        )
+        if updated:
+            open(src, 'wb').close()
+        raise UploadError('Checksum mismatch; upload restarted')
+
+    upload_to = Lesson._meta.get_field(upload.field).upload_to
+    name = default_storage.get_available_name(os.path.join(upload_to, get_valid_filename(upload.file_name)))
+    dest = default_storage.path(name)
+    moved = False
+    try:
+        with transaction.atomic():
+            claimed = LessonUpload.objects.filter(
+                pk=upload.pk, status=LessonUpload.STATUS_UPLOADING, received=upload.total_size,
+            ).update(status=LessonUpload.STATUS_COMPLETE, sha256=actual, updated_at=timezone.now())
+            if not claimed:
+                raise UploadError('Upload is already complete or was restarted')
+            os.makedirs(os.path.dirname(dest), exist_ok=True)
+            os.replace(src, dest)
+            moved = True
+            if upload.lesson_id:
+                lesson = Lesson.objects.select_for_update().get(pk=upload.lesson_id)
+                old = getattr(lesson, upload.field)
+                old_name = old.name if old else None
+                setattr(lesson, upload.field, name)
+                update_fields = [upload.field, 'updated_at']
+                if upload.field == 'video_file':
+                    lesson.video_url = None
+                    update_fields.append('video_url')
+                lesson.save(update_fields=update_fields)
+                if old_name and old_name != name:
+                    transaction.on_commit(lambda: default_storage.delete(old_name))
+            else:
+                lesson = Lesson.objects.create(block=upload.block, created_by=upload.created_by, video_file=name)
+                LessonUpload.objects.filter(pk=upload.pk).update(lesson=lesson)
+                upload.lesson = lesson
+    except Exception:
+        if moved:
+            # Put the bytes back so finalizing can be retried.
+            os.replace(dest, src)
+        raise
+    upload.status = LessonUpload.STATUS_COMPLETE
+    upload.sha256 = actual
+    return lesson
+
+
+def discard_upload(upload: LessonUpload):
+    with _hashers_lock:
+        _hashers.pop(upload.pk, None)
+    try:
+        os.remove(part_path(upload))
+    except FileNotFoundError:
+        pass
+    upload.delete()
+
+
+def purge_stale_uploads(max_age: timedelta = None) -> int:
+    """Drop unfinished uploads untouched for ``LESSON_UPLOAD_EXPIRY_HOURS``, with their part files."""
+    max_age = max_age or timedelta(hours=settings.LESSON_UPLOAD_EXPIRY_HOURS)
+    stale = LessonUpload.objects.filter(status=LessonUpload.STATUS_UPLOADING, updated_at__lt=timezone.now() - max_age)
+    purged = 0
+    for upload in stale.iterator():
+        discard_upload(upload)
+        purged += 1
+    return purged
@@ -0,0 +1,127 @@
+import hashlib
+import os
+import tempfile
+from io import BytesIO
+
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from authentication.models import User
+
+from .models import Lesson, LessonUpload
+from .services.chunked_upload import UploadConflict, UploadError, create_upload, finalize_upload, part_path, write_chunk
+
+
+class LessonMediaTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        settings_override = override_settings(MEDIA_ROOT=media_root, DEBUG=False, MEDIA_SENDFILE_BACKEND='')
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        os.makedirs(os.path.join(media_root, 'lesson_pdfs'))
+        with open(os.path.join(media_root, 'lesson_pdfs', 'intro.pdf'), 'wb') as fh:
+            fh.write(b'%PDF-1.4 lesson')
+        self.user = User.objects.create(email='learner@example.com', username='learner@example.com')
+        self.lesson = Lesson.objects.create(block='A1', created_by=self.user, lesson_pdf='lesson_pdfs/intro.pdf')
+        self.client = APIClient()
+
+    def test_lesson_files_need_a_signed_in_user(self):
+        url = f'/api/lessons/lessons/{self.lesson.id}/media/lesson_pdf/'
+        self.assertEqual(self.client.get('/media/lesson_pdfs/intro.pdf').status_code, 404)
+        self.assertEqual(self.client.get(url).status_code, 401)
+
+        self.client.force_authenticate(self.user)
+        response = self.client.get(url, HTTP_RANGE='bytes=0-3')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b''.join(response.streaming_content), b'%PDF')
+        self.assertTrue(response['Cache-Control'].startswith('private'))
+
+    def test_unknown_or_empty_fields_are_not_found(self):
+        self.client.force_authenticate(self.user)
+        base = f'/api/lessons/lessons/{self.lesson.id}/media'
+        self.assertEqual(self.client.get(f'{base}/keys_pdf/').status_code, 404)
+        self.assertEqual(self.client.get(f'{base}/created_by/').status_code, 404)
+        self.assertEqual(self.client.get('/api/lessons/lessons/missing/media/lesson_pdf/').status_code, 404)
+
+
+class ChunkedUploadTests(TestCase):
+    DATA = b'0123456789'
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.user = User.objects.create(email='staff@example.com', username='staff@example.com', is_staff=True)
+        self.lesson = Lesson.objects.create(block='A1', created_by=self.user, video_url='https://example.com/v')
+        self.sha256 = hashlib.sha256(self.DATA).hexdigest()
+
+    def _upload(self):
+        return create_upload(self.user, 'video_file', 'intro.mp4', len(self.DATA), lesson=self.lesson)
+
+    def _write(self, upload, offset, data, length=None):
+        return write_chunk(upload, offset, BytesIO(data), len(data) if length is None else length)
+
+    def test_chunks_resume_from_the_last_byte_on_disk(self):
+        upload = self._upload()
+        upload = self._write(upload, 0, self.DATA[:4])
+        with self.assertRaises(UploadConflict) as gap:
+            self._write(upload, 6, self.DATA[6:])
+        self.assertEqual(gap.exception.offset, 4)
+        # The connection drops after two of the four announced bytes.
+        with self.assertRaises(UploadConflict) as cut:
+            self._write(upload, 4, self.DATA[4:6], length=4)
+        self.assertEqual(cut.exception.offset, 6)
+        upload = LessonUpload.objects.get(pk=upload.pk)
+        upload = self._write(upload, 6, self.DATA[6:])
+        self.assertEqual(upload.received, len(self.DATA))
+        self.assertEqual(upload.received_sha256, self.sha256)
+
+        lesson = finalize_upload(upload, sha256=self.sha256)
+        self.assertIsNone(lesson.video_url)
+        with open(os.path.join(self.media_root, lesson.video_file.name), 'rb') as fh:
+            self.assertEqual(fh.read(), self.DATA)
+        self.assertFalse(os.path.exists(part_path(upload)))
+
+    def test_a_resent_chunk_drops_the_running_hash(self):
+        upload = self._write(self._upload(), 0, self.DATA[:6])
+        upload = self._write(upload, 4, self.DATA[4:])
+        self.assertEqual(upload.received_sha256, '')
+        # The part file is hashed on complete instead.
+        finalize_upload(upload, sha256=self.sha256)
+        self.assertEqual(LessonUpload.objects.get(pk=upload.pk).status, LessonUpload.STATUS_COMPLETE)
+
+    def test_checksum_mismatch_restarts_the_upload(self):
+        upload = self._write(self._upload(), 0, b'01234X6789')
+        with self.assertRaisesMessage(UploadError, 'Checksum mismatch'):
+            finalize_upload(upload, sha256=self.sha256)
+        upload = LessonUpload.objects.get(pk=upload.pk)
+        self.assertEqual((upload.received, upload.status), (0, LessonUpload.STATUS_UPLOADING))
+        self.assertEqual(os.path.getsize(part_path(upload)), 0)
+
+    def test_only_one_of_two_concurrent_completes_attaches_the_file(self):
+        upload = self._write(self._upload(), 0, self.DATA)
+        stale = LessonUpload.objects.get(pk=upload.pk)
+        finalize_upload(upload, sha256=self.sha256)
+        with self.assertRaises(UploadError):
+            finalize_upload(stale, sha256=self.sha256)
+        self.assertEqual(Lesson.objects.get(pk=self.lesson.pk).video_file.name, 'lesson_videos/intro.mp4')
+
+    def test_upload_endpoints(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.post('/api/lessons/uploads/', {
+            'lesson_id': self.lesson.id, 'field': 'lesson_pdf', 'file_name': 'notes.pdf',
+            'total_size': len(self.DATA), 'sha256': self.sha256,
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        url = f"/api/lessons/uploads/{response.json()['upload']['id']}/"
+        response = client.put(url, self.DATA[:5], content_type='application/octet-stream', HTTP_CONTENT_RANGE='bytes 0-4/10')
+        self.assertEqual(response['Upload-Offset'], '5')
+        response = client.put(f'{url}?offset=7', self.DATA[7:], content_type='application/octet-stream')
+        self.assertEqual((response.status_code, response.json()['offset']), (409, 5))
+        client.put(f'{url}?offset=5', self.DATA[5:], content_type='application/octet-stream')
+        response = client.post(f'{url}complete/', {}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['upload']['status'], LessonUpload.STATUS_COMPLETE)
+        self.assertEqual(Lesson.objects.get(pk=self.lesson.pk).lesson_pdf.name, 'lesson_pdfs/notes.pdf')
@@ -4,5 +4,9 @@ from . import views
 urlpatterns = [
     path('lessons/', views.list_or_create_lessons, name='lessons_list_create'),
     path('lessons/<str:lesson_id>/', views.lesson_detail, name='lesson_detail'),
+    path('lessons/<str:lesson_id>/media/<str:field>/', views.lesson_media, name='lesson_media'),
+    path('uploads/', views.create_lesson_upload, name='lesson_upload_create'),
+    path('uploads/<str:upload_id>/', views.lesson_upload_detail, name='lesson_upload_detail'),
+    path('uploads/<str:upload_id>/complete/', views.complete_lesson_upload, name='lesson_upload_complete'),
     path('stats/', views.lessons_stats, name='lessons_stats'),
 ]
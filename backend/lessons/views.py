@@ -4,16 +4,34 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from django.db import transaction
 
-from .models import Lesson
+from backend.media import serve_media
+from backend.pagination import InvalidPageRequest, keyset_page, parse_fields, wants_page
+
+from .models import Lesson, LessonUpload
 from .serializers import LessonSerializer
+from .services.chunked_upload import (
+    UploadConflict, UploadError, create_upload, discard_upload, finalize_upload, parse_chunk_offset, write_chunk,
+)
 
 
 @api_view(['GET', 'POST'])
 @permission_classes([IsAuthenticated])
 def list_or_create_lessons(request):
     if request.method == 'GET':
-        qs = Lesson.objects.select_related('created_by').order_by('-created_at')
-        return Response({'lessons': LessonSerializer(qs, many=True).data}, status=status.HTTP_200_OK)
+        try:
+            fields = parse_fields(request, LessonSerializer.Meta.fields)
+            qs = Lesson.objects.order_by('-created_at')
+            if fields is None or 'created_by_email' in fields:
+                qs = qs.select_related('created_by')
+            if not wants_page(request):
+                return Response({'lessons': LessonSerializer(qs, many=True, context={'fields': fields}).data}, status=status.HTTP_200_OK)
+            rows, next_cursor = keyset_page(request, qs)
+        except InvalidPageRequest as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({
+            'lessons': LessonSerializer(rows, many=True, context={'fields': fields}).data,
+            'next_cursor': next_cursor,
+        }, status=status.HTTP_200_OK)
 
     # POST create
     if not request.user.is_staff:
@@ -164,6 +182,29 @@ def lesson_detail(request, lesson_id: str):
     return Response({'lesson': LessonSerializer(lesson).data}, status=status.HTTP_200_OK)
 
 
+LESSON_MEDIA_FIELDS = ('video_file', 'lesson_pdf', 'keys_pdf')
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def lesson_media(request, lesson_id: str, field: str):
+    """Serve a lesson's video or PDF to signed-in users.
+
+    ``serve_public_media`` only exposes these files with ``DEBUG`` on; this
+    route applies the same access rule as ``lesson_detail`` and hands the
+    file to ``serve_media`` for ranges, validators and proxy hand-off.
+    """
+    if field not in LESSON_MEDIA_FIELDS:
+        return Response({'error': 'Not found'}, status=status.HTTP_404_NOT_FOUND)
+    name = Lesson.objects.filter(id=lesson_id).values_list(field, flat=True).first()
+    if not name:
+        return Response({'error': 'Not found'}, status=status.HTTP_404_NOT_FOUND)
+    response = serve_media(request._request, name)
+    # Shared caches must not keep files that need a signed-in user.
+    response['Cache-Control'] = response['Cache-Control'].replace('public', 'private', 1)
+    return response
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def lessons_stats(request):
@@ -189,3 +230,98 @@ def lessons_stats(request):
         'lessons_with_lesson_pdf': lessons_with_lesson_pdf,
         'lessons_with_keys_pdf': lessons_with_keys_pdf,
     }, status=status.HTTP_200_OK)
+
+
+def _upload_state(upload):
+    return {
+        'id': upload.id,
+        'lesson_id': upload.lesson_id,
+        'field': upload.field,
+        'file_name': upload.file_name,
+        'total_size': upload.total_size,
+        'offset': upload.received,
+        'status': upload.status,
+    }
+
+
+def _upload_error(e):
+    body = {'error': str(e)}
+    if isinstance(e, UploadConflict):
+        body['offset'] = e.offset
+    return Response(body, status=e.status)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def create_lesson_upload(request):
+    if not request.user.is_staff:
+        return Response({'error': 'Only admins can upload lesson files'}, status=status.HTTP_403_FORBIDDEN)
+
+    lesson = None
+    lesson_id = (request.data.get('lesson_id') or '').strip()
+    if lesson_id:
+        try:
+            lesson = Lesson.objects.get(id=lesson_id)
+        except Lesson.DoesNotExist:
+            return Response({'error': 'Lesson not found'}, status=status.HTTP_404_NOT_FOUND)
+    try:
+        upload = create_upload(
+            request.user,
+            field=(request.data.get('field') or '').strip(),
+            file_name=(request.data.get('file_name') or '').strip(),
+            total_size=request.data.get('total_size'),
+            content_type=(request.data.get('content_type') or '').strip(),
+            sha256=request.data.get('sha256') or '',
+            lesson=lesson,
+            block=(request.data.get('block') or '').strip(),
+        )
+    except UploadError as e:
+        return _upload_error(e)
+    return Response({'upload': _upload_state(upload)}, status=status.HTTP_201_CREATED)
+
+
+@api_view(['GET', 'HEAD', 'PUT', 'DELETE'])
+@permission_classes([IsAuthenticated])
+def lesson_upload_detail(request, upload_id: str):
+    if not request.user.is_staff:
+        return Response({'error': 'Only admins can upload lesson files'}, status=status.HTTP_403_FORBIDDEN)
+    try:
+        upload = LessonUpload.objects.get(id=upload_id, created_by=request.user)
+    except LessonUpload.DoesNotExist:
+        return Response({'error': 'Not found'}, status=status.HTTP_404_NOT_FOUND)
+
+    if request.method in ('GET', 'HEAD'):
+        # Clients resume by asking for the offset and sending from there.
+        return Response({'upload': _upload_state(upload)}, headers={'Upload-Offset': str(upload.received)})
+
+    if request.method == 'DELETE':
+        if upload.status != LessonUpload.STATUS_UPLOADING:
+            return Response({'error': 'Upload is already complete'}, status=status.HTTP_400_BAD_REQUEST)
+        discard_upload(upload)
+        return Response({'message': 'Deleted'}, status=status.HTTP_200_OK)
+
+    # PUT: the body is the raw chunk, read straight from the request stream.
+    try:
+        offset = parse_chunk_offset(request.headers.get('Content-Range', ''), request.query_params.get('offset'))
+        length = int(request.META.get('CONTENT_LENGTH') or 0)
+        upload = write_chunk(upload, offset, request._request, length)
+    except UploadError as e:
+        return _upload_error(e)
+    return Response({'upload': _upload_state(upload)}, headers={'Upload-Offset': str(upload.received)})
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def complete_lesson_upload(request, upload_id: str):
+    if not request.user.is_staff:
+        return Response({'error': 'Only admins can upload lesson files'}, status=status.HTTP_403_FORBIDDEN)
+    try:
+        upload = LessonUpload.objects.get(id=upload_id, created_by=request.user)
+    except LessonUpload.DoesNotExist:
+        return Response({'error': 'Not found'}, status=status.HTTP_404_NOT_FOUND)
+    try:
+        lesson = finalize_upload(upload, sha256=request.data.get('sha256') or '')
+    except UploadError as e:
+        return _upload_error(e)
+    lesson.refresh_from_db()
+    return Response({'lesson': LessonSerializer(lesson).data, 'upload': _upload_state(upload)}, status=status.HTTP_200_OK)
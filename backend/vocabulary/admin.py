@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Vocabulary, Exercise, LessonContent
+from .models import Vocabulary, Exercise, LessonContent, ExerciseImage, AudioGenerationJob, AudioManifest, AnswerEvent
 
 
 @admin.register(Vocabulary)
@@ -20,3 +20,27 @@ class LessonContentAdmin(admin.ModelAdmin):
     list_display = ('title', 'created_by', 'created_at')
     search_fields = ('title', 'created_by__email')
 
+
+@admin.register(ExerciseImage)
+class ExerciseImageAdmin(admin.ModelAdmin):
+    list_display = ('name', 'size', 'content_hash', 'updated_at')
+    search_fields = ('name', 'content_hash')
+
+
+@admin.register(AudioGenerationJob)
+class AudioGenerationJobAdmin(admin.ModelAdmin):
+    list_display = ('word', 'kind', 'status', 'attempts', 'next_attempt_at', 'updated_at')
+    search_fields = ('word', 'storage_path')
+    list_filter = ('status', 'kind')
+
+
+@admin.register(AudioManifest)
+class AudioManifestAdmin(admin.ModelAdmin):
+    list_display = ('word', 'file_name', 'duration_ms', 'byte_size', 'codec', 'updated_at')
+    search_fields = ('word', 'file_name')
+
+
+@admin.register(AnswerEvent)
+class AnswerEventAdmin(admin.ModelAdmin):
+    list_display = ('user', 'kind', 'set_id', 'item_id', 'mode', 'correct', 'latency_ms', 'created_at')
+    list_filter = ('kind', 'mode', 'correct')
@@ -0,0 +1,102 @@
+import random
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from vocabulary.models import VocabularyEntry, VocabularyExerciseSet
+from vocabulary.services.distractors import DistractorEngine
+
+
+def _legacy_other_words(exclude_word, k):
+    # The old per-question path: query the whole pool, then sample.
+    pool = list(VocabularyEntry.objects.exclude(word__iexact=exclude_word).values_list('word', flat=True).distinct())
+    if len(pool) <= k:
+        return pool
+    return random.sample(pool, k)
+
+
+def _legacy_other_images(exclude_image, k):
+    pool = list(VocabularyEntry.objects.exclude(image_name=exclude_image).values_list('image_name', flat=True).distinct())
+    if len(pool) <= k:
+        return pool
+    return random.sample(pool, k)
+
+
+class Command(BaseCommand):
+    help = "Benchmark distractor sampling against seeded catalogs of several sizes (rolled back afterwards)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            type=str,
+            default="1000,10000,50000",
+            help="Comma-separated catalog sizes to benchmark",
+        )
+        parser.add_argument(
+            "--questions",
+            type=int,
+            default=40,
+            help="Questions per simulated request",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Simulated requests per catalog size",
+        )
+
+    def handle(self, *args, **options):
+        sizes = [int(s) for s in options["sizes"].split(",") if s.strip()]
+        questions = max(1, options["questions"])
+        repeat = max(1, options["repeat"])
+
+        self.stdout.write(
+            f"{'catalog':>10} {'legacy ms':>12} {'engine ms':>12} {'speedup':>9} "
+            f"{'legacy queries':>15} {'engine queries':>15}"
+        )
+        for size in sizes:
+            with transaction.atomic():
+                self._run(size, questions, repeat)
+                transaction.set_rollback(True)
+        self.stdout.write(f"Timed on {connection.vendor}.")
+
+    def _run(self, size, questions, repeat):
+        User = get_user_model()
+        user = User.objects.create(username=f"bench-distractors-{size}", email=f"bench-distractors-{size}@example.invalid")
+        ex_set = VocabularyExerciseSet.objects.create(title="bench-distractors", created_by=user, entry_count=size)
+        VocabularyEntry.objects.bulk_create([
+            VocabularyEntry(exercise_set=ex_set, word=f"palabra{i}", image_name=f"bench{i}.png")
+            for i in range(size)
+        ], batch_size=1000)
+        entries = list(VocabularyEntry.objects.filter(exercise_set=ex_set).values("word", "image_name"))
+        targets = random.sample(entries, min(size, questions))
+
+        start = time.perf_counter()
+        with CaptureQueriesContext(connection) as legacy_queries:
+            for _ in range(repeat):
+                for idx, e in enumerate(targets):
+                    if idx % 2 == 0:
+                        _legacy_other_words(e["word"], 2)
+                    else:
+                        _legacy_other_images(e["image_name"], 2)
+        legacy_ms = (time.perf_counter() - start) * 1000 / repeat
+
+        start = time.perf_counter()
+        with CaptureQueriesContext(connection) as engine_queries:
+            for _ in range(repeat):
+                engine = DistractorEngine.from_queryset(VocabularyEntry.objects.all())
+                for idx, e in enumerate(targets):
+                    if idx % 2 == 0:
+                        engine.other_words(e["word"], 2)
+                    else:
+                        engine.other_images(e["image_name"], 2)
+        engine_ms = (time.perf_counter() - start) * 1000 / repeat
+
+        speedup = legacy_ms / engine_ms if engine_ms else float("inf")
+        self.stdout.write(
+            f"{size:>10} {legacy_ms:>12.2f} {engine_ms:>12.2f} {speedup:>8.1f}x "
+            f"{len(legacy_queries) / repeat:>15.0f} {len(engine_queries) / repeat:>15.0f}"
+        )
@@ -0,0 +1,119 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from vocabulary.services.document_parser import parse_text_lines
+
+FUZZ_TOKENS = [
+    'VOCABULARY', 'Vocabulary list', 'EXERCISES', 'Exercises:', 'WORD: perro', 'word: Gato', 'WORD:',
+    'IMAGE NAME: dog.png', 'image name: cat.png', 'IMAGE NAME:', 'TYPE: IMAGE_TO_WORD', 'TYPE: WORD_TO_IMAGE',
+    'TYPE:', 'QUESTION: dog.png', 'OPTIONS: perro, gato,, casa', 'ANSWER: perro', 'ANSWER:', '', '   ',
+    'Unit 3 – animals', 'IMAGE: typo.png',
+]
+
+
+def _legacy_parse(lines):
+    # Reference copy of the original index-and-lookahead parser.
+    vocabulary = []
+    exercises = []
+    section = None
+    current = {}
+    i = 0
+    while i < len(lines):
+        line = lines[i].strip()
+        if not line:
+            i += 1
+            continue
+        if line.upper().startswith('VOCABULARY'):
+            section = 'VOCABULARY'
+            i += 1
+            continue
+        if line.upper().startswith('EXERCISES'):
+            section = 'EXERCISES'
+            i += 1
+            continue
+        if section == 'VOCABULARY':
+            if line.upper().startswith('WORD:'):
+                word = line.split(':', 1)[1].strip()
+                img_line = ''
+                j = i + 1
+                while j < len(lines):
+                    nxt = lines[j].strip()
+                    if nxt.upper().startswith('IMAGE NAME:'):
+                        img_line = nxt.split(':', 1)[1].strip()
+                        break
+                    if nxt.upper().startswith('WORD:') or nxt.upper().startswith('EXERCISES'):
+                        break
+                    j += 1
+                vocabulary.append({'word': word, 'imageName': img_line})
+            i += 1
+            continue
+        if section == 'EXERCISES':
+            if line.upper().startswith('TYPE:'):
+                current = {'type': line.split(':', 1)[1].strip(), 'question': '', 'options': [], 'answer': ''}
+            elif line.upper().startswith('QUESTION:') and current:
+                current['question'] = line.split(':', 1)[1].strip()
+            elif line.upper().startswith('OPTIONS:') and current:
+                opts = line.split(':', 1)[1].strip()
+                current['options'] = [o.strip() for o in opts.split(',') if o.strip()]
+            elif line.upper().startswith('ANSWER:') and current:
+                current['answer'] = line.split(':', 1)[1].strip()
+                exercises.append(current)
+                current = {}
+        i += 1
+    return {'vocabulary': vocabulary, 'exercises': exercises}
+
+
+def _well_formed(n):
+    lines = ['VOCABULARY']
+    for i in range(n // 2):
+        lines += [f'WORD: palabra{i}', f'IMAGE NAME: palabra{i}.png']
+    return lines
+
+
+def _noisy(n):
+    # WORD lines that never get an IMAGE NAME, separated by long runs of misplaced
+    # fields: the original lookahead stops at the next WORD, so this is its
+    # longest scan per line, and every noise line is a diagnostic here.
+    lines = ['VOCABULARY']
+    block = max(1, int(n ** 0.5))
+    for i in range(n // (block + 1)):
+        lines.append(f'WORD: palabra{i}')
+        lines += ['TYPE: stray'] * block
+    return lines
+
+
+class Command(BaseCommand):
+    help = "Fuzz the document parser against the original implementation and time it on large inputs."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--fuzz", type=int, default=20000, help="Random documents to compare")
+        parser.add_argument("--sizes", type=str, default="10000,100000,1000000", help="Line counts to time")
+        parser.add_argument("--seed", type=int, default=0, help="Random seed for the fuzz corpus")
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        for n in range(options["fuzz"]):
+            lines = [rng.choice(FUZZ_TOKENS) for _ in range(rng.randint(0, 40))]
+            parsed = parse_text_lines(lines)
+            parsed.pop('diagnostics')
+            parsed.pop('diagnostics_dropped')
+            if parsed != _legacy_parse(lines):
+                raise CommandError(f"Output mismatch on fuzz case {n}: {lines!r}")
+        self.stdout.write(self.style.SUCCESS(f"Fuzz: {options['fuzz']} documents match the original parser."))
+
+        self.stdout.write(f"{'shape':>13} {'lines':>9} {'parser ms':>10} {'ns/line':>8} {'legacy ms':>10} {'diags':>7}")
+        for size in [int(s) for s in options["sizes"].split(",") if s.strip()]:
+            for shape, build in (("well-formed", _well_formed), ("noisy", _noisy)):
+                lines = build(size)
+                start = time.perf_counter()
+                parsed = parse_text_lines(iter(lines))
+                parser_ms = (time.perf_counter() - start) * 1000
+                start = time.perf_counter()
+                _legacy_parse(lines)
+                legacy_ms = (time.perf_counter() - start) * 1000
+                self.stdout.write(
+                    f"{shape:>13} {len(lines):>9} {parser_ms:>10.1f} {parser_ms * 1e6 / len(lines):>8.0f} "
+                    f"{legacy_ms:>10.1f} {len(parsed['diagnostics']):>7}"
+                )
@@ -0,0 +1,168 @@
+import os
+import tempfile
+import time
+import tracemalloc
+import zipfile
+from xml.sax.saxutils import escape
+
+from django.core.management.base import BaseCommand
+
+from vocabulary.services.document_parser import parse_text_lines
+from vocabulary.services.document_reader import iter_document_lines
+
+LINES_PER_PAGE = 60
+
+
+def _synthetic_lines(pages):
+    yield 'VOCABULARY'
+    n = (pages * LINES_PER_PAGE) // 2
+    for i in range(n):
+        yield f'WORD: palabra{i}'
+        yield f'IMAGE NAME: palabra{i}.png'
+
+
+def _write_docx(path, pages):
+    head = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:body>'
+    )
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as z:
+        z.writestr('[Content_Types].xml', (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/word/document.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+            '</Types>'
+        ))
+        z.writestr('_rels/.rels', (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" '
+            'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+            'Target="word/document.xml"/></Relationships>'
+        ))
+        with z.open('word/document.xml', 'w') as fh:
+            fh.write(head.encode('utf-8'))
+            for line in _synthetic_lines(pages):
+                fh.write(f'<w:p><w:r><w:t>{escape(line)}</w:t></w:r></w:p>'.encode('utf-8'))
+            fh.write(b'</w:body></w:document>')
+
+
+def _write_pdf(path, pages):
+    lines = list(_synthetic_lines(pages))
+    chunks = [lines[i:i + LINES_PER_PAGE] for i in range(0, len(lines), LINES_PER_PAGE)]
+    objects = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        None,
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>',
+    ]
+    kids = []
+    for chunk in chunks:
+        text = ' T* '.join(
+            '(' + line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)') + ') Tj' for line in chunk
+        )
+        stream = f'BT /F1 10 Tf 12 TL 50 780 Td {text} ET'.encode('latin-1', 'replace')
+        objects.append(b'<< /Length %d >>\nstream\n' % len(stream) + stream + b'\nendstream')
+        content_id = len(objects)
+        objects.append(
+            b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+            b'/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>' % content_id
+        )
+        kids.append(len(objects))
+    objects[1] = b'<< /Type /Pages /Kids [%s] /Count %d >>' % (
+        b' '.join(b'%d 0 R' % k for k in kids), len(kids)
+    )
+    with open(path, 'wb') as fh:
+        fh.write(b'%PDF-1.4\n')
+        offsets = []
+        for i, obj in enumerate(objects, start=1):
+            offsets.append(fh.tell())
+            fh.write(b'%d 0 obj\n' % i + obj + b'\nendobj\n')
+        xref = fh.tell()
+        fh.write(b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1))
+        for off in offsets:
+            fh.write(b'%010d 00000 n \n' % off)
+        fh.write(b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref))
+
+
+def _legacy_lines(fh):
+    # Whole-document read, as the views did before streaming.
+    if fh.name.endswith('.docx'):
+        from docx import Document
+        return [p.text for p in Document(fh).paragraphs]
+    from pdfminer.high_level import extract_text
+    return extract_text(fh).splitlines()
+
+
+def _measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+class Command(BaseCommand):
+    help = "Benchmark streaming vs whole-document reading on synthetic large documents."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--pages",
+            type=str,
+            default="10,100,300",
+            help="Comma-separated page counts to generate",
+        )
+        parser.add_argument(
+            "--formats",
+            type=str,
+            default="docx,pdf",
+            help="Comma-separated formats to benchmark (docx, pdf)",
+        )
+        parser.add_argument(
+            "--skip-legacy",
+            action="store_true",
+            help="Only measure the streaming reader",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            # Import parser libraries up front so module loading is not counted as peak memory.
+            import pdfminer.high_level  # noqa: F401
+            import pdfminer.pdfpage  # noqa: F401
+        except ImportError:
+            pass
+        page_counts = [int(p) for p in options["pages"].split(",") if p.strip()]
+        formats = [f.strip() for f in options["formats"].split(",") if f.strip()]
+        self.stdout.write(
+            f"{'format':>6} {'pages':>6} {'words':>7} {'stream s':>9} {'stream peak MiB':>16} "
+            f"{'legacy s':>9} {'legacy peak MiB':>16}"
+        )
+        with tempfile.TemporaryDirectory() as tmp:
+            for fmt in formats:
+                for pages in page_counts:
+                    path = os.path.join(tmp, f"synthetic-{pages}.{fmt}")
+                    (_write_docx if fmt == "docx" else _write_pdf)(path, pages)
+                    with open(path, "rb") as fh:
+                        parsed, stream_s, stream_peak = _measure(
+                            lambda: parse_text_lines(iter_document_lines(fh))
+                        )
+                    legacy = "-"
+                    if not options["skip_legacy"]:
+                        try:
+                            with open(path, "rb") as fh:
+                                legacy_parsed, legacy_s, legacy_peak = _measure(
+                                    lambda: parse_text_lines(_legacy_lines(fh))
+                                )
+                            legacy = f"{legacy_s:>9.2f} {legacy_peak / 2 ** 20:>16.1f}"
+                            if legacy_parsed != parsed:
+                                legacy += " (output differs)"
+                        except ImportError as e:
+                            legacy = f"unavailable ({e})"
+                    self.stdout.write(
+                        f"{fmt:>6} {pages:>6} {len(parsed['vocabulary']):>7} {stream_s:>9.2f} "
+                        f"{stream_peak / 2 ** 20:>16.1f} {legacy}"
+                    )
@@ -0,0 +1,109 @@
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from vocabulary.models import VocabularyEntry, VocabularyExerciseSet, WordReviewState
+from vocabulary.services.review import apply_answers, due_entries, review_questions
+
+
+def _percentiles(samples):
+    samples = sorted(samples)
+    p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+    return statistics.median(samples), p95, samples[-1]
+
+
+class Command(BaseCommand):
+    help = "Benchmark the review-now query and SM-2 updates against synthetic learners (rolled back afterwards)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--learners", type=int, default=500, help="Synthetic learners")
+        parser.add_argument("--words", type=int, default=2000, help="Words each learner has reviewed")
+        parser.add_argument("--requests", type=int, default=200, help="Review-now requests to time")
+        parser.add_argument("--limit", type=int, default=20, help="Questions per review-now request")
+        parser.add_argument("--answers", type=int, default=10000, help="Answers folded in by the update benchmark")
+        parser.add_argument("--explain", action="store_true", help="Print the query plan of the due query")
+
+    def handle(self, *args, **options):
+        learners = max(1, options["learners"])
+        words = max(3, options["words"])
+        with transaction.atomic():
+            self._run(learners, words, options)
+            transaction.set_rollback(True)
+
+    def _run(self, learners, words, options):
+        User = get_user_model()
+        now = timezone.now()
+        rng = random.Random(42)
+
+        users = User.objects.bulk_create([
+            User(username=f"bench-review-{i}", email=f"bench-review-{i}@example.invalid")
+            for i in range(learners)
+        ], batch_size=1000)
+        user_ids = [u.pk for u in users]
+        ex_set = VocabularyExerciseSet.objects.create(title="bench-review", created_by=users[0], entry_count=words)
+        VocabularyEntry.objects.bulk_create([
+            VocabularyEntry(exercise_set=ex_set, word=f"palabra{i}", image_name=f"bench{i}.png")
+            for i in range(words)
+        ], batch_size=1000)
+        entry_ids = list(VocabularyEntry.objects.filter(exercise_set=ex_set).values_list("pk", flat=True))
+
+        start = time.perf_counter()
+        batch = []
+        for user_id in user_ids:
+            for entry_id in entry_ids:
+                batch.append(WordReviewState(
+                    user_id=user_id,
+                    entry_id=entry_id,
+                    ease=rng.uniform(1.3, 3.0),
+                    interval_days=rng.randint(0, 60),
+                    repetitions=rng.randint(0, 8),
+                    due_at=now + timedelta(minutes=rng.randint(-30 * 24 * 60, 60 * 24 * 60)),
+                ))
+                if len(batch) >= 5000:
+                    WordReviewState.objects.bulk_create(batch)
+                    batch = []
+        WordReviewState.objects.bulk_create(batch)
+        rows = learners * words
+        self.stdout.write(f"Seeded {rows} review states in {time.perf_counter() - start:.1f}s")
+
+        if options["explain"]:
+            qs = WordReviewState.objects.filter(user_id=user_ids[0], due_at__lte=now).order_by("due_at")[:options["limit"]]
+            self.stdout.write(qs.explain())
+
+        limit = max(1, options["limit"])
+        requests = max(1, options["requests"])
+        query_ms = []
+        for _ in range(requests):
+            user_id = rng.choice(user_ids)
+            t = time.perf_counter()
+            due_entries(user_id, limit, now=now)
+            query_ms.append((time.perf_counter() - t) * 1000)
+        full_ms = []
+        for _ in range(requests):
+            user = users[rng.randrange(learners)]
+            t = time.perf_counter()
+            review_questions(user, limit)
+            full_ms.append((time.perf_counter() - t) * 1000)
+
+        answers = [
+            (rng.choice(user_ids), rng.choice(entry_ids), rng.random() < 0.7, rng.randint(500, 12000), now)
+            for _ in range(max(1, options["answers"]))
+        ]
+        t = time.perf_counter()
+        written = apply_answers(answers)
+        apply_s = time.perf_counter() - t
+
+        self.stdout.write(f"{'step':>22} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}")
+        for label, samples in (("due query", query_ms), ("review-now payload", full_ms)):
+            p50, p95, worst = _percentiles(samples)
+            self.stdout.write(f"{label:>22} {p50:>9.2f} {p95:>9.2f} {worst:>9.2f}")
+        self.stdout.write(
+            f"apply_answers: {len(answers)} answers -> {written} states in {apply_s * 1000:.0f} ms "
+            f"({len(answers) / apply_s:.0f} answers/s) on {connection.vendor}"
+        )
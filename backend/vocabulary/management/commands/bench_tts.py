@@ -0,0 +1,60 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from vocabulary.models import VocabularyEntry
+from vocabulary.services.tts import BACKENDS, get_backend
+
+SAMPLE_WORDS = [
+    'perro', 'gato', 'casa', 'sol', 'agua', 'libro', 'manzana', 'silla', 'coche', 'árbol',
+    'ventana', 'mesa', 'puerta', 'cocina', 'escuela', 'camisa', 'zapato', 'ciudad', 'playa', 'montaña',
+]
+
+
+class Command(BaseCommand):
+    help = "Report text-to-speech throughput (words/second) for each backend."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--backends",
+            type=str,
+            default=",".join(BACKENDS),
+            help="Comma-separated backend names to benchmark",
+        )
+        parser.add_argument(
+            "--words",
+            type=int,
+            default=20,
+            help="Number of words to synthesize per backend",
+        )
+        parser.add_argument(
+            "--from-catalog",
+            action="store_true",
+            help="Use words from the vocabulary catalog instead of the built-in sample",
+        )
+
+    def handle(self, *args, **options):
+        count = max(1, options["words"])
+        if options["from_catalog"]:
+            words = list(VocabularyEntry.objects.order_by().values_list("word", flat=True).distinct()[:count])
+        else:
+            words = [SAMPLE_WORDS[i % len(SAMPLE_WORDS)] + ("" if i < len(SAMPLE_WORDS) else f" {i}") for i in range(count)]
+        if not words:
+            self.stdout.write(self.style.WARNING("No words to synthesize."))
+            return
+
+        for name in [n.strip() for n in options["backends"].split(",") if n.strip()]:
+            try:
+                backend = get_backend(name)
+                start = time.perf_counter()
+                audio = backend.synthesize_batch(words)
+                elapsed = time.perf_counter() - start
+            except Exception as e:
+                self.stdout.write(self.style.ERROR(f"{name:>8}: unavailable ({e})"))
+                continue
+            total_bytes = sum(len(b) for b in audio.values())
+            rate = len(audio) / elapsed if elapsed else float("inf")
+            self.stdout.write(
+                f"{name:>8}: {len(audio)} words in {elapsed:.2f}s "
+                f"({rate:.1f} words/s, {total_bytes / 1024:.0f} KiB, batch={'yes' if backend.supports_batch else 'no'})"
+            )
@@ -0,0 +1,46 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from vocabulary.models import ExerciseImage
+from vocabulary.services.image_variants import prune_orphan_variants, variant_widths, variants_for_image
+
+
+class Command(BaseCommand):
+    help = "Backfill resized WebP/JPEG variants for catalogued exercise images."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Re-encode variants that already exist.')
+        parser.add_argument('--workers', type=int, default=settings.IMAGE_UPLOAD_WORKERS)
+        parser.add_argument('--prune', action='store_true', help='Delete variants of images no longer in the catalog.')
+
+    def handle(self, *args, **options):
+        force = options['force']
+        wanted = variant_widths()
+        # Images smaller than some widths never match ``wanted``; re-checking them only reads the header.
+        images = [img for img in ExerciseImage.objects.exclude(content_hash='') if force or img.variant_widths != wanted]
+
+        def run(img):
+            try:
+                return img, variants_for_image(img, force=force), None
+            except Exception as e:
+                return img, None, e
+
+        changed = []
+        failed = 0
+        with ThreadPoolExecutor(max_workers=max(1, options['workers'])) as pool:
+            for img, widths, error in pool.map(run, images):
+                if error is not None:
+                    failed += 1
+                    self.stderr.write(f"{img.name}: {error}")
+                    continue
+                if widths != img.variant_widths:
+                    img.variant_widths = widths
+                    changed.append(img)
+        ExerciseImage.objects.bulk_update(changed, ['variant_widths'], batch_size=500)
+        self.stdout.write(self.style.SUCCESS(
+            f"Variants generated for {len(images) - failed} images ({len(changed)} updated, {failed} failed)."
+        ))
+        if options['prune']:
+            self.stdout.write(f"Pruned {prune_orphan_variants()} orphaned variant files.")
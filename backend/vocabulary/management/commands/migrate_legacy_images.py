@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from vocabulary.services.image_catalog import migrate_legacy_images
+
+
+class Command(BaseCommand):
+    help = "Copy images from the legacy vocabulary_images directory into exercise_images."
+
+    def handle(self, *args, **options):
+        copied = migrate_legacy_images()
+        if not copied:
+            self.stdout.write(self.style.WARNING("No legacy images to migrate."))
+            return
+        self.stdout.write(self.style.SUCCESS(f"Migrated {len(copied)} legacy image(s)."))
@@ -0,0 +1,24 @@
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+
+from vocabulary.models import VocabularyEntry
+from vocabulary.services.audio import audio_storage_path, record_audio
+
+
+class Command(BaseCommand):
+    help = "Record existing vocabulary audio files in the audio manifest."
+
+    def handle(self, *args, **options):
+        words = VocabularyEntry.objects.order_by().values_list("word", flat=True).distinct()
+        recorded = missing = 0
+        for word in words:
+            path = audio_storage_path(word)
+            if not path:
+                continue
+            if not default_storage.exists(path):
+                missing += 1
+                continue
+            with default_storage.open(path, "rb") as fh:
+                record_audio(word, fh.read())
+            recorded += 1
+        self.stdout.write(self.style.SUCCESS(f"Recorded {recorded} audio file(s); {missing} word(s) have no audio yet."))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from vocabulary.services.image_catalog import reconcile_catalog
+
+
+class Command(BaseCommand):
+    help = "Sync the exercise image catalog with files changed outside the images endpoint."
+
+    def handle(self, *args, **options):
+        added, updated, removed = reconcile_catalog()
+        self.stdout.write(self.style.SUCCESS(
+            f"Image catalog reconciled: {added} added, {updated} updated, {removed} removed."
+        ))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from daily_routine.models import DailyRoutineExerciseSet
+from vocabulary.models import VocabularyExerciseSet
+from vocabulary.services.entry_diff import repair_entry_counts
+
+
+class Command(BaseCommand):
+    help = "Recompute the denormalized entry_count of vocabulary and daily routine exercise sets."
+
+    def handle(self, *args, **options):
+        for model in (VocabularyExerciseSet, DailyRoutineExerciseSet):
+            fixed = repair_entry_counts(model)
+            self.stdout.write(self.style.SUCCESS(f"{model.__name__}: {fixed} sets repaired."))
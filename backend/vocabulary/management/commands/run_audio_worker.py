@@ -0,0 +1,63 @@
+from django.core.management.base import BaseCommand
+
+from daily_routine.models import DailyRoutineEntry
+from daily_routine.services.sentence_audio import enqueue_sentences
+from vocabulary.models import VocabularyEntry
+from vocabulary.services.audio_queue import enqueue_words, run_worker
+from vocabulary.services.tts import get_backend
+
+
+class Command(BaseCommand):
+    help = "Process queued audio generation jobs for vocabulary words and daily routine sentences."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Concurrent synthesis threads (defaults to AUDIO_QUEUE_WORKERS)",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Drain the jobs that are due now and exit instead of polling",
+        )
+        parser.add_argument(
+            "--backend",
+            type=str,
+            default=None,
+            help="TTS backend to use (defaults to TTS_BACKEND)",
+        )
+        parser.add_argument(
+            "--enqueue-catalog",
+            action="store_true",
+            help="Queue every vocabulary word that has no audio job before processing",
+        )
+        parser.add_argument(
+            "--enqueue-sentences",
+            action="store_true",
+            help="Queue every daily routine sentence that has no audio job before processing",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=2.0,
+            help="Seconds to wait between polls when the queue is empty",
+        )
+
+    def handle(self, *args, **options):
+        if options["enqueue_catalog"]:
+            words = VocabularyEntry.objects.order_by().values_list("word", flat=True).distinct()
+            queued = enqueue_words(words)
+            self.stdout.write(f"Queued {queued} new audio job(s).")
+        if options["enqueue_sentences"]:
+            sentences = DailyRoutineEntry.objects.order_by().values_list("spanish_sentence", flat=True).distinct()
+            queued = enqueue_sentences(sentences.iterator(chunk_size=2000))
+            self.stdout.write(f"Queued {queued} new sentence audio job(s).")
+        processed = run_worker(
+            workers=options["workers"],
+            once=options["once"],
+            poll_interval=options["poll_interval"],
+            backend=get_backend(options["backend"]),
+        )
+        self.stdout.write(self.style.SUCCESS(f"Processed {processed} audio job(s)."))
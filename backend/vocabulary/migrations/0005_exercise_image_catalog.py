@@ -0,0 +1,61 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:28
+
+import hashlib
+import os
+
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+def populate_catalog(apps, schema_editor):
+    ExerciseImage = apps.get_model('vocabulary', 'ExerciseImage')
+    dir_path = os.path.join(settings.MEDIA_ROOT, 'exercise_images')
+    try:
+        names = sorted(f for f in os.listdir(dir_path) if os.path.isfile(os.path.join(dir_path, f)))
+    except Exception:
+        names = []
+    rows = []
+    for name in names:
+        h = hashlib.sha256()
+        size = 0
+        try:
+            with open(os.path.join(dir_path, name), 'rb') as fh:
+                for chunk in iter(lambda: fh.read(64 * 1024), b''):
+                    h.update(chunk)
+                    size += len(chunk)
+        except OSError:
+            continue
+        rows.append(ExerciseImage(
+            name=name,
+            storage_path=os.path.join('exercise_images', name),
+            size=size,
+            content_hash=h.hexdigest(),
+        ))
+    ExerciseImage.objects.bulk_create(rows, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vocabulary', '0004_vocabulary_exercise_progress'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExerciseImage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('storage_path', models.CharField(max_length=512)),
+                ('size', models.BigIntegerField(default=0)),
+                ('content_hash', models.CharField(blank=True, db_index=True, default='', max_length=64)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.RunPython(populate_catalog, migrations.RunPython.noop),
+    ]
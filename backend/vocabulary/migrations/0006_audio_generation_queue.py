@@ -0,0 +1,56 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:29
+
+import hashlib
+import os
+
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+from django.utils.text import slugify
+
+
+def seed_jobs(apps, schema_editor):
+    VocabularyEntry = apps.get_model('vocabulary', 'VocabularyEntry')
+    AudioGenerationJob = apps.get_model('vocabulary', 'AudioGenerationJob')
+    jobs = {}
+    for word in VocabularyEntry.objects.order_by().values_list('word', flat=True).distinct():
+        raw = (word or '').strip()
+        if not raw:
+            continue
+        h = hashlib.sha1(raw.encode('utf-8')).hexdigest()[:16]
+        base = slugify(raw)[:40] or 'word'
+        path = os.path.join('exercise_audio', f'{base}-{h}.mp3')
+        if path in jobs:
+            continue
+        done = os.path.isfile(os.path.join(settings.MEDIA_ROOT, path))
+        jobs[path] = AudioGenerationJob(word=raw, storage_path=path, status='done' if done else 'pending')
+    AudioGenerationJob.objects.bulk_create(list(jobs.values()), ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vocabulary', '0005_exercise_image_catalog'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AudioGenerationJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('word', models.CharField(max_length=255)),
+                ('storage_path', models.CharField(max_length=255, unique=True)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=10)),
+                ('attempts', models.IntegerField(default=0)),
+                ('last_error', models.TextField(blank=True, default='')),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'ordering': ['created_at'],
+                'indexes': [models.Index(fields=['status', 'next_attempt_at'], name='vocabulary__status_78ae5d_idx')],
+            },
+        ),
+        migrations.RunPython(seed_jobs, migrations.RunPython.noop),
+    ]
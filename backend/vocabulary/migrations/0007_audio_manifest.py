@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:31
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vocabulary', '0006_audio_generation_queue'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AudioManifest',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('word', models.CharField(max_length=255, unique=True)),
+                ('file_name', models.CharField(max_length=255)),
+                ('duration_ms', models.IntegerField(blank=True, null=True)),
+                ('byte_size', models.BigIntegerField(default=0)),
+                ('codec', models.CharField(default='mp3', max_length=20)),
+                ('content_hash', models.CharField(blank=True, default='', max_length=64)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+    ]
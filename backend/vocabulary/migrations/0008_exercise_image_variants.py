@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vocabulary', '0007_audio_manifest'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='exerciseimage',
+            name='variant_widths',
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
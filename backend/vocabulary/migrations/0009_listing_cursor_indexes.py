@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:42
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vocabulary', '0008_exercise_image_variants'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='exercise',
+            index=models.Index(fields=['created_at', 'id'], name='exercise_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vocabularyexerciseset',
+            index=models.Index(fields=['created_at', 'id'], name='vocab_set_created_idx'),
+        ),
+    ]
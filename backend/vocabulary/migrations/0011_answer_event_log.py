@@ -0,0 +1,81 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:44
+
+import datetime
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+PARTITIONED_TABLE_SQL = """
+CREATE TABLE vocabulary_answerevent (
+    id bigserial NOT NULL,
+    user_id varchar(50) NOT NULL,
+    kind varchar(16) NOT NULL,
+    set_id bigint NOT NULL,
+    item_id bigint NULL,
+    mode varchar(32) NOT NULL,
+    correct boolean NOT NULL,
+    latency_ms integer NULL,
+    answered_at timestamp with time zone NOT NULL,
+    created_at timestamp with time zone NOT NULL,
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+CREATE INDEX answer_event_user_idx ON vocabulary_answerevent (user_id, created_at);
+CREATE TABLE vocabulary_answerevent_default PARTITION OF vocabulary_answerevent DEFAULT;
+"""
+
+
+def create_answer_event_table(apps, schema_editor):
+    """Month-partitioned on PostgreSQL; a plain table elsewhere. Monthly
+    partitions are added by ``ensure_partitions`` as events arrive."""
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(PARTITIONED_TABLE_SQL)
+        month = django.utils.timezone.now().date().replace(day=1)
+        for _ in range(3):
+            nxt = (month.replace(day=28) + datetime.timedelta(days=4)).replace(day=1)
+            schema_editor.execute(
+                f"CREATE TABLE vocabulary_answerevent_y{month:%Y}m{month:%m} PARTITION OF vocabulary_answerevent "
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{nxt.isoformat()}')"
+            )
+            month = nxt
+    else:
+        schema_editor.create_model(apps.get_model('vocabulary', 'AnswerEvent'))
+
+
+def drop_answer_event_table(apps, schema_editor):
+    schema_editor.delete_model(apps.get_model('vocabulary', 'AnswerEvent'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vocabulary', '0010_exercise_set_entry_count'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='AnswerEvent',
+                    fields=[
+                        ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                        ('kind', models.CharField(choices=[('vocabulary', 'vocabulary'), ('daily_routine', 'daily_routine')], max_length=16)),
+                        ('set_id', models.BigIntegerField()),
+                        ('item_id', models.BigIntegerField(blank=True, null=True)),
+                        ('mode', models.CharField(max_length=32)),
+                        ('correct', models.BooleanField()),
+                        ('latency_ms', models.IntegerField(blank=True, null=True)),
+                        ('answered_at', models.DateTimeField()),
+                        ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                        ('user', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL)),
+                    ],
+                    options={
+                        'indexes': [models.Index(fields=['user', 'created_at'], name='answer_event_user_idx')],
+                    },
+                ),
+            ],
+        ),
+        migrations.RunPython(create_answer_event_table, drop_answer_event_table),
+    ]
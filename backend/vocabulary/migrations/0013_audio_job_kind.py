@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vocabulary', '0012_word_review_state'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='audiogenerationjob',
+            name='kind',
+            field=models.CharField(choices=[('word', 'Vocabulary word'), ('sentence', 'Daily routine sentence')], default='word', max_length=10),
+        ),
+        migrations.AlterField(
+            model_name='audiogenerationjob',
+            name='word',
+            field=models.TextField(),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vocabulary', '0013_audio_job_kind'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vocabularyexerciseset',
+            name='content_version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
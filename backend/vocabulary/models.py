@@ -31,15 +31,24 @@ class Exercise(models.Model):
 
     class Meta:
         unique_together = ('type', 'question')
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='exercise_created_idx'),
+        ]
 
 
 class VocabularyExerciseSet(models.Model):
     title = models.CharField(max_length=255)
     created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='vocabulary_exercise_sets')
+    entry_count = models.PositiveIntegerField(default=0)
+    # Bumped whenever the set's questions change; part of the question bank cache key.
+    content_version = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(default=timezone.now)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='vocab_set_created_idx'),
+        ]
 
 
 class VocabularyEntry(models.Model):
@@ -63,3 +72,123 @@ class VocabularyExerciseProgress(models.Model):
 
     class Meta:
         unique_together = ('user', 'exercise_set')
+
+
+class VocabularyProgressEvent(models.Model):
+    """Client event ids already applied by progress sync; replays of them are skipped."""
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='vocabulary_progress_events')
+    exercise_set = models.ForeignKey(VocabularyExerciseSet, on_delete=models.CASCADE, related_name='progress_events')
+    event_id = models.CharField(max_length=64)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        unique_together = ('user', 'event_id')
+
+
+class ExerciseImage(models.Model):
+    name = models.CharField(max_length=255, unique=True)
+    storage_path = models.CharField(max_length=512)
+    size = models.BigIntegerField(default=0)
+    content_hash = models.CharField(max_length=64, db_index=True, blank=True, default='')
+    variant_widths = models.JSONField(default=list, blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['name']
+
+
+class AudioGenerationJob(models.Model):
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_DONE, 'Done'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+    KIND_WORD = 'word'
+    KIND_SENTENCE = 'sentence'
+    KIND_CHOICES = [
+        (KIND_WORD, 'Vocabulary word'),
+        (KIND_SENTENCE, 'Daily routine sentence'),
+    ]
+
+    # Text to synthesize: a vocabulary word or a daily routine sentence.
+    word = models.TextField()
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES, default=KIND_WORD)
+    storage_path = models.CharField(max_length=255, unique=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.IntegerField(default=0)
+    last_error = models.TextField(blank=True, default='')
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
+
+
+class AudioManifest(models.Model):
+    word = models.CharField(max_length=255, unique=True)
+    file_name = models.CharField(max_length=255)
+    duration_ms = models.IntegerField(null=True, blank=True)
+    byte_size = models.BigIntegerField(default=0)
+    codec = models.CharField(max_length=20, default='mp3')
+    content_hash = models.CharField(max_length=64, blank=True, default='')
+    created_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+
+class AnswerEvent(models.Model):
+    """One answered question, appended by the answer event buffer.
+
+    On PostgreSQL the table is range-partitioned by month on ``created_at``
+    (see migration 0011); rows are never updated.
+    """
+
+    KIND_CHOICES = [
+        ('vocabulary', 'vocabulary'),
+        ('daily_routine', 'daily_routine'),
+    ]
+
+    id = models.BigAutoField(primary_key=True)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.DO_NOTHING, db_constraint=False, related_name='+')
+    kind = models.CharField(max_length=16, choices=KIND_CHOICES)
+    set_id = models.BigIntegerField()
+    item_id = models.BigIntegerField(null=True, blank=True)
+    mode = models.CharField(max_length=32)
+    correct = models.BooleanField()
+    latency_ms = models.IntegerField(null=True, blank=True)
+    answered_at = models.DateTimeField()
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'created_at'], name='answer_event_user_idx'),
+        ]
+
+
+class WordReviewState(models.Model):
+    """SM-2 scheduling state of one vocabulary entry for one learner."""
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='word_reviews')
+    entry = models.ForeignKey(VocabularyEntry, on_delete=models.CASCADE, related_name='review_states')
+    ease = models.FloatField(default=2.5)
+    interval_days = models.IntegerField(default=0)
+    repetitions = models.IntegerField(default=0)
+    lapses = models.IntegerField(default=0)
+    due_at = models.DateTimeField()
+    last_reviewed_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        unique_together = ('user', 'entry')
+        indexes = [
+            models.Index(fields=['user', 'due_at'], name='review_user_due_idx'),
+        ]
@@ -1,4 +1,6 @@
 from rest_framework import serializers
+
+from backend.pagination import DynamicFieldsMixin
 from .models import Vocabulary, Exercise, LessonContent, VocabularyExerciseSet, VocabularyEntry
 
 
@@ -8,7 +10,7 @@ class VocabularySerializer(serializers.ModelSerializer):
         fields = ['id', 'word', 'image', 'created_at']
 
 
-class ExerciseSerializer(serializers.ModelSerializer):
+class ExerciseSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     vocabulary_word = serializers.CharField(source='vocabulary.word', read_only=True)
 
     class Meta:
@@ -23,13 +25,18 @@ class LessonContentSerializer(serializers.ModelSerializer):
 
 
 class VocabularyEntrySerializer(serializers.ModelSerializer):
+    audio_status = serializers.SerializerMethodField()
+
     class Meta:
         model = VocabularyEntry
-        fields = ['id', 'word', 'image_name', 'created_at']
+        fields = ['id', 'word', 'image_name', 'audio_status', 'created_at']
+
+    def get_audio_status(self, obj):
+        return self.context.get('audio_status', {}).get(obj.word)
 
 
-class VocabularyExerciseSetSerializer(serializers.ModelSerializer):
-    word_count = serializers.IntegerField(read_only=True)
+class VocabularyExerciseSetSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    word_count = serializers.IntegerField(source='entry_count', read_only=True)
 
     class Meta:
         model = VocabularyExerciseSet
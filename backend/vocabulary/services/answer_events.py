@@ -0,0 +1,226 @@
+import atexit
+import csv
+import io
+import logging
+import re
+import threading
+from datetime import date, timedelta, timezone as dt_timezone
+from typing import Dict, List, Tuple
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from ..models import AnswerEvent
+from .review import apply_answers
+
+logger = logging.getLogger(__name__)
+
+MAX_EVENTS_PER_REQUEST = 1000
+
+_MODE_RE = re.compile(r'^[a-z][a-z0-9_]{0,31}$')
+_KINDS = {k for k, _ in AnswerEvent.KIND_CHOICES}
+_COPY_COLUMNS = ('user_id', 'kind', 'set_id', 'item_id', 'mode', 'correct', 'latency_ms', 'answered_at', 'created_at')
+
+
+def clean_event(raw, now) -> Tuple:
+    """Validate one client event and return it as a row tuple in ``_COPY_COLUMNS`` order (minus user)."""
+    if not isinstance(raw, dict):
+        raise ValueError('Event must be an object')
+    kind = raw.get('kind') or 'vocabulary'
+    if kind not in _KINDS:
+        raise ValueError('Unknown kind')
+    mode = raw.get('mode')
+    if not isinstance(mode, str) or not _MODE_RE.match(mode):
+        raise ValueError('Invalid mode')
+    correct = raw.get('correct')
+    if not isinstance(correct, bool):
+        raise ValueError('correct must be a boolean')
+    try:
+        set_id = int(raw.get('set_id'))
+        item_id = int(raw['item_id']) if raw.get('item_id') is not None else None
+        latency_ms = int(raw['latency_ms']) if raw.get('latency_ms') is not None else None
+    except (TypeError, ValueError):
+        raise ValueError('Invalid set_id, item_id or latency_ms')
+    if latency_ms is not None:
+        latency_ms = max(0, min(latency_ms, 2 ** 31 - 1))
+    answered_at = now
+    if raw.get('answered_at'):
+        answered_at = parse_datetime(str(raw['answered_at']))
+        if answered_at is None:
+            raise ValueError('Invalid answered_at')
+        if timezone.is_naive(answered_at):
+            answered_at = timezone.make_aware(answered_at, dt_timezone.utc)
+        answered_at = min(answered_at, now)
+    return kind, set_id, item_id, mode, correct, latency_ms, answered_at, now
+
+
+def _month_start(d: date) -> date:
+    return d.replace(day=1)
+
+
+def _next_month(d: date) -> date:
+    return (d.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+_ensured_months = set()
+
+
+def ensure_partitions(months):
+    """Create the monthly partitions covering ``months`` (first-of-month dates) on PostgreSQL."""
+    if connection.vendor != 'postgresql':
+        return
+    table = AnswerEvent._meta.db_table
+    for month in sorted(set(months) - _ensured_months):
+        name = f'{table}_y{month:%Y}m{month:%m}'
+        sql = (
+            f'CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table} '
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{_next_month(month).isoformat()}')"
+        )
+        try:
+            with transaction.atomic(), connection.cursor() as cur:
+                cur.execute(sql)
+        except Exception as e:
+            # Rows for this month already sit in the default partition; they stay there.
+            logger.warning(f'Could not create partition {name}: {e}')
+        _ensured_months.add(month)
+
+
+def write_events(rows: List[Tuple]) -> int:
+    """Append rows (tuples in ``_COPY_COLUMNS`` order) in one statement.
+
+    Uses ``COPY ... FROM STDIN`` on PostgreSQL and ``bulk_create`` elsewhere.
+    """
+    if not rows:
+        return 0
+    if connection.vendor == 'postgresql':
+        ensure_partitions(_month_start(row[-1].date()) for row in rows)
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        for row in rows:
+            writer.writerow(['' if v is None else v.isoformat() if hasattr(v, 'isoformat') else v for v in row])
+        buf.seek(0)
+        columns = ', '.join(_COPY_COLUMNS)
+        with connection.cursor() as cur:
+            cur.copy_expert(f"COPY {AnswerEvent._meta.db_table} ({columns}) FROM STDIN WITH (FORMAT csv, NULL '')", buf)
+    else:
+        AnswerEvent.objects.bulk_create(
+            [AnswerEvent(**dict(zip(_COPY_COLUMNS, row))) for row in rows],
+            batch_size=500,
+        )
+    return len(rows)
+
+
+class AnswerEventBuffer:
+    """Process-local buffer that batches answer events off the request path.
+
+    Requests only append to a list; a daemon thread writes the buffer every
+    ``ANSWER_EVENT_FLUSH_INTERVAL`` seconds, or as soon as it holds
+    ``ANSWER_EVENT_FLUSH_SIZE`` rows. A batch whose write fails is put back
+    and retried on later flushes, up to ``ANSWER_EVENT_WRITE_ATTEMPTS``
+    times, before it is dropped and logged. Pending rows are written when
+    the process exits normally (including a graceful worker shutdown); a
+    process that is killed loses what it was still holding, at most one
+    flush interval of events or a backlog of failed batches. Vocabulary
+    answers also advance the learners' review schedules once written.
+    """
+
+    def __init__(self):
+        self._rows = []
+        self._retry = []  # (failed attempts, rows)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._rows) + sum(len(rows) for _, rows in self._retry)
+
+    def add(self, rows: List[Tuple]) -> bool:
+        """Queue rows; returns ``False`` when the buffer is full and nothing was queued."""
+        with self._lock:
+            held = len(self._rows) + sum(len(batch) for _, batch in self._retry)
+            if held + len(rows) > settings.ANSWER_EVENT_BUFFER_MAX:
+                return False
+            self._rows.extend(rows)
+            full = len(self._rows) >= settings.ANSWER_EVENT_FLUSH_SIZE
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='answer-event-flusher', daemon=True)
+                self._thread.start()
+                atexit.register(self.drain)
+        if full:
+            self._wake.set()
+        return True
+
+    def flush(self) -> int:
+        """Write pending rows and due retries; returns the number of rows written."""
+        with self._lock:
+            rows, self._rows = self._rows, []
+            batches, self._retry = self._retry, []
+        size = settings.ANSWER_EVENT_FLUSH_SIZE
+        batches += [(0, rows[i:i + size]) for i in range(0, len(rows), size)]
+        written = []
+        failed = []
+        for attempts, batch in batches:
+            try:
+                write_events(batch)
+            except Exception as e:
+                attempts += 1
+                if attempts >= settings.ANSWER_EVENT_WRITE_ATTEMPTS:
+                    logger.error(f'Dropping {len(batch)} answer events after {attempts} failed writes: {e}')
+                else:
+                    logger.warning(f'Answer event write failed ({attempts}/{settings.ANSWER_EVENT_WRITE_ATTEMPTS}), will retry: {e}')
+                    failed.append((attempts, batch))
+                continue
+            written.extend(batch)
+        if failed:
+            with self._lock:
+                self._retry = failed + self._retry
+        try:
+            apply_answers(
+                (user_id, item_id, correct, latency_ms, answered_at)
+                for user_id, kind, _, item_id, _, correct, latency_ms, answered_at, _ in written
+                if kind == 'vocabulary'
+            )
+        except Exception as e:
+            logger.error(f'Could not update review states: {e}')
+        return len(written)
+
+    def drain(self) -> int:
+        """Flush until nothing is pending; failing batches are retried until they are dropped."""
+        written = 0
+        while self.pending():
+            written += self.flush()
+        return written
+
+    def _run(self):
+        while True:
+            self._wake.wait(settings.ANSWER_EVENT_FLUSH_INTERVAL)
+            self._wake.clear()
+            try:
+                self.flush()
+            finally:
+                connection.close()
+
+
+buffer = AnswerEventBuffer()
+
+
+def ingest_events(user, events: List) -> Tuple[int, List[Dict]]:
+    """Validate events and hand them to the buffer.
+
+    Returns the number of queued events and the rejected ones as
+    ``{index, error}``. Raises ``OverflowError`` when the buffer is full.
+    """
+    now = timezone.now()
+    rows = []
+    rejected = []
+    for index, raw in enumerate(events):
+        try:
+            rows.append((user.pk, *clean_event(raw, now)))
+        except ValueError as e:
+            rejected.append({'index': index, 'error': str(e)})
+    if rows and not buffer.add(rows):
+        raise OverflowError('Answer event buffer is full')
+    return len(rows), rejected
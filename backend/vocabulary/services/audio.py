@@ -0,0 +1,114 @@
+import hashlib
+import os
+from typing import Dict, Iterable, Optional
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.text import slugify
+
+from ..models import AudioManifest
+
+AUDIO_SUBDIR = 'exercise_audio'
+
+
+def audio_storage_path(word: str):
+    raw = (word or '').strip()
+    if not raw:
+        return None
+    h = hashlib.sha1(raw.encode('utf-8')).hexdigest()[:16]
+    base = slugify(raw)[:40] or 'word'
+    filename = f'{base}-{h}.mp3'
+    return os.path.join(AUDIO_SUBDIR, filename)
+
+
+def audio_file_name(word: str):
+    p = audio_storage_path(word)
+    return os.path.basename(p) if p else None
+
+
+def ensure_audio_dir():
+    try:
+        os.makedirs(os.path.join(settings.MEDIA_ROOT, AUDIO_SUBDIR), exist_ok=True)
+    except Exception:
+        pass
+
+
+
+_MP3_BITRATES = {
+    'v1': [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    'v2': [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+_MP3_SAMPLE_RATES = {
+    3: [44100, 48000, 32000],
+    2: [22050, 24000, 16000],
+    0: [11025, 12000, 8000],
+}
+
+
+def mp3_duration_ms(data: bytes) -> Optional[int]:
+    """Duration of an MPEG Layer III stream.
+
+    Uses the Xing/Info frame count when present, otherwise assumes constant
+    bitrate from the first frame header. Returns ``None`` if no frame is found.
+    """
+    offset = 0
+    if data[:3] == b'ID3' and len(data) >= 10:
+        size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+        offset = 10 + size
+    while offset + 4 <= len(data):
+        if data[offset] == 0xFF and (data[offset + 1] & 0xE0) == 0xE0:
+            break
+        offset += 1
+    else:
+        return None
+    header = int.from_bytes(data[offset:offset + 4], 'big')
+    version = (header >> 19) & 0x3
+    layer = (header >> 17) & 0x3
+    bitrate_idx = (header >> 12) & 0xF
+    rate_idx = (header >> 10) & 0x3
+    if version == 1 or layer != 1 or bitrate_idx in (0, 15) or rate_idx == 3:
+        return None
+    bitrate = _MP3_BITRATES['v1' if version == 3 else 'v2'][bitrate_idx] * 1000
+    sample_rate = _MP3_SAMPLE_RATES[version][rate_idx]
+    samples_per_frame = 1152 if version == 3 else 576
+    frame = data[offset:offset + 200]
+    for tag in (b'Xing', b'Info'):
+        pos = frame.find(tag)
+        if pos != -1 and len(frame) >= pos + 12 and frame[pos + 7] & 0x1:
+            frames = int.from_bytes(frame[pos + 8:pos + 12], 'big')
+            return int(frames * samples_per_frame * 1000 / sample_rate)
+    return int((len(data) - offset) * 8 * 1000 / bitrate)
+
+
+def record_audio(word: str, data: bytes, storage_name: str = None):
+    """Store size, duration and hash for a word's audio file in the manifest.
+
+    ``storage_name`` is the name storage actually saved the file under, which
+    differs from the requested one when storage had to avoid a collision.
+    """
+    raw = (word or '').strip()
+    now = timezone.now()
+    obj, _ = AudioManifest.objects.update_or_create(
+        word=raw,
+        defaults={
+            'file_name': os.path.basename(storage_name) if storage_name else audio_file_name(raw),
+            'duration_ms': mp3_duration_ms(data),
+            'byte_size': len(data),
+            'codec': 'mp3',
+            'content_hash': hashlib.sha256(data).hexdigest(),
+            'updated_at': now,
+        },
+    )
+    return obj
+
+
+def manifest_for_words(words: Iterable[str]) -> Dict[str, AudioManifest]:
+    keys = {(w or '').strip() for w in words}
+    keys.discard('')
+    return {m.word: m for m in AudioManifest.objects.filter(word__in=keys)}
+
+
+def audio_url(manifest: AudioManifest) -> str:
+    version = manifest.content_hash[:12]
+    url = f'{settings.MEDIA_URL}{AUDIO_SUBDIR}/{manifest.file_name}'
+    return f'{url}?v={version}' if version else url
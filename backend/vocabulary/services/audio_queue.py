@@ -0,0 +1,250 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Callable, Dict, Iterable, List
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from ..models import AudioGenerationJob, VocabularyEntry
+from .audio import audio_storage_path, ensure_audio_dir, manifest_for_words, record_audio
+from .question_bank import invalidate_question_bank
+from .tts import TTSError, get_backend
+
+logger = logging.getLogger(__name__)
+
+# Per-word status exposed to clients
+AUDIO_READY = 'ready'
+AUDIO_PENDING = 'pending'
+AUDIO_FAILED = 'failed'
+AUDIO_MISSING = 'missing'
+
+_CLIENT_STATUS = {
+    AudioGenerationJob.STATUS_PENDING: AUDIO_PENDING,
+    AudioGenerationJob.STATUS_RUNNING: AUDIO_PENDING,
+    AudioGenerationJob.STATUS_DONE: AUDIO_READY,
+    AudioGenerationJob.STATUS_FAILED: AUDIO_FAILED,
+}
+
+
+def enqueue_texts(texts: Iterable[str], storage_path_for: Callable[[str], str], kind: str) -> int:
+    """Queue audio generation for texts that have no job yet.
+
+    Jobs are deduplicated on ``storage_path_for(text)``, so the same text saved
+    in several sets is synthesized once. Previously failed jobs are re-armed.
+    Returns the number of newly queued jobs.
+    """
+    jobs = {}
+    for t in texts:
+        path = storage_path_for(t)
+        if path and path not in jobs:
+            jobs[path] = AudioGenerationJob(word=t.strip(), storage_path=path, kind=kind)
+    if not jobs:
+        return 0
+    existing = set()
+    paths = list(jobs)
+    for i in range(0, len(paths), 500):
+        existing.update(
+            AudioGenerationJob.objects.filter(storage_path__in=paths[i:i + 500]).values_list('storage_path', flat=True)
+        )
+    AudioGenerationJob.objects.bulk_create(
+        [job for path, job in jobs.items() if path not in existing],
+        ignore_conflicts=True,
+        batch_size=500,
+    )
+    now = timezone.now()
+    existing = list(existing)
+    for i in range(0, len(existing), 500):
+        AudioGenerationJob.objects.filter(
+            storage_path__in=existing[i:i + 500], status=AudioGenerationJob.STATUS_FAILED,
+        ).update(status=AudioGenerationJob.STATUS_PENDING, attempts=0, next_attempt_at=now, updated_at=now)
+    return len(jobs) - len(existing)
+
+
+def enqueue_words(words: Iterable[str]) -> int:
+    return enqueue_texts(words, audio_storage_path, AudioGenerationJob.KIND_WORD)
+
+
+def job_statuses(paths: Iterable[str]) -> Dict[str, str]:
+    """Client status (``ready``/``pending``/``failed``/``missing``) per storage path."""
+    paths = list(paths)
+    status_by_path = {}
+    for i in range(0, len(paths), 500):
+        status_by_path.update(
+            AudioGenerationJob.objects.filter(storage_path__in=paths[i:i + 500]).values_list('storage_path', 'status')
+        )
+    return {path: _CLIENT_STATUS.get(status_by_path.get(path), AUDIO_MISSING) for path in paths}
+
+
+def audio_status_for_words(words: Iterable[str]) -> Dict[str, str]:
+    paths = {}
+    for w in words:
+        path = audio_storage_path(w)
+        if path:
+            paths[w] = path
+    statuses = job_statuses(paths.values())
+    return {w: statuses[path] for w, path in paths.items()}
+
+
+def claim_jobs(limit: int) -> List[AudioGenerationJob]:
+    """Lock and mark up to ``limit`` due jobs as running.
+
+    Jobs left running longer than ``AUDIO_QUEUE_LEASE_SECONDS`` (a crashed
+    worker) are claimable again.
+    """
+    now = timezone.now()
+    stale = now - timedelta(seconds=settings.AUDIO_QUEUE_LEASE_SECONDS)
+    with transaction.atomic():
+        qs = (
+            AudioGenerationJob.objects
+            .select_for_update(skip_locked=True)
+            .filter(
+                Q(status=AudioGenerationJob.STATUS_PENDING, next_attempt_at__lte=now)
+                | Q(status=AudioGenerationJob.STATUS_RUNNING, updated_at__lt=stale)
+            )
+            .order_by('next_attempt_at')[:limit]
+        )
+        jobs = list(qs)
+        for job in jobs:
+            job.status = AudioGenerationJob.STATUS_RUNNING
+            job.attempts += 1
+            job.updated_at = now
+        AudioGenerationJob.objects.bulk_update(jobs, ['status', 'attempts', 'updated_at'])
+    return jobs
+
+
+def _complete_job(job: AudioGenerationJob):
+    job.status = AudioGenerationJob.STATUS_DONE
+    job.last_error = ''
+    job.updated_at = timezone.now()
+    job.save(update_fields=['status', 'last_error', 'updated_at'])
+
+
+def _invalidate_banks_for_words(words: List[str]):
+    if not words:
+        return
+    invalidate_question_bank(VocabularyEntry.objects.filter(word__in=words).values_list('exercise_set_id', flat=True).distinct())
+
+
+def _word_hooks():
+    return (
+        lambda jobs: set(manifest_for_words(job.word for job in jobs)),
+        record_audio,
+        _invalidate_banks_for_words,
+    )
+
+
+def _sentence_hooks():
+    from daily_routine.services.sentence_audio import known_sentences, record_sentence_audio
+
+    return known_sentences, record_sentence_audio, lambda texts: None
+
+
+def process_batch(jobs: List[AudioGenerationJob], backend=None):
+    """Synthesize a batch of claimed jobs with one backend call per job kind.
+
+    Texts already in their manifest (``AudioManifest`` for words,
+    ``SentenceAudio`` for daily routine sentences) are completed without
+    touching storage; every newly written file is recorded in the manifest and
+    the vocabulary question banks that reference a new word are dropped so they
+    pick up its URL.
+    """
+    backend = backend or get_backend()
+    for kind in sorted({job.kind for job in jobs}):
+        hooks = _sentence_hooks() if kind == AudioGenerationJob.KIND_SENTENCE else _word_hooks()
+        _process_jobs([job for job in jobs if job.kind == kind], backend, *hooks)
+
+
+def _process_jobs(jobs: List[AudioGenerationJob], backend, known_texts, record, on_completed):
+    known = known_texts(jobs)
+    completed = []
+    missing = []
+    for job in jobs:
+        if job.word in known:
+            _complete_job(job)
+            continue
+        try:
+            if default_storage.exists(job.storage_path):
+                with default_storage.open(job.storage_path, 'rb') as fh:
+                    record(job.word, fh.read(), job.storage_path)
+                _complete_job(job)
+                completed.append(job.word)
+                continue
+        except Exception as e:
+            _fail_job(job, e)
+            continue
+        missing.append(job)
+    if missing:
+        try:
+            audio = backend.synthesize_batch([job.word for job in missing])
+        except Exception as e:
+            for job in missing:
+                _fail_job(job, e)
+            missing, audio = [], {}
+        for job in missing:
+            data = audio.get(job.word)
+            if not data:
+                _fail_job(job, TTSError('No audio returned'))
+                continue
+            try:
+                # Storage may pick another name if the path was taken meanwhile.
+                saved = default_storage.save(job.storage_path, ContentFile(data))
+                record(job.word, data, saved)
+            except Exception as e:
+                _fail_job(job, e)
+                continue
+            _complete_job(job)
+            completed.append(job.word)
+    on_completed(completed)
+
+
+def _fail_job(job: AudioGenerationJob, error: Exception):
+    now = timezone.now()
+    job.last_error = str(error)
+    job.updated_at = now
+    if job.attempts >= settings.AUDIO_QUEUE_MAX_ATTEMPTS:
+        job.status = AudioGenerationJob.STATUS_FAILED
+        logger.error(f'Audio generation failed for {job.word!r}: {error}')
+    else:
+        delay = settings.AUDIO_QUEUE_RETRY_BASE_SECONDS * (2 ** (job.attempts - 1))
+        job.status = AudioGenerationJob.STATUS_PENDING
+        job.next_attempt_at = now + timedelta(seconds=delay)
+    job.save(update_fields=['status', 'last_error', 'next_attempt_at', 'updated_at'])
+
+
+def _run_batch(jobs: List[AudioGenerationJob], backend):
+    try:
+        process_batch(jobs, backend)
+    finally:
+        close_old_connections()
+
+
+def run_worker(workers: int = None, once: bool = False, poll_interval: float = 2.0, backend=None) -> int:
+    """Process queued jobs on a bounded thread pool.
+
+    Each thread handles one chunk of jobs; batch-capable backends get up to
+    ``TTS_BATCH_SIZE`` words per engine invocation, others one word. With
+    ``once`` the worker drains the currently due jobs and returns; otherwise
+    it polls forever. Returns the number of jobs processed.
+    """
+    workers = max(1, workers or settings.AUDIO_QUEUE_WORKERS)
+    backend = backend or get_backend()
+    batch_size = max(1, settings.TTS_BATCH_SIZE) if backend.supports_batch else 1
+    ensure_audio_dir()
+    processed = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while True:
+            jobs = claim_jobs(workers * batch_size)
+            if jobs:
+                chunks = [jobs[i:i + batch_size] for i in range(0, len(jobs), batch_size)]
+                list(pool.map(lambda chunk: _run_batch(chunk, backend), chunks))
+                processed += len(jobs)
+                continue
+            if once:
+                return processed
+            time.sleep(poll_interval)
@@ -0,0 +1,55 @@
+import random
+from collections import Counter
+from typing import Iterable, List
+
+
+class DistractorPool:
+    """Candidate pool loaded once and sampled for every question.
+
+    Sampling draws ``k`` plus the number of pool items that match the
+    excluded value, then drops the matches, so each draw is O(k) instead of
+    filtering the whole pool per question.
+    """
+
+    def __init__(self, values: Iterable[str], casefold: bool = False):
+        self.casefold = casefold
+        self.values = [v for v in values if v]
+        self._counts = Counter(self._key(v) for v in self.values)
+
+    def _key(self, value: str) -> str:
+        return (value or '').lower() if self.casefold else (value or '')
+
+    def __len__(self):
+        return len(self.values)
+
+    def sample(self, exclude: str, k: int, rng=None) -> List[str]:
+        rng = rng or random
+        key = self._key(exclude)
+        excluded = self._counts.get(key, 0)
+        available = len(self.values) - excluded
+        if available <= k:
+            return [v for v in self.values if self._key(v) != key]
+        picked = rng.sample(self.values, min(len(self.values), k + excluded))
+        return [v for v in picked if self._key(v) != key][:k]
+
+
+class DistractorEngine:
+    """Word and image distractor pools for one question-building pass."""
+
+    def __init__(self, words: Iterable[str], image_names: Iterable[str]):
+        self.words = DistractorPool(words, casefold=True)
+        self.images = DistractorPool(image_names)
+
+    @classmethod
+    def from_queryset(cls, qs):
+        # Ordered so pools, and therefore seeded draws, are reproducible.
+        words = qs.order_by('word').values_list('word', flat=True).distinct()
+        images = qs.order_by('image_name').values_list('image_name', flat=True).distinct()
+        return cls(list(words), list(images))
+
+    def other_words(self, exclude_word: str, k: int, rng=None) -> List[str]:
+        return self.words.sample(exclude_word, k, rng=rng)
+
+    def other_images(self, exclude_image: str, k: int, rng=None) -> List[str]:
+        return self.images.sample(exclude_image, k, rng=rng)
+
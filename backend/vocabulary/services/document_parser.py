@@ -1,62 +1,140 @@
-from typing import List, Dict
+from typing import Dict, Iterable, List
 
-def parse_text_lines(lines: List[str]) -> Dict[str, List[Dict]]:
+TEXT = 'TEXT'
+SECTION_VOCABULARY = 'VOCABULARY'
+SECTION_EXERCISES = 'EXERCISES'
+WORD = 'WORD'
+IMAGE_NAME = 'IMAGE NAME'
+TYPE = 'TYPE'
+QUESTION = 'QUESTION'
+OPTIONS = 'OPTIONS'
+ANSWER = 'ANSWER'
+
+# Every prefix has distinct first five characters, so one dict lookup on the
+# uppercased head of a line finds the only prefix it can start with.
+_PREFIXES = [
+    ('VOCABULARY', SECTION_VOCABULARY),
+    ('EXERCISES', SECTION_EXERCISES),
+    ('WORD:', WORD),
+    ('IMAGE NAME:', IMAGE_NAME),
+    ('TYPE:', TYPE),
+    ('QUESTION:', QUESTION),
+    ('OPTIONS:', OPTIONS),
+    ('ANSWER:', ANSWER),
+]
+_PREFIXES_BY_HEAD = {prefix[:5]: (prefix, kind, prefix[-1] == ':') for prefix, kind in _PREFIXES}
+_HEAD_LENGTH = max(len(prefix) for prefix, _ in _PREFIXES)
+
+_EXERCISE_KINDS = {TYPE, QUESTION, OPTIONS, ANSWER}
+# Diagnostics kept per document; the rest are only counted, so a file of
+# noise does not allocate one dict per line.
+MAX_DIAGNOSTICS = 200
+
+
+def parse_text_lines(lines: Iterable[str]) -> Dict[str, List[Dict]]:
+    """Parse a vocabulary document in one pass over any iterable of lines.
+
+    Each line is classified once and fed to a small state machine. Returns the
+    ``vocabulary`` and ``exercises`` lists plus ``diagnostics``: one
+    ``{line, severity, code, message}`` dict per problem, with 1-based line
+    numbers, sorted by line. Past ``MAX_DIAGNOSTICS`` problems are only
+    counted in ``diagnostics_dropped``.
+    """
     vocabulary = []
     exercises = []
+    diagnostics = []
     section = None
-    current = {}
-    i = 0
-    while i < len(lines):
-        line = lines[i].strip()
+    pending_word = None
+    pending_line = 0
+    current = None
+    current_line = 0
+    dropped = 0
+
+    def diag(line_no, code, message, severity='error'):
+        nonlocal dropped
+        if len(diagnostics) < MAX_DIAGNOSTICS:
+            diagnostics.append({'line': line_no, 'severity': severity, 'code': code, 'message': message})
+        else:
+            dropped += 1
+
+    prefixes = _PREFIXES_BY_HEAD
+    for line_no, raw in enumerate(lines, start=1):
+        # Classify the line: only its head is uppercased, once.
+        line = raw.strip()
         if not line:
-            i += 1
             continue
-        if line.upper().startswith('VOCABULARY'):
-            section = 'VOCABULARY'
-            i += 1
+        head = line[:_HEAD_LENGTH].upper()
+        match = prefixes.get(head[:5])
+        if match is None or not head.startswith(match[0]):
+            kind, value = TEXT, line
+        else:
+            kind = match[1]
+            value = line.split(':', 1)[1].strip() if match[2] else line
+        if kind is SECTION_VOCABULARY:
+            section = SECTION_VOCABULARY
             continue
-        if line.upper().startswith('EXERCISES'):
-            section = 'EXERCISES'
-            i += 1
+        if kind is SECTION_EXERCISES:
+            if pending_word is not None:
+                diag(pending_line, 'missing_image_name', f'WORD "{pending_word}" has no IMAGE NAME')
+                vocabulary.append({'word': pending_word, 'imageName': ''})
+                pending_word = None
+            section = SECTION_EXERCISES
             continue
-        if section == 'VOCABULARY':
-            if line.upper().startswith('WORD:'):
-                word = line.split(':', 1)[1].strip()
-                img_line = ''
-                j = i + 1
-                while j < len(lines):
-                    nxt = lines[j].strip()
-                    if nxt.upper().startswith('IMAGE NAME:'):
-                        img_line = nxt.split(':', 1)[1].strip()
-                        break
-                    if nxt.upper().startswith('WORD:') or nxt.upper().startswith('EXERCISES'):
-                        break
-                    j += 1
-                vocabulary.append({'word': word, 'imageName': img_line})
-            i += 1
-            continue
-        if section == 'EXERCISES':
-            if line.upper().startswith('TYPE:'):
-                current = {'type': line.split(':', 1)[1].strip(), 'question': '', 'options': [], 'answer': ''}
-                i += 1
-                continue
-            if line.upper().startswith('QUESTION:') and current:
-                current['question'] = line.split(':', 1)[1].strip()
-                i += 1
-                continue
-            if line.upper().startswith('OPTIONS:') and current:
-                opts = line.split(':', 1)[1].strip()
-                current['options'] = [o.strip() for o in opts.split(',') if o.strip()]
-                i += 1
-                continue
-            if line.upper().startswith('ANSWER:') and current:
-                current['answer'] = line.split(':', 1)[1].strip()
-                exercises.append(current)
-                current = {}
-                i += 1
+
+        # A WORD: takes the first IMAGE NAME: that follows it before the next
+        # WORD: or EXERCISES header, whatever lies in between.
+        if pending_word is not None:
+            if kind is IMAGE_NAME:
+                if not value:
+                    diag(line_no, 'empty_image_name', f'IMAGE NAME for "{pending_word}" is empty')
+                vocabulary.append({'word': pending_word, 'imageName': value})
+                pending_word = None
                 continue
-            i += 1
-            continue
-        i += 1
-    return {'vocabulary': vocabulary, 'exercises': exercises}
+            if kind is WORD:
+                diag(pending_line, 'missing_image_name', f'WORD "{pending_word}" has no IMAGE NAME')
+                vocabulary.append({'word': pending_word, 'imageName': ''})
+                pending_word = None
+
+        if section is SECTION_VOCABULARY:
+            if kind is WORD:
+                if not value:
+                    diag(line_no, 'empty_word', 'WORD is empty')
+                pending_word = value
+                pending_line = line_no
+            elif kind is IMAGE_NAME:
+                diag(line_no, 'orphan_image_name', 'IMAGE NAME without a preceding WORD')
+            elif kind is TEXT:
+                diag(line_no, 'unrecognized_line', 'Line ignored', severity='warning')
+            else:
+                diag(line_no, 'wrong_section', f'{kind}: inside the VOCABULARY section')
+        elif section is SECTION_EXERCISES:
+            if kind is TYPE:
+                if current:
+                    diag(current_line, 'incomplete_exercise', f'TYPE "{current["type"]}" has no ANSWER')
+                current = {'type': value, 'question': '', 'options': [], 'answer': ''}
+                current_line = line_no
+            elif kind in _EXERCISE_KINDS:
+                if not current:
+                    diag(line_no, 'orphan_field', f'{kind}: without a preceding TYPE')
+                elif kind is QUESTION:
+                    current['question'] = value
+                elif kind is OPTIONS:
+                    current['options'] = [o.strip() for o in value.split(',') if o.strip()]
+                else:
+                    current['answer'] = value
+                    exercises.append(current)
+                    current = None
+            elif kind is TEXT:
+                diag(line_no, 'unrecognized_line', 'Line ignored', severity='warning')
+            else:
+                diag(line_no, 'wrong_section', f'{kind}: inside the EXERCISES section')
+        elif kind is not TEXT:
+            diag(line_no, 'outside_section', f'{kind}: before any VOCABULARY or EXERCISES header')
 
+    if pending_word is not None:
+        diag(pending_line, 'missing_image_name', f'WORD "{pending_word}" has no IMAGE NAME')
+        vocabulary.append({'word': pending_word, 'imageName': ''})
+    if current:
+        diag(current_line, 'incomplete_exercise', f'TYPE "{current["type"]}" has no ANSWER')
+    diagnostics.sort(key=lambda d: d['line'])
+    return {'vocabulary': vocabulary, 'exercises': exercises, 'diagnostics': diagnostics, 'diagnostics_dropped': dropped}
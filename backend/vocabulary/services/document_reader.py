@@ -0,0 +1,125 @@
+import zipfile
+import xml.etree.ElementTree as ET
+from io import StringIO
+from typing import Iterator
+
+W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+
+class DocumentReadError(Exception):
+    pass
+
+
+def iter_docx_lines(file) -> Iterator[str]:
+    """Yield paragraph texts from ``word/document.xml`` without building the tree.
+
+    Only paragraphs directly under ``w:body`` are read, the same ones as
+    python-docx's ``Document.paragraphs``; text in tables and text boxes is
+    skipped. Each top-level element is cleared as soon as it is read, so
+    memory stays flat regardless of document length.
+    """
+    try:
+        file.seek(0)
+        archive = zipfile.ZipFile(file)
+        xml_stream = archive.open('word/document.xml')
+    except Exception as e:
+        raise DocumentReadError(str(e))
+    with archive, xml_stream:
+        body = None
+        parts = []
+        # Open element tags: [document, body, p, ...] inside a top-level paragraph.
+        stack = []
+        try:
+            for event, elem in ET.iterparse(xml_stream, events=('start', 'end')):
+                tag = elem.tag
+                if event == 'start':
+                    stack.append(tag)
+                    if tag == W_NS + 'body':
+                        body = elem
+                    continue
+                stack.pop()
+                if len(stack) == 2 and stack[1] == W_NS + 'body':
+                    if tag == W_NS + 'p':
+                        yield from ''.join(parts).split('\n')
+                    parts = []
+                    body.clear()
+                    continue
+                if len(stack) < 3 or stack[1] != W_NS + 'body' or stack[2] != W_NS + 'p' or W_NS + 'p' in stack[3:]:
+                    continue
+                if tag == W_NS + 't':
+                    if elem.text:
+                        parts.append(elem.text)
+                elif tag == W_NS + 'tab':
+                    parts.append('\t')
+                elif tag in (W_NS + 'br', W_NS + 'cr'):
+                    parts.append('\n')
+        except ET.ParseError as e:
+            raise DocumentReadError(str(e))
+
+
+def _iter_pdfminer_lines(file) -> Iterator[str]:
+    from pdfminer.converter import TextConverter
+    from pdfminer.layout import LAParams
+    from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+    from pdfminer.pdfpage import PDFPage
+
+    rsrcmgr = PDFResourceManager()
+    out = StringIO()
+    device = TextConverter(rsrcmgr, out, laparams=LAParams())
+    try:
+        interpreter = PDFPageInterpreter(rsrcmgr, device)
+        for page in PDFPage.get_pages(file):
+            interpreter.process_page(page)
+            text = out.getvalue()
+            out.seek(0)
+            out.truncate(0)
+            yield from text.splitlines()
+    finally:
+        device.close()
+
+
+def _iter_pypdf2_lines(file) -> Iterator[str]:
+    import PyPDF2
+
+    reader = PyPDF2.PdfReader(file)
+    for page in reader.pages:
+        yield from (page.extract_text() or '').splitlines()
+
+
+def iter_pdf_lines(file) -> Iterator[str]:
+    """Yield text lines one page at a time.
+
+    Falls back to PyPDF2 when pdfminer is unavailable or fails before the
+    first page. A failure after lines were produced is raised as
+    :class:`DocumentReadError` without falling back, since those lines have
+    already been consumed.
+    """
+    yielded = False
+    try:
+        file.seek(0)
+        for line in _iter_pdfminer_lines(file):
+            yielded = True
+            yield line
+        return
+    except Exception as e:
+        if yielded:
+            raise DocumentReadError(str(e))
+    try:
+        file.seek(0)
+        yield from _iter_pypdf2_lines(file)
+    except Exception as e:
+        raise DocumentReadError(str(e))
+
+
+def iter_document_lines(file) -> Iterator[str]:
+    """Stream the text lines of an uploaded ``.docx`` or ``.pdf``.
+
+    Unsupported extensions yield nothing. Read failures surface as
+    :class:`DocumentReadError` while iterating.
+    """
+    name = (file.name or '').lower()
+    if name.endswith('.docx'):
+        return iter_docx_lines(file)
+    if name.endswith('.pdf'):
+        return iter_pdf_lines(file)
+    return iter(())
@@ -0,0 +1,107 @@
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from django.db import transaction
+from django.db.models import Count, F, Model, OuterRef, QuerySet, Subquery
+from django.db.models.functions import Coalesce
+
+BATCH_SIZE = 500
+
+
+def normalize_key(value: str) -> str:
+    """Key used to match incoming rows with stored ones: trimmed, single-spaced, case-folded."""
+    return ' '.join((value or '').split()).casefold()
+
+
+def sync_entries(
+    queryset: QuerySet,
+    rows: Sequence[Dict],
+    key: str,
+    fields: Sequence[str],
+    build: Callable[[Dict], Model],
+) -> Tuple[Dict[str, int], List[Dict]]:
+    """Make ``queryset`` hold exactly ``rows`` with the fewest writes.
+
+    Rows are matched to stored entries on ``normalize_key(row[key])``. Matched
+    entries whose ``fields`` differ are updated in place (keeping their id and
+    ``created_at``), unmatched stored entries are deleted and new rows are
+    created with ``build``. Deletes run first so a case-only rename never
+    collides with a unique constraint. Run it inside a transaction.
+
+    Returns a ``{created, updated, deleted, unchanged}`` summary and the rows
+    that were created or updated.
+    """
+    existing = {}
+    duplicate_ids = []
+    for obj in queryset.only('pk', *fields):
+        k = normalize_key(getattr(obj, key))
+        if k in existing:
+            duplicate_ids.append(obj.pk)
+        else:
+            existing[k] = obj
+
+    to_create = []
+    to_update = []
+    touched = []
+    unchanged = 0
+    for row in rows:
+        obj = existing.pop(normalize_key(row[key]), None)
+        if obj is None:
+            to_create.append(build(row))
+            touched.append(row)
+            continue
+        changed = False
+        for f in fields:
+            if getattr(obj, f) != row[f]:
+                setattr(obj, f, row[f])
+                changed = True
+        if changed:
+            to_update.append(obj)
+            touched.append(row)
+        else:
+            unchanged += 1
+
+    delete_ids = duplicate_ids + [obj.pk for obj in existing.values()]
+    model = queryset.model
+    if delete_ids:
+        model.objects.filter(pk__in=delete_ids).delete()
+    if to_update:
+        model.objects.bulk_update(to_update, list(fields), batch_size=BATCH_SIZE)
+    if to_create:
+        model.objects.bulk_create(to_create, batch_size=BATCH_SIZE)
+    summary = {
+        'created': len(to_create),
+        'updated': len(to_update),
+        'deleted': len(delete_ids),
+        'unchanged': unchanged,
+    }
+    return summary, touched
+
+
+def bump_entry_count(set_model, set_id: int, delta: int):
+    """Shift a set's denormalized ``entry_count``; call in the transaction that wrote the entries."""
+    if delta:
+        set_model.objects.filter(pk=set_id).update(entry_count=F('entry_count') + delta)
+
+
+def repair_entry_counts(set_model) -> int:
+    """Recompute ``entry_count`` for sets whose stored value drifted. Returns how many were fixed."""
+    actual = (
+        set_model._meta.get_field('entries').related_model.objects
+        .filter(exercise_set=OuterRef('pk'))
+        .order_by()
+        .values('exercise_set')
+        .annotate(n=Count('pk'))
+        .values('n')
+    )
+    drifted = (
+        set_model.objects
+        .annotate(actual=Coalesce(Subquery(actual), 0))
+        .exclude(entry_count=F('actual'))
+        .values_list('pk', 'actual')
+    )
+    fixed = 0
+    with transaction.atomic():
+        for pk, n in drifted:
+            set_model.objects.filter(pk=pk).update(entry_count=n)
+            fixed += 1
+    return fixed
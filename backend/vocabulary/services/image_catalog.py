@@ -0,0 +1,305 @@
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.utils import timezone
+
+from ..models import ExerciseImage
+from .image_variants import delete_variants, generate_variants
+
+IMAGES_SUBDIR = 'exercise_images'
+LEGACY_IMAGES_SUBDIR = 'vocabulary_images'
+
+
+def ensure_images_dir():
+    try:
+        os.makedirs(os.path.join(settings.MEDIA_ROOT, IMAGES_SUBDIR), exist_ok=True)
+    except Exception:
+        pass
+
+
+def hash_file(fh) -> Tuple[str, int]:
+    h = hashlib.sha256()
+    size = 0
+    chunks = fh.chunks() if hasattr(fh, 'chunks') else iter(lambda: fh.read(64 * 1024), b'')
+    for chunk in chunks:
+        h.update(chunk)
+        size += len(chunk)
+    return h.hexdigest(), size
+
+
+def existing_images() -> Dict[str, str]:
+    """Catalogued image names mapped to their storage paths."""
+    return dict(ExerciseImage.objects.values_list('name', 'storage_path'))
+
+
+def existing_image_names():
+    return set(ExerciseImage.objects.values_list('name', flat=True))
+
+
+def record_image(name: str, storage_path: str, content_hash: Optional[str] = None, size: Optional[int] = None):
+    if content_hash is None or size is None:
+        with default_storage.open(storage_path, 'rb') as fh:
+            content_hash, size = hash_file(fh)
+    now = timezone.now()
+    obj, _ = ExerciseImage.objects.update_or_create(
+        name=name,
+        defaults={'storage_path': storage_path, 'size': size, 'content_hash': content_hash, 'updated_at': now},
+    )
+    return obj
+
+
+def remove_images(names: Iterable[str]):
+    ExerciseImage.objects.filter(name__in=list(names)).delete()
+
+
+def _list_dir(subdir: str):
+    dir_path = os.path.join(settings.MEDIA_ROOT, subdir)
+    try:
+        return sorted(
+            f for f in os.listdir(dir_path)
+            if not f.startswith('.') and os.path.isfile(os.path.join(dir_path, f))
+        )
+    except Exception:
+        return []
+
+
+def reconcile_catalog():
+    """Bring the catalog in line with the images directory.
+
+    Adds files that are on disk but neither catalogued by name nor used as
+    some row's storage path, re-hashes files whose size changed and drops
+    rows whose file is gone. Returns ``(added, updated, removed)``.
+    """
+    on_disk = {}
+    for name in _list_dir(IMAGES_SUBDIR):
+        path = os.path.join(settings.MEDIA_ROOT, IMAGES_SUBDIR, name)
+        try:
+            on_disk[os.path.join(IMAGES_SUBDIR, name)] = os.path.getsize(path)
+        except OSError:
+            continue
+    known = {obj.name: obj for obj in ExerciseImage.objects.all()}
+    by_path = {}
+    for obj in known.values():
+        by_path.setdefault(obj.storage_path, []).append(obj)
+    added = updated = 0
+    for path, size in on_disk.items():
+        rows = by_path.get(path)
+        if rows is None:
+            name = os.path.basename(path)
+            if name in known:
+                # Left behind by a replacement; the row points at the new file.
+                continue
+            record_image(name, path)
+            added += 1
+            continue
+        for obj in rows:
+            if obj.size != size or not obj.content_hash:
+                record_image(obj.name, path)
+                updated += 1
+    stale = [name for name, obj in known.items() if obj.storage_path not in on_disk]
+    if stale:
+        remove_images(stale)
+    return added, updated, len(stale)
+
+
+def migrate_legacy_images():
+    """Copy files from the legacy ``vocabulary_images`` dir into ``exercise_images``.
+
+    Returns the names that were copied; existing files are left untouched.
+    """
+    ensure_images_dir()
+    copied = []
+    for name in _list_dir(LEGACY_IMAGES_SUBDIR):
+        safe = os.path.basename(name)
+        if safe != name:
+            continue
+        new_path = os.path.join(IMAGES_SUBDIR, safe)
+        if default_storage.exists(new_path):
+            continue
+        legacy_path = os.path.join(LEGACY_IMAGES_SUBDIR, safe)
+        try:
+            with default_storage.open(legacy_path, 'rb') as fh:
+                saved = default_storage.save(new_path, ContentFile(fh.read()))
+        except Exception:
+            continue
+        record_image(safe, saved)
+        copied.append(safe)
+    return copied
+
+
+# Per-file outcomes reported by store_uploaded_images
+UPLOAD_SAVED = 'saved'
+UPLOAD_REPLACED = 'replaced'
+UPLOAD_UNCHANGED = 'unchanged'
+UPLOAD_DUPLICATE = 'duplicate'
+UPLOAD_ERROR = 'error'
+
+
+def _hash_upload(item) -> Dict:
+    name, f = item
+    try:
+        digest, size = hash_file(f)
+    except Exception as e:
+        return {'name': name, 'status': UPLOAD_ERROR, 'error': str(e)}
+    return {'name': name, 'size': size, 'content_hash': digest}
+
+
+def _save_upload(f, result: Dict) -> Dict:
+    """Stream one upload into storage and build its variants.
+
+    Storage never overwrites: a replaced image gets a fresh storage name and
+    the catalog row is repointed, so ``serve_media`` keeps answering under the
+    image name.
+    """
+    try:
+        f.seek(0)
+        saved = default_storage.save(os.path.join(IMAGES_SUBDIR, result['name']), f)
+    except Exception as e:
+        return {'name': result['name'], 'status': UPLOAD_ERROR, 'error': str(e)}
+    result['storage_path'] = saved
+    try:
+        result['variant_widths'] = generate_variants(saved, result['content_hash'])
+    except Exception:
+        # Not decodable by Pillow; the original is still served.
+        result['variant_widths'] = []
+    return result
+
+
+def _delete_unreferenced(storage_paths: Iterable[str], content_hashes: Iterable[Tuple[str, List[int]]]):
+    """Remove files and variants that no catalog row points at any more."""
+    storage_paths = set(storage_paths)
+    used = set(ExerciseImage.objects.filter(storage_path__in=storage_paths).values_list('storage_path', flat=True))
+    for path in storage_paths - used:
+        try:
+            default_storage.delete(path)
+        except Exception:
+            continue
+    hashes = dict(content_hashes)
+    live = set(ExerciseImage.objects.filter(content_hash__in=list(hashes)).values_list('content_hash', flat=True))
+    for content_hash, widths in hashes.items():
+        if content_hash and content_hash not in live:
+            delete_variants(content_hash, widths)
+
+
+def store_uploaded_images(files) -> List[Dict]:
+    """Hash uploaded images, then stream only new content into storage.
+
+    Uploads are hashed on a small thread pool first. A file whose hash matches
+    the catalogued file of the same name is ``unchanged``; one whose bytes are
+    already catalogued under another name is a ``duplicate`` and its row points
+    at that image's file, so nothing is written. Everything else is saved
+    through ``default_storage`` with its resized variants. Catalog rows are
+    upserted in one query, and files and variants left unreferenced by
+    replacements are deleted. Returns one result dict per file, in upload
+    order.
+    """
+    ensure_images_dir()
+    by_name = {}
+    for f in files:
+        name = os.path.basename(f.name or '')
+        if name and not name.startswith('.'):
+            by_name[name] = f
+    if not by_name:
+        return []
+    previous = {
+        name: (storage_path, content_hash, widths)
+        for name, storage_path, content_hash, widths in ExerciseImage.objects.filter(name__in=list(by_name)).values_list(
+            'name', 'storage_path', 'content_hash', 'variant_widths',
+        )
+    }
+    workers = max(1, min(settings.IMAGE_UPLOAD_WORKERS, len(by_name)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(_hash_upload, by_name.items()))
+
+        hashes = [r['content_hash'] for r in results if r.get('content_hash')]
+        owners = {}
+        for name, content_hash, storage_path, widths in ExerciseImage.objects.filter(content_hash__in=hashes).values_list(
+            'name', 'content_hash', 'storage_path', 'variant_widths',
+        ):
+            owners.setdefault(content_hash, (name, storage_path, widths))
+        to_save = []
+        for r in results:
+            if r.get('status') == UPLOAD_ERROR:
+                continue
+            old = previous.get(r['name'])
+            if old is not None and old[1] == r['content_hash']:
+                r['status'] = UPLOAD_UNCHANGED
+                continue
+            owner = owners.get(r['content_hash'])
+            if owner is not None and owner[0] != r['name']:
+                r.update(status=UPLOAD_DUPLICATE, duplicate_of=owner[0], storage_path=owner[1], variant_widths=owner[2])
+                continue
+            r['status'] = UPLOAD_REPLACED if old is not None else UPLOAD_SAVED
+            # A later upload in this batch with the same bytes reuses this one.
+            owners.setdefault(r['content_hash'], (r['name'], None, None))
+            to_save.append(r)
+        saved = {r['name']: r for r in pool.map(lambda r: _save_upload(by_name[r['name']], r), to_save)}
+    for r in results:
+        if r['status'] == UPLOAD_DUPLICATE and r['storage_path'] is None:
+            owner = saved.get(r['duplicate_of'])
+            if owner is None or owner['status'] == UPLOAD_ERROR:
+                r.update(status=UPLOAD_ERROR, error='Duplicate of a file that failed to save')
+            else:
+                r.update(storage_path=owner['storage_path'], variant_widths=owner['variant_widths'])
+    results = [saved.get(r['name'], r) if r['status'] in (UPLOAD_SAVED, UPLOAD_REPLACED) else r for r in results]
+
+    now = timezone.now()
+    rows = [
+        ExerciseImage(
+            name=r['name'],
+            storage_path=r['storage_path'],
+            size=r['size'],
+            content_hash=r['content_hash'],
+            variant_widths=r['variant_widths'],
+            updated_at=now,
+        )
+        for r in results if r['status'] in (UPLOAD_SAVED, UPLOAD_REPLACED, UPLOAD_DUPLICATE)
+    ]
+    ExerciseImage.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=['name'],
+        update_fields=['storage_path', 'size', 'content_hash', 'variant_widths', 'updated_at'],
+    )
+    replaced = [previous[row.name] for row in rows if row.name in previous]
+    _delete_unreferenced((old[0] for old in replaced), ((old[1], old[2]) for old in replaced))
+    for r in results:
+        r.pop('storage_path', None)
+    return results
+
+
+def delete_images(names: Iterable[str]) -> List[str]:
+    """Delete images by name: catalog rows, their files and their variants.
+
+    A file is only removed once no other catalog row (a duplicate pointing at
+    it) still uses it, and variants go once no row has their content hash.
+    Returns the names that were deleted.
+    """
+    names = [n for n in names if isinstance(n, str) and n and os.path.basename(n) == n]
+    rows = list(ExerciseImage.objects.filter(name__in=names))
+    catalogued = {row.name for row in rows}
+    ExerciseImage.objects.filter(name__in=names).delete()
+    paths = {row.storage_path for row in rows}
+    # Files from before the catalog may sit in either directory without a row.
+    for name in names:
+        paths.update((os.path.join(IMAGES_SUBDIR, name), os.path.join(LEGACY_IMAGES_SUBDIR, name)))
+    used = set(ExerciseImage.objects.filter(storage_path__in=paths).values_list('storage_path', flat=True))
+    deleted = set(catalogued)
+    for name in names:
+        for path in (os.path.join(IMAGES_SUBDIR, name), os.path.join(LEGACY_IMAGES_SUBDIR, name)):
+            try:
+                if path not in used and default_storage.exists(path):
+                    default_storage.delete(path)
+                    deleted.add(name)
+            except Exception:
+                continue
+    _delete_unreferenced(
+        (row.storage_path for row in rows if row.storage_path not in used),
+        ((row.content_hash, row.variant_widths) for row in rows),
+    )
+    return [name for name in names if name in deleted]
@@ -0,0 +1,132 @@
+import os
+from io import BytesIO
+from typing import Dict, Iterable, List
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+from ..models import ExerciseImage
+
+VARIANTS_SUBDIR = 'exercise_image_variants'
+
+# Pillow format name and file extension for each variant encoding
+VARIANT_FORMATS = {
+    'webp': ('WEBP', 'webp'),
+    'jpeg': ('JPEG', 'jpg'),
+}
+
+
+def variant_widths() -> List[int]:
+    return sorted({int(w) for w in settings.IMAGE_VARIANT_WIDTHS if int(w) > 0})
+
+
+def variant_storage_path(content_hash: str, width: int, fmt: str) -> str:
+    """Variants are addressed by the source hash, so a replaced image gets new URLs."""
+    ext = VARIANT_FORMATS[fmt][1]
+    return os.path.join(VARIANTS_SUBDIR, content_hash[:2], f'{content_hash}-{width}.{ext}')
+
+
+_ROTATED_ORIENTATIONS = (5, 6, 7, 8)
+
+
+def _save_variant(img: Image.Image, name: str, pil_format: str, **params):
+    buf = BytesIO()
+    img.save(buf, pil_format, **params)
+    # Storage never overwrites; a forced re-encode replaces the old file.
+    default_storage.delete(name)
+    default_storage.save(name, ContentFile(buf.getvalue()))
+
+
+def generate_variants(source_name: str, content_hash: str, force: bool = False) -> List[int]:
+    """Write WebP and JPEG variants of one stored image at each configured width.
+
+    Widths are compared with the image as displayed, after its EXIF
+    orientation; widths at or above it are skipped and clients fall back to
+    the original for those. Existing variant files are reused unless
+    ``force``. Returns the widths that are available.
+    """
+    widths = variant_widths()
+    if not widths or not content_hash:
+        return []
+    quality = settings.IMAGE_VARIANT_QUALITY
+    with default_storage.open(source_name, 'rb') as fh, Image.open(fh) as src:
+        rotated = src.getexif().get(0x0112) in _ROTATED_ORIENTATIONS
+        src_width, src_height = (src.height, src.width) if rotated else src.size
+        widths = [w for w in widths if w < src_width]
+        if not widths:
+            return []
+        names = {(w, fmt): variant_storage_path(content_hash, w, fmt) for w in widths for fmt in VARIANT_FORMATS}
+        if not force and all(default_storage.exists(n) for n in names.values()):
+            return widths
+        # Let the JPEG decoder downscale while reading; the largest variant is the floor.
+        floor = (widths[-1], max(1, src_height * widths[-1] // src_width))
+        src.draft('RGB', floor[::-1] if rotated else floor)
+        img = ImageOps.exif_transpose(src)
+        if img.mode not in ('RGB', 'RGBA'):
+            img = img.convert('RGBA' if 'transparency' in img.info or img.mode in ('LA', 'PA') else 'RGB')
+        if img.mode == 'RGBA':
+            flat = Image.new('RGB', img.size, (255, 255, 255))
+            flat.paste(img, mask=img.getchannel('A'))
+        else:
+            flat = img
+        for w in reversed(widths):
+            h = max(1, round(img.height * w / img.width))
+            resized = img.resize((w, h), Image.LANCZOS, reducing_gap=3.0)
+            resized_flat = resized if flat is img else flat.resize((w, h), Image.LANCZOS, reducing_gap=3.0)
+            webp = names[(w, 'webp')]
+            if force or not default_storage.exists(webp):
+                _save_variant(resized, webp, 'WEBP', quality=quality, method=4)
+            jpeg = names[(w, 'jpeg')]
+            if force or not default_storage.exists(jpeg):
+                _save_variant(resized_flat, jpeg, 'JPEG', quality=quality, optimize=True, progressive=True)
+    return widths
+
+
+def variants_for_image(image: ExerciseImage, force: bool = False) -> List[int]:
+    return generate_variants(image.storage_path, image.content_hash, force=force)
+
+
+def variant_urls(content_hash: str, widths: Iterable[int]) -> List[Dict]:
+    return [
+        {
+            'width': w,
+            **{fmt: settings.MEDIA_URL + variant_storage_path(content_hash, w, fmt).replace(os.sep, '/') for fmt in VARIANT_FORMATS},
+        }
+        for w in widths
+    ]
+
+
+def variants_for_names(names: Iterable[str]) -> Dict[str, List[Dict]]:
+    """Variant URL lists keyed by image name, for names that have variants."""
+    rows = ExerciseImage.objects.filter(name__in=list(set(names))).values_list('name', 'content_hash', 'variant_widths')
+    return {name: variant_urls(h, widths) for name, h, widths in rows if h and widths}
+
+
+def delete_variants(content_hash: str, widths: Iterable[int] = ()):
+    """Delete the variant files of one source hash."""
+    for w in set(widths or ()) | set(variant_widths()):
+        for fmt in VARIANT_FORMATS:
+            default_storage.delete(variant_storage_path(content_hash, w, fmt))
+
+
+def prune_orphan_variants() -> int:
+    """Delete variant files whose source hash is no longer catalogued."""
+    live = set(ExerciseImage.objects.exclude(content_hash='').values_list('content_hash', flat=True))
+    removed = 0
+    try:
+        prefixes, _ = default_storage.listdir(VARIANTS_SUBDIR)
+    except FileNotFoundError:
+        return 0
+    for prefix in prefixes:
+        _, files = default_storage.listdir(os.path.join(VARIANTS_SUBDIR, prefix))
+        for f in files:
+            if f.startswith('.') or f.split('-', 1)[0] in live:
+                continue
+            try:
+                default_storage.delete(os.path.join(VARIANTS_SUBDIR, prefix, f))
+                removed += 1
+            except OSError:
+                continue
+    return removed
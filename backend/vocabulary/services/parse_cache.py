@@ -0,0 +1,31 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+def _cache_key(token: str) -> str:
+    return f'vocabulary:parsed_document:{token}'
+
+
+def document_token(file) -> str:
+    """Content hash of an uploaded document, used as its parse-cache token."""
+    h = hashlib.sha256()
+    for chunk in file.chunks():
+        h.update(chunk)
+    file.seek(0)
+    return h.hexdigest()
+
+
+def get_parsed(token: str):
+    if not token:
+        return None
+    return cache.get(_cache_key(token))
+
+
+def store_parsed(token: str, name: str, parsed, has_lines: bool):
+    cache.set(
+        _cache_key(token),
+        {'name': name, 'parsed': parsed, 'has_lines': has_lines},
+        settings.VOCABULARY_PARSE_CACHE_TTL,
+    )
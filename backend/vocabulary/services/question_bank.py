@@ -0,0 +1,171 @@
+import copy
+import hashlib
+import json
+import random
+import time
+from typing import Dict, Iterable, List
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, F, Max, Sum
+from django.utils import timezone
+
+from ..models import VocabularyEntry, VocabularyExerciseSet
+from .audio import audio_file_name, audio_url, manifest_for_words
+from .distractors import DistractorEngine
+from .image_variants import variants_for_names
+
+_ENGINE_MAX_AGE = 300
+# (catalog version, built at, engine) for this process
+_engine = None
+
+
+def _audio_prompt(word: str, manifest: Dict) -> Dict:
+    m = manifest.get(word.strip())
+    if m is None:
+        return {'audio_name': audio_file_name(word), 'audio_url': None, 'audio_duration_ms': None, 'word': word}
+    return {'audio_name': m.file_name, 'audio_url': audio_url(m), 'audio_duration_ms': m.duration_ms, 'word': word}
+
+
+def build_questions(entries: List[Dict], engine: DistractorEngine, rng=None, manifest: Dict = None) -> List[Dict]:
+    rng = rng or random
+    manifest = manifest if manifest is not None else {}
+    questions = []
+    for idx, e in enumerate(entries):
+        mode = 'image_to_text' if idx % 2 == 0 else 'audio_to_image'
+        if mode == 'image_to_text':
+            distractors = engine.other_words(e['word'], 2, rng=rng)
+            options = [e['word'], *distractors]
+            rng.shuffle(options)
+            q = {
+                'mode': mode,
+                'prompt': {'image_name': e['image_name']},
+                'options': [{'word': w} for w in options],
+                'answer': {'word': e['word']},
+            }
+        else:
+            distractors = engine.other_images(e['image_name'], 2, rng=rng)
+            options = [e['image_name'], *distractors]
+            rng.shuffle(options)
+            q = {
+                'mode': mode,
+                'prompt': _audio_prompt(e['word'], manifest),
+                'options': [{'image_name': n} for n in options],
+                'answer': {'image_name': e['image_name']},
+            }
+        if 'id' in e:
+            # Lets clients report answer events against the entry.
+            q['entry_id'] = e['id']
+        questions.append(q)
+    rng.shuffle(questions)
+    return questions
+
+
+def attach_image_variants(questions: List[Dict], variants: Dict[str, List[Dict]]):
+    """Add ``image_variants`` next to every ``image_name`` in prompts and options."""
+    for q in questions:
+        for item in (q['prompt'], *q['options']):
+            name = item.get('image_name')
+            if name is not None:
+                item['image_variants'] = variants.get(name, [])
+
+
+def _cache_key(set_id: int, version: int) -> str:
+    return f'vocabulary:question_bank:{set_id}:{version}'
+
+
+def _catalog_version():
+    """Changes whenever any set is created, deleted or edited (``content_version`` bumps)."""
+    agg = VocabularyExerciseSet.objects.aggregate(sets=Count('id'), last=Max('id'), edits=Sum('content_version'))
+    return agg['sets'], agg['last'], agg['edits'] or 0
+
+
+def distractor_engine() -> DistractorEngine:
+    """Catalog-wide distractor pools, kept in process memory.
+
+    The pools are rebuilt when the catalog version changes or after
+    ``_ENGINE_MAX_AGE`` seconds, whichever comes first; checking the version is
+    one aggregate query. Pools are loaded in a fixed order so a seeded
+    ``random.Random`` draws the same distractors every time for the same
+    catalog.
+    """
+    global _engine
+    version = _catalog_version()
+    current = _engine
+    if current is None or current[0] != version or time.monotonic() - current[1] > _ENGINE_MAX_AGE:
+        current = (version, time.monotonic(), DistractorEngine.from_queryset(VocabularyEntry.objects.all()))
+        _engine = current
+    return current[2]
+
+
+def _image_names(questions: List[Dict]) -> List[str]:
+    return sorted({item['image_name'] for q in questions for item in (q['prompt'], *q['options']) if 'image_name' in item})
+
+
+def get_question_bank(set_id: int, version: int):
+    """Pre-shuffled question variants for a set, cached per ``(set, content_version)``.
+
+    ``VOCABULARY_QUESTION_BANK_VARIANTS`` variants are built on the first read
+    of a version, each from its own ``random.Random``, so a session is a
+    cache read plus picking one. The version lives in the database, so an
+    edit made through any worker moves every process to a new key and
+    nothing has to be invalidated in per-process caches. Image variant URLs
+    are not part of the bank; they change with the image catalog, not with
+    the set. Returns ``None`` when the set has no entries.
+    """
+    key = _cache_key(set_id, version)
+    bank = cache.get(key)
+    if bank is None:
+        entries = list(VocabularyEntry.objects.filter(exercise_set_id=set_id).order_by('id').values('id', 'word', 'image_name'))
+        if not entries:
+            return None
+        manifest = manifest_for_words(e['word'] for e in entries)
+        engine = distractor_engine()
+        variants = []
+        for i in range(max(1, settings.VOCABULARY_QUESTION_BANK_VARIANTS)):
+            questions = build_questions(entries, engine, rng=random.Random(f'{set_id}:{version}:{i}'), manifest=manifest)
+            body = json.dumps(questions, sort_keys=True, separators=(',', ':'), default=str)
+            variants.append({
+                'questions': questions,
+                'image_names': _image_names(questions),
+                'digest': hashlib.sha256(body.encode('utf-8')).hexdigest(),
+            })
+        bank = {'version': version, 'variants': variants}
+        cache.set(key, bank, settings.VOCABULARY_QUESTION_BANK_TTL)
+    return bank
+
+
+def default_seed(user, set_id: int) -> str:
+    """One session per learner, set and UTC day unless the client picks a seed."""
+    return str(int(hashlib.sha256(f'{user.pk}:{set_id}:{timezone.now().date()}'.encode('utf-8')).hexdigest()[:15], 16))
+
+
+def variant_index(seed: str, count: int) -> int:
+    """Variant a seed maps to; any string works, numeric seeds included."""
+    return int(hashlib.sha256(seed.encode('utf-8')).hexdigest()[:8], 16) % count
+
+
+def seeded_questions(ex_set: VocabularyExerciseSet, seed: str):
+    """The prebuilt question variant ``seed`` maps to.
+
+    The same seed and set contents always yield the same list, and client
+    seeds never add cache entries. Image variant URLs are looked up for the
+    variant's images (one indexed query) and folded into the ETag. Returns
+    ``(questions, etag)``, or ``(None, None)`` when the set has no entries.
+    """
+    set_id = ex_set.pk
+    bank = get_question_bank(set_id, ex_set.content_version)
+    if not bank:
+        return None, None
+    variant = bank['variants'][variant_index(seed, len(bank['variants']))]
+    images = variants_for_names(variant['image_names'])
+    questions = copy.deepcopy(variant['questions'])
+    attach_image_variants(questions, images)
+    images_body = json.dumps(images, sort_keys=True, separators=(',', ':'))
+    etag = '"%s"' % hashlib.sha256(f'{set_id}:{seed}:{variant["digest"]}:{images_body}'.encode('utf-8')).hexdigest()[:32]
+    return questions, etag
+
+
+def invalidate_question_bank(set_ids: Iterable[int]):
+    """Move sets to a new question bank version in every process."""
+    VocabularyExerciseSet.objects.filter(pk__in=list(set_ids)).update(content_version=F('content_version') + 1)
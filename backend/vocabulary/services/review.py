@@ -0,0 +1,119 @@
+from datetime import timedelta
+from typing import Dict, Iterable, List, Tuple
+
+from django.db.models import Q
+from django.utils import timezone
+
+from ..models import VocabularyEntry, WordReviewState
+from .audio import manifest_for_words
+from .image_variants import variants_for_names
+from .question_bank import attach_image_variants, build_questions, distractor_engine
+
+MIN_EASE = 1.3
+# A missed word comes back in the same session rather than tomorrow.
+RELEARN_DELAY = timedelta(minutes=10)
+# Correct answers slower than this count as hesitant (SM-2 grade 3 instead of 5).
+HESITANT_LATENCY_MS = 8000
+
+REVIEW_DEFAULT_LIMIT = 20
+REVIEW_MAX_LIMIT = 100
+
+
+def grade_answer(correct: bool, latency_ms=None) -> int:
+    if not correct:
+        return 1
+    if latency_ms is not None and latency_ms > HESITANT_LATENCY_MS:
+        return 3
+    return 5
+
+
+def schedule(state: WordReviewState, grade: int, reviewed_at):
+    """Apply one SM-2 step to ``state`` in place."""
+    if grade < 3:
+        state.repetitions = 0
+        state.interval_days = 0
+        state.lapses += 1
+        state.due_at = reviewed_at + RELEARN_DELAY
+    else:
+        state.repetitions += 1
+        if state.repetitions == 1:
+            state.interval_days = 1
+        elif state.repetitions == 2:
+            state.interval_days = 6
+        else:
+            state.interval_days = max(1, round(state.interval_days * state.ease))
+        state.due_at = reviewed_at + timedelta(days=state.interval_days)
+    state.ease = max(MIN_EASE, state.ease + 0.1 - (5 - grade) * (0.08 + (5 - grade) * 0.02))
+    state.last_reviewed_at = reviewed_at
+
+
+def apply_answers(answers: Iterable[Tuple]) -> int:
+    """Fold vocabulary answers into review states with batched reads and one upsert.
+
+    ``answers`` are ``(user_id, entry_id, correct, latency_ms, answered_at)``
+    tuples; answers for unknown entries are ignored. Returns the number of
+    states written.
+    """
+    answers = sorted((a for a in answers if a[1] is not None), key=lambda a: a[4])
+    if not answers:
+        return 0
+    entry_ids = set(VocabularyEntry.objects.filter(pk__in={a[1] for a in answers}).values_list('pk', flat=True))
+    answers = [a for a in answers if a[1] in entry_ids]
+    if not answers:
+        return 0
+    # Match exact (user, entry) pairs; a plain user__in/entry__in filter would
+    # read the cross product of both sets.
+    entries_by_user = {}
+    for a in answers:
+        entries_by_user.setdefault(a[0], set()).add(a[1])
+    states = {}
+    users = list(entries_by_user)
+    for i in range(0, len(users), 100):
+        match = Q()
+        for user_id in users[i:i + 100]:
+            match |= Q(user_id=user_id, entry_id__in=entries_by_user[user_id])
+        for s in WordReviewState.objects.filter(match):
+            states[(s.user_id, s.entry_id)] = s
+    now = timezone.now()
+    touched = {}
+    for user_id, entry_id, correct, latency_ms, answered_at in answers:
+        key = (user_id, entry_id)
+        state = states.get(key)
+        if state is None:
+            state = WordReviewState(user_id=user_id, entry_id=entry_id, due_at=answered_at)
+            states[key] = state
+        schedule(state, grade_answer(correct, latency_ms), answered_at)
+        state.updated_at = now
+        touched[key] = state
+    WordReviewState.objects.bulk_create(
+        list(touched.values()),
+        update_conflicts=True,
+        unique_fields=['user', 'entry'],
+        update_fields=['ease', 'interval_days', 'repetitions', 'lapses', 'due_at', 'last_reviewed_at', 'updated_at'],
+        batch_size=500,
+    )
+    return len(touched)
+
+
+def due_entries(user, limit: int, now=None) -> List[Dict]:
+    """The ``limit`` most overdue entries, read in ``(user, due_at)`` index order."""
+    now = now or timezone.now()
+    return list(
+        WordReviewState.objects
+        .filter(user=user, due_at__lte=now)
+        .order_by('due_at')
+        .values('entry_id', 'entry__word', 'entry__image_name', 'due_at')[:limit]
+    )
+
+
+def review_questions(user, limit: int) -> List[Dict]:
+    rows = due_entries(user, limit)
+    if not rows:
+        return []
+    entries = [{'id': r['entry_id'], 'word': r['entry__word'], 'image_name': r['entry__image_name']} for r in rows]
+    manifest = manifest_for_words(e['word'] for e in entries)
+    questions = build_questions(entries, distractor_engine(), manifest=manifest)
+    attach_image_variants(questions, variants_for_names(
+        item['image_name'] for q in questions for item in (q['prompt'], *q['options']) if 'image_name' in item
+    ))
+    return questions
@@ -0,0 +1,133 @@
+import os
+import shutil
+import subprocess
+import tempfile
+from io import BytesIO
+from typing import Dict, List
+
+from django.conf import settings
+
+
+class TTSError(Exception):
+    pass
+
+
+class BaseTTSBackend:
+    """Turns Spanish text into MP3 bytes.
+
+    Backends that can synthesize many texts in one engine invocation set
+    ``supports_batch`` and override :meth:`synthesize_batch`.
+    """
+
+    name = 'base'
+    supports_batch = False
+
+    def __init__(self, language: str = 'es'):
+        self.language = language
+
+    def synthesize(self, text: str) -> bytes:
+        raise NotImplementedError
+
+    def synthesize_batch(self, texts: List[str]) -> Dict[str, bytes]:
+        out = {}
+        for text in texts:
+            out[text] = self.synthesize(text)
+        return out
+
+
+class GTTSBackend(BaseTTSBackend):
+    name = 'gtts'
+
+    def synthesize(self, text: str) -> bytes:
+        try:
+            from gtts import gTTS
+        except Exception:
+            raise TTSError('gTTS is not installed')
+        buf = BytesIO()
+        gTTS(text=text, lang=self.language).write_to_fp(buf)
+        return buf.getvalue()
+
+
+def _run(cmd, input_bytes=None, timeout=120) -> bytes:
+    try:
+        proc = subprocess.run(cmd, input=input_bytes, stdout=subprocess.PIPE, stderr=subprocess.PIPE, timeout=timeout)
+    except FileNotFoundError:
+        raise TTSError(f'{cmd[0]} is not installed')
+    except subprocess.TimeoutExpired:
+        raise TTSError(f'{cmd[0]} timed out')
+    if proc.returncode != 0:
+        raise TTSError(proc.stderr.decode('utf-8', 'replace').strip() or f'{cmd[0]} exited with {proc.returncode}')
+    return proc.stdout
+
+
+def wav_to_mp3(wav: bytes) -> bytes:
+    """Encode WAV bytes as MP3 so local engines produce the same codec as gTTS."""
+    return _run([settings.TTS_FFMPEG_BINARY, '-hide_banner', '-loglevel', 'error', '-f', 'wav', '-i', 'pipe:0', '-f', 'mp3', 'pipe:1'], wav)
+
+
+class EspeakBackend(BaseTTSBackend):
+    name = 'espeak'
+
+    def synthesize(self, text: str) -> bytes:
+        # Text goes on stdin so a sentence starting with '-' is never read as an option.
+        wav = _run([settings.TTS_ESPEAK_BINARY, '-v', self.language, '--stdout', '--stdin'], text.encode('utf-8'))
+        return wav_to_mp3(wav)
+
+
+class PiperBackend(BaseTTSBackend):
+    """Local neural TTS; one piper process renders the whole batch.
+
+    Piper reads one utterance per stdin line and, with ``--output_dir``,
+    writes one WAV per line and prints its path. Line breaks inside a text are
+    sent as spaces; results are keyed by the original text.
+    """
+
+    name = 'piper'
+    supports_batch = True
+
+    def synthesize(self, text: str) -> bytes:
+        out = self.synthesize_batch([text])
+        if text not in out:
+            raise TTSError('No text to synthesize')
+        return out[text]
+
+    def synthesize_batch(self, texts: List[str]) -> Dict[str, bytes]:
+        texts = [t for t in texts if t and t.strip()]
+        if not texts:
+            return {}
+        lines = [' '.join(t.split()) for t in texts]
+        if not settings.TTS_PIPER_MODEL:
+            raise TTSError('TTS_PIPER_MODEL is not configured')
+        out_dir = tempfile.mkdtemp(prefix='piper-')
+        try:
+            stdout = _run(
+                [settings.TTS_PIPER_BINARY, '--model', settings.TTS_PIPER_MODEL, '--output_dir', out_dir],
+                input_bytes=('\n'.join(lines) + '\n').encode('utf-8'),
+                timeout=max(120, 5 * len(texts)),
+            )
+            paths = [line.strip() for line in stdout.decode('utf-8', 'replace').splitlines() if line.strip()]
+            if len(paths) != len(texts):
+                raise TTSError(f'piper returned {len(paths)} files for {len(texts)} lines')
+            out = {}
+            for text, path in zip(texts, paths):
+                with open(os.path.join(out_dir, os.path.basename(path)), 'rb') as fh:
+                    out[text] = wav_to_mp3(fh.read())
+            return out
+        finally:
+            shutil.rmtree(out_dir, ignore_errors=True)
+
+
+BACKENDS = {
+    GTTSBackend.name: GTTSBackend,
+    EspeakBackend.name: EspeakBackend,
+    PiperBackend.name: PiperBackend,
+}
+
+
+def get_backend(name: str = None) -> BaseTTSBackend:
+    name = name or settings.TTS_BACKEND
+    try:
+        cls = BACKENDS[name]
+    except KeyError:
+        raise TTSError(f'Unknown TTS backend: {name}')
+    return cls(language=settings.TTS_LANGUAGE)
@@ -0,0 +1,464 @@
+import base64
+import json
+import os
+import tempfile
+from datetime import datetime, timedelta, timezone as dt_timezone
+from io import BytesIO
+from unittest import mock
+
+import docx
+
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from authentication.models import User
+
+from .models import (
+    AnswerEvent, ExerciseImage, VocabularyEntry, VocabularyExerciseProgress, VocabularyExerciseSet, WordReviewState,
+)
+from .services import answer_events
+from .services.document_parser import MAX_DIAGNOSTICS, parse_text_lines
+from .services.document_reader import iter_docx_lines
+from .services.entry_diff import repair_entry_counts, sync_entries
+from .services.review import MIN_EASE, RELEARN_DELAY, apply_answers, due_entries, grade_answer, schedule
+from .services.image_catalog import (
+    UPLOAD_DUPLICATE, UPLOAD_SAVED, UPLOAD_UNCHANGED, delete_images, reconcile_catalog, store_uploaded_images,
+)
+
+
+class QuestionBankVersionTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(email='staff@example.com', username='staff@example.com', is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        for name in ('casa.png', 'perro.png', 'gato.png', 'libro.png'):
+            ExerciseImage.objects.create(name=name, storage_path=f'exercise_images/{name}')
+
+    def _answers(self, set_id):
+        response = self.client.get(f'/api/v1/vocabulary-exercises/exercise-sets/{set_id}/questions?seed=1')
+        self.assertEqual(response.status_code, 200)
+        return {q['answer'].get('word') or q['answer'].get('image_name') for q in response.json()['questions']}
+
+    def test_edit_reaches_a_process_with_a_warm_cache(self):
+        response = self.client.post('/api/v1/vocabulary-exercises/exercise-sets', {'words': [
+            {'word': 'casa', 'image_name': 'casa.png'},
+            {'word': 'perro', 'image_name': 'perro.png'},
+        ]}, format='json')
+        self.assertEqual(response.status_code, 201)
+        set_id = response.json()['id']
+
+        # Another worker with its own locmem cache serves the set first.
+        other_process = LocMemCache('other-process', {})
+        with mock.patch('vocabulary.services.question_bank.cache', other_process):
+            self.assertEqual(self._answers(set_id), {'casa', 'perro.png'})
+
+        response = self.client.put(f'/api/v1/vocabulary-exercises/exercise-sets/{set_id}', {'words': [
+            {'word': 'gato', 'image_name': 'gato.png'},
+            {'word': 'libro', 'image_name': 'libro.png'},
+        ]}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+        with mock.patch('vocabulary.services.question_bank.cache', other_process):
+            self.assertEqual(self._answers(set_id), {'gato', 'libro.png'})
+
+    def test_client_seeds_do_not_add_cache_entries(self):
+        response = self.client.post('/api/v1/vocabulary-exercises/exercise-sets', {'words': [
+            {'word': 'casa', 'image_name': 'casa.png'},
+            {'word': 'perro', 'image_name': 'perro.png'},
+        ]}, format='json')
+        set_id = response.json()['id']
+        cache = LocMemCache('seeds', {})
+        with mock.patch('vocabulary.services.question_bank.cache', cache):
+            url = f'/api/v1/vocabulary-exercises/exercise-sets/{set_id}/questions'
+            first = self.client.get(url, {'seed': 'a'})
+            entries = len(cache._cache)
+            for seed in ('b', 'c', 'd'):
+                self.assertEqual(self.client.get(url, {'seed': seed}).status_code, 200)
+            self.assertEqual(len(cache._cache), entries)
+            again = self.client.get(url, {'seed': 'a'})
+        self.assertEqual(again.json()['questions'], first.json()['questions'])
+        self.assertEqual(again['ETag'], first['ETag'])
+
+
+    def test_warm_bank_serves_a_prebuilt_variant(self):
+        response = self.client.post('/api/v1/vocabulary-exercises/exercise-sets', {'words': [
+            {'word': 'casa', 'image_name': 'casa.png'},
+            {'word': 'perro', 'image_name': 'perro.png'},
+        ]}, format='json')
+        set_id = response.json()['id']
+        url = f'/api/v1/vocabulary-exercises/exercise-sets/{set_id}/questions'
+        with mock.patch('vocabulary.services.question_bank.cache', LocMemCache('warm', {})):
+            first = self.client.get(url, {'seed': '7'})
+            # The set row and the image variant lookup; no catalog aggregate.
+            with self.assertNumQueries(2):
+                again = self.client.get(url, {'seed': '7'}, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(again.status_code, 304)
+
+    def test_image_upload_keeps_question_banks(self):
+        response = self.client.post('/api/v1/vocabulary-exercises/exercise-sets', {'words': [
+            {'word': 'casa', 'image_name': 'casa.png'},
+        ]}, format='json')
+        ex_set = VocabularyExerciseSet.objects.get(pk=response.json()['id'])
+        with tempfile.TemporaryDirectory() as media, override_settings(MEDIA_ROOT=media):
+            store_uploaded_images([SimpleUploadedFile('otra.png', b'png bytes')])
+        ex_set_after = VocabularyExerciseSet.objects.get(pk=ex_set.pk)
+        self.assertEqual(ex_set_after.content_version, ex_set.content_version)
+
+
+class ImageCatalogTests(TestCase):
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.media = media.name
+        settings_override = override_settings(MEDIA_ROOT=self.media)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        # Migration 0005 catalogs whatever MEDIA_ROOT held when the test database was built.
+        ExerciseImage.objects.all().delete()
+
+    def _path(self, storage_path):
+        return os.path.join(self.media, storage_path)
+
+    def test_same_bytes_are_stored_once(self):
+        results = store_uploaded_images([
+            SimpleUploadedFile('casa.png', b'same bytes'),
+            SimpleUploadedFile('hogar.png', b'same bytes'),
+        ])
+        self.assertEqual([r['status'] for r in results], [UPLOAD_SAVED, UPLOAD_DUPLICATE])
+        casa, hogar = ExerciseImage.objects.get(name='casa.png'), ExerciseImage.objects.get(name='hogar.png')
+        self.assertEqual(hogar.storage_path, casa.storage_path)
+        self.assertEqual(os.listdir(os.path.join(self.media, 'exercise_images')), ['casa.png'])
+
+        again = store_uploaded_images([SimpleUploadedFile('casa.png', b'same bytes')])
+        self.assertEqual(again[0]['status'], UPLOAD_UNCHANGED)
+
+    def test_delete_removes_row_and_file_once_unreferenced(self):
+        store_uploaded_images([
+            SimpleUploadedFile('casa.png', b'same bytes'),
+            SimpleUploadedFile('hogar.png', b'same bytes'),
+        ])
+        stored = self._path(ExerciseImage.objects.get(name='casa.png').storage_path)
+
+        self.assertEqual(delete_images(['casa.png']), ['casa.png'])
+        self.assertFalse(ExerciseImage.objects.filter(name='casa.png').exists())
+        # hogar.png still points at the file.
+        self.assertTrue(os.path.exists(stored))
+
+        self.assertEqual(delete_images(['hogar.png']), ['hogar.png'])
+        self.assertFalse(ExerciseImage.objects.exists())
+        self.assertFalse(os.path.exists(stored))
+
+    def test_images_endpoint_reads_the_catalog_not_the_directory(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create(email='staff@example.com', username='staff@example.com', is_staff=True))
+        response = client.post('/api/v1/vocabulary-exercises/images', {'images': [SimpleUploadedFile('casa.png', b'casa')]})
+        self.assertEqual(response.status_code, 201)
+        with mock.patch('os.listdir', side_effect=AssertionError('directory scanned')):
+            response = client.get('/api/v1/vocabulary-exercises/images')
+        self.assertEqual(response.json(), {'images': ['casa.png']})
+        client.delete('/api/v1/vocabulary-exercises/images?name=casa.png')
+        self.assertEqual(client.get('/api/v1/vocabulary-exercises/images').json(), {'images': []})
+
+    def test_reconcile_adds_files_and_drops_missing_rows(self):
+        os.makedirs(os.path.join(self.media, 'exercise_images'))
+        with open(os.path.join(self.media, 'exercise_images', 'nuevo.png'), 'wb') as fh:
+            fh.write(b'on disk')
+        ExerciseImage.objects.create(name='perdido.png', storage_path='exercise_images/perdido.png')
+
+        self.assertEqual(reconcile_catalog(), (1, 0, 1))
+        self.assertEqual(list(ExerciseImage.objects.values_list('name', 'size')), [('nuevo.png', 7)])
+
+
+class DocxReaderTests(TestCase):
+    def test_reads_body_paragraphs_like_python_docx(self):
+        document = docx.Document()
+        document.add_paragraph('casa - house')
+        table = document.add_table(rows=1, cols=2)
+        table.cell(0, 0).text = 'mesa'
+        table.cell(0, 1).text = 'table'
+        paragraph = document.add_paragraph('perro')
+        paragraph.add_run().add_break()
+        paragraph.add_run('gato')
+        buf = BytesIO()
+        document.save(buf)
+
+        expected = [line for p in docx.Document(buf).paragraphs for line in p.text.split('\n')]
+        self.assertEqual(list(iter_docx_lines(buf)), expected)
+        self.assertEqual(expected, ['casa - house', 'perro', 'gato'])
+
+
+class DocumentParserTests(TestCase):
+    def test_parses_and_reports_line_numbers(self):
+        parsed = parse_text_lines(iter([
+            'Vocabulary',
+            'word: casa',
+            'image name: casa.png',
+            'WORD: perro',
+            'TYPE: stray',
+            'EXERCISES',
+            'TYPE: IMAGE_TO_WORD',
+            'QUESTION: casa.png',
+            'OPTIONS: casa, perro,,',
+            'ANSWER: casa',
+        ]))
+        self.assertEqual(parsed['vocabulary'], [{'word': 'casa', 'imageName': 'casa.png'}, {'word': 'perro', 'imageName': ''}])
+        self.assertEqual(parsed['exercises'], [
+            {'type': 'IMAGE_TO_WORD', 'question': 'casa.png', 'options': ['casa', 'perro'], 'answer': 'casa'},
+        ])
+        self.assertEqual(
+            [(d['line'], d['code']) for d in parsed['diagnostics']],
+            [(4, 'missing_image_name'), (5, 'wrong_section')],
+        )
+
+    def test_noise_keeps_a_bounded_diagnostic_list(self):
+        parsed = parse_text_lines(['VOCABULARY'] + ['TYPE: stray'] * (MAX_DIAGNOSTICS + 50))
+        self.assertEqual(len(parsed['diagnostics']), MAX_DIAGNOSTICS)
+        self.assertEqual(parsed['diagnostics_dropped'], 50)
+
+
+class CursorTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create(email='learner@example.com', username='learner@example.com'))
+
+    def _cursor(self, value):
+        return base64.urlsafe_b64encode(json.dumps(value).encode('utf-8')).decode('ascii').rstrip('=')
+
+    def test_cursor_with_wrong_value_types_is_a_bad_request(self):
+        for value in (['2026-01-01T00:00:00', 'x'], ['2026-01-01T00:00:00', [1]], [5, 1], ['2026-13-45T00:00:00', 1]):
+            response = self.client.get('/api/v1/vocabulary-exercises/exercise-sets', {'cursor': self._cursor(value)})
+            self.assertEqual(response.status_code, 400, value)
+
+    def test_well_typed_cursor_pages(self):
+        response = self.client.get('/api/v1/vocabulary-exercises/exercise-sets', {'cursor': self._cursor(['2026-01-01T00:00:00+00:00', '7'])})
+        self.assertEqual(response.status_code, 200)
+
+
+class EntryDiffTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(email='staff@example.com', username='staff@example.com', is_staff=True)
+        self.ex_set = VocabularyExerciseSet.objects.create(title='Set', created_by=self.user)
+        self.casa = VocabularyEntry.objects.create(exercise_set=self.ex_set, word='casa', image_name='casa.png')
+        self.perro = VocabularyEntry.objects.create(exercise_set=self.ex_set, word='perro', image_name='perro.png')
+
+    def _sync(self, rows):
+        return sync_entries(
+            VocabularyEntry.objects.filter(exercise_set=self.ex_set),
+            rows,
+            key='word',
+            fields=('word', 'image_name'),
+            build=lambda row: VocabularyEntry(exercise_set=self.ex_set, **row),
+        )
+
+    def test_keeps_matched_rows_and_writes_only_the_difference(self):
+        summary, touched = self._sync([
+            {'word': 'Casa ', 'image_name': 'casa.png'},
+            {'word': 'gato', 'image_name': 'gato.png'},
+        ])
+        self.assertEqual(summary, {'created': 1, 'updated': 1, 'deleted': 1, 'unchanged': 0})
+        self.assertEqual([row['word'] for row in touched], ['Casa ', 'gato'])
+        casa = VocabularyEntry.objects.get(pk=self.casa.pk)
+        self.assertEqual(casa.word, 'Casa ')
+        self.assertEqual(casa.created_at, self.casa.created_at)
+        self.assertFalse(VocabularyEntry.objects.filter(pk=self.perro.pk).exists())
+
+    def test_identical_rows_are_unchanged(self):
+        summary, touched = self._sync([
+            {'word': 'casa', 'image_name': 'casa.png'},
+            {'word': 'perro', 'image_name': 'perro.png'},
+        ])
+        self.assertEqual(summary, {'created': 0, 'updated': 0, 'deleted': 0, 'unchanged': 2})
+        self.assertEqual(touched, [])
+
+
+class EntryCountTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(email='staff@example.com', username='staff@example.com', is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        for name in ('casa.png', 'perro.png', 'gato.png', 'libro.png'):
+            ExerciseImage.objects.create(name=name, storage_path=f'exercise_images/{name}')
+
+    def test_create_and_edit_keep_entry_count(self):
+        response = self.client.post('/api/v1/vocabulary-exercises/exercise-sets', {'words': [
+            {'word': 'casa', 'image_name': 'casa.png'},
+            {'word': 'perro', 'image_name': 'perro.png'},
+        ]}, format='json')
+        set_id = response.json()['id']
+        self.assertEqual(VocabularyExerciseSet.objects.get(pk=set_id).entry_count, 2)
+        self.client.put(f'/api/v1/vocabulary-exercises/exercise-sets/{set_id}', {'words': [
+            {'word': 'casa', 'image_name': 'casa.png'},
+            {'word': 'gato', 'image_name': 'gato.png'},
+            {'word': 'libro', 'image_name': 'libro.png'},
+        ]}, format='json')
+        self.assertEqual(VocabularyExerciseSet.objects.get(pk=set_id).entry_count, 3)
+        self.assertEqual(self.client.get('/api/v1/vocabulary-exercises/stats').json()['total_words'], 3)
+
+    def test_repair_entry_counts_fixes_drifted_sets(self):
+        ex_set = VocabularyExerciseSet.objects.create(title='Set', created_by=self.user)
+        VocabularyEntry.objects.create(exercise_set=ex_set, word='casa', image_name='casa.png')
+        empty = VocabularyExerciseSet.objects.create(title='Empty', created_by=self.user, entry_count=3)
+
+        self.assertEqual(repair_entry_counts(VocabularyExerciseSet), 2)
+        self.assertEqual(VocabularyExerciseSet.objects.get(pk=ex_set.pk).entry_count, 1)
+        self.assertEqual(VocabularyExerciseSet.objects.get(pk=empty.pk).entry_count, 0)
+        self.assertEqual(repair_entry_counts(VocabularyExerciseSet), 0)
+
+
+class ProgressSyncTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(email='learner@example.com', username='learner@example.com')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.ex_set = VocabularyExerciseSet.objects.create(title='Set', created_by=self.user)
+
+    def _sync(self, records):
+        response = self.client.post('/api/v1/vocabulary-exercises/progress/sync', {'records': records}, format='json')
+        self.assertEqual(response.status_code, 200)
+        return [r['status'] for r in response.json()['results']]
+
+    def test_records_without_event_id_dedupe_on_set_and_time(self):
+        record = {
+            'kind': 'vocabulary', 'set_id': self.ex_set.pk,
+            'correct_count': 8, 'total_count': 10, 'completed_at': '2026-01-02T10:00:00Z',
+        }
+        self.assertEqual(self._sync([record, record]), ['created', 'duplicate'])
+        self.assertEqual(self._sync([record]), ['duplicate'])
+        progress = VocabularyExerciseProgress.objects.get(user=self.user, exercise_set=self.ex_set)
+        self.assertEqual((progress.correct_count, progress.total_count), (8, 10))
+
+    def test_event_id_and_kind_are_checked(self):
+        base = {'set_id': self.ex_set.pk, 'correct_count': 1, 'total_count': 2}
+        self.assertEqual(self._sync([
+            dict(base, event_id='a1'),
+            dict(base, event_id='a1'),
+            dict(base),
+            dict(base, event_id='b1', kind='daily_routine'),
+            dict(base, event_id='', completed_at='2026-01-02T10:00:00Z'),
+            {'set_id': 0, 'event_id': 'c1'},
+        ]), ['created', 'duplicate', 'invalid', 'invalid', 'invalid', 'not_found'])
+
+
+@override_settings(ANSWER_EVENT_FLUSH_SIZE=2, ANSWER_EVENT_WRITE_ATTEMPTS=2)
+class AnswerEventTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(email='learner@example.com', username='learner@example.com')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        ex_set = VocabularyExerciseSet.objects.create(title='Set', created_by=self.user)
+        self.entry = VocabularyEntry.objects.create(exercise_set=ex_set, word='casa', image_name='casa.png')
+        self.buffer = answer_events.AnswerEventBuffer()
+        # Flush by hand: no background thread and no exit hook from the tests.
+        self.buffer._thread = True
+        patcher = mock.patch.object(answer_events, 'buffer', self.buffer)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _post(self, events):
+        return self.client.post('/api/v1/vocabulary-exercises/answer-events', {'events': events}, format='json')
+
+    def _event(self, **kw):
+        return dict({'set_id': self.entry.exercise_set_id, 'item_id': self.entry.pk, 'mode': 'word_to_image', 'correct': True}, **kw)
+
+    def test_events_are_validated_buffered_and_written(self):
+        response = self._post([self._event(), self._event(correct='yes'), self._event(mode='Bad Mode'), self._event()])
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json()['accepted'], 2)
+        self.assertEqual([r['index'] for r in response.json()['rejected']], [1, 2])
+        self.assertEqual(AnswerEvent.objects.count(), 0)
+
+        self.assertEqual(self.buffer.drain(), 2)
+        self.assertEqual(AnswerEvent.objects.filter(user=self.user, item_id=self.entry.pk).count(), 2)
+        state = WordReviewState.objects.get(user=self.user, entry=self.entry)
+        self.assertEqual((state.repetitions, state.interval_days), (2, 6))
+
+    def test_failed_batch_is_retried_then_dropped(self):
+        self._post([self._event()])
+        with mock.patch.object(answer_events, 'write_events', side_effect=RuntimeError('db down')), \
+                self.assertLogs(answer_events.logger, 'WARNING'):
+            self.assertEqual(self.buffer.flush(), 0)
+        self.assertEqual(self.buffer.pending(), 1)
+        self.assertFalse(WordReviewState.objects.exists())
+        self.assertEqual(self.buffer.flush(), 1)
+        self.assertEqual(AnswerEvent.objects.count(), 1)
+
+        self._post([self._event()])
+        with mock.patch.object(answer_events, 'write_events', side_effect=RuntimeError('db down')), \
+                self.assertLogs(answer_events.logger, 'WARNING') as logs:
+            self.assertEqual(self.buffer.drain(), 0)
+        self.assertIn('Dropping 1 answer events', logs.output[-1])
+        self.assertEqual(self.buffer.pending(), 0)
+        self.assertEqual(AnswerEvent.objects.count(), 1)
+
+    @override_settings(ANSWER_EVENT_BUFFER_MAX=1)
+    def test_full_buffer_is_refused(self):
+        self.assertEqual(self._post([self._event(), self._event()]).status_code, 503)
+        self.assertEqual(self.buffer.pending(), 0)
+
+
+class ReviewScheduleTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(email='learner@example.com', username='learner@example.com')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        ex_set = VocabularyExerciseSet.objects.create(title='Set', created_by=self.user)
+        self.entries = [
+            VocabularyEntry.objects.create(exercise_set=ex_set, word=word, image_name=f'{word}.png')
+            for word in ('casa', 'perro', 'gato', 'libro')
+        ]
+        self.t0 = datetime(2026, 1, 1, 9, 0, tzinfo=dt_timezone.utc)
+
+    def test_grades(self):
+        self.assertEqual(grade_answer(False), 1)
+        self.assertEqual(grade_answer(True, 1200), 5)
+        self.assertEqual(grade_answer(True, 20000), 3)
+        self.assertEqual(grade_answer(True), 5)
+
+    def test_intervals_grow_and_a_miss_resets(self):
+        state = WordReviewState(user=self.user, entry=self.entries[0], due_at=self.t0)
+        intervals = []
+        for _ in range(3):
+            schedule(state, 5, self.t0)
+            intervals.append(state.interval_days)
+        # Each interval uses the ease from before that step (2.5, 2.6, 2.7).
+        self.assertEqual(intervals, [1, 6, round(6 * 2.7)])
+        self.assertAlmostEqual(state.ease, 2.8)
+
+        schedule(state, 1, self.t0)
+        self.assertEqual((state.repetitions, state.interval_days, state.lapses), (0, 0, 1))
+        self.assertEqual(state.due_at, self.t0 + RELEARN_DELAY)
+        for _ in range(10):
+            schedule(state, 1, self.t0)
+        self.assertEqual(state.ease, MIN_EASE)
+
+    def test_apply_answers_folds_in_time_order(self):
+        casa, perro = self.entries[0].pk, self.entries[1].pk
+        written = apply_answers([
+            (self.user.pk, casa, True, 1000, self.t0 + timedelta(minutes=1)),
+            (self.user.pk, casa, False, 1000, self.t0),
+            (self.user.pk, perro, True, 20000, self.t0),
+            (self.user.pk, 999999, True, 1000, self.t0),
+            (self.user.pk, None, True, 1000, self.t0),
+        ])
+        self.assertEqual(written, 2)
+        casa_state = WordReviewState.objects.get(user=self.user, entry_id=casa)
+        # The miss came first, so the later correct answer starts a new run.
+        self.assertEqual((casa_state.lapses, casa_state.repetitions), (1, 1))
+        self.assertEqual(casa_state.due_at, self.t0 + timedelta(minutes=1, days=1))
+        perro_state = WordReviewState.objects.get(user=self.user, entry_id=perro)
+        self.assertLess(perro_state.ease, 2.5)
+
+    def test_review_serves_overdue_words_first(self):
+        for days, entry in ((3, self.entries[2]), (5, self.entries[0]), (-1, self.entries[1])):
+            WordReviewState.objects.create(
+                user=self.user, entry=entry, due_at=datetime.now(dt_timezone.utc) - timedelta(days=days),
+            )
+        response = self.client.get('/api/v1/vocabulary-exercises/review?limit=5')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['count'], 2)
+        self.assertEqual(
+            {q['entry_id'] for q in response.json()['questions']}, {self.entries[0].pk, self.entries[2].pk},
+        )
+        self.assertEqual([r['entry_id'] for r in due_entries(self.user, 5)], [self.entries[0].pk, self.entries[2].pk])
@@ -10,6 +10,10 @@ urlpatterns = [
     path('exercise-sets', views.exercise_sets),
     path('exercise-sets/<int:set_id>', views.exercise_set_detail),
     path('exercise-sets/<int:set_id>/questions', views.exercise_set_questions),
+    path('exercise-sets/<int:set_id>/audio-status', views.exercise_set_audio_status),
     path('progress', views.progress_summary),
     path('progress/<int:set_id>/complete', views.mark_completed),
+    path('progress/sync', views.progress_sync),
+    path('answer-events', views.answer_events),
+    path('review', views.review_now),
 ]
@@ -3,199 +3,101 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
-from django.db import transaction
-from django.core.files.base import ContentFile
+from django.db import IntegrityError, transaction
 from django.core.files.storage import default_storage
-from django.conf import settings
-from django.db.models import Count
-from django.utils.text import slugify
-from .models import Vocabulary, Exercise, LessonContent, VocabularyExerciseSet, VocabularyEntry, VocabularyExerciseProgress
+from django.db.models import Count, Sum
+from backend.pagination import InvalidPageRequest, keyset_page, parse_fields, wants_page
+from backend.progress_sync import MAX_SYNC_ITEMS, sync_progress, sync_response_data
+from .models import (
+    Vocabulary, Exercise, LessonContent, VocabularyExerciseSet, VocabularyEntry, VocabularyExerciseProgress, VocabularyProgressEvent,
+)
 from .serializers import ExerciseSerializer, VocabularyExerciseSetSerializer, VocabularyExerciseSetDetailSerializer
 from .services.document_parser import parse_text_lines
+from .services.document_reader import DocumentReadError, iter_document_lines
+from .services.parse_cache import document_token, get_parsed, store_parsed
+from .services.answer_events import MAX_EVENTS_PER_REQUEST, ingest_events
+from .services.audio import audio_file_name
+from .services.audio_queue import enqueue_words, audio_status_for_words
+from .services.entry_diff import bump_entry_count, normalize_key, sync_entries
+from .services.review import REVIEW_DEFAULT_LIMIT, REVIEW_MAX_LIMIT, review_questions
+from .services.question_bank import default_seed, invalidate_question_bank, seeded_questions
+from .services.image_catalog import (
+    UPLOAD_ERROR,
+    delete_images,
+    existing_images,
+    existing_image_names,
+    store_uploaded_images,
+)
 import os
 import re
-import hashlib
-from io import BytesIO
-import random
+import time
 from django.utils import timezone
 
-IMAGES_SUBDIR = 'exercise_images'
-LEGACY_IMAGES_SUBDIR = 'vocabulary_images'
-AUDIO_SUBDIR = 'exercise_audio'
+UPLOAD_BATCH_SIZE = 1000
 
-def _ensure_images_dir():
-    try:
-        os.makedirs(os.path.join(settings.MEDIA_ROOT, IMAGES_SUBDIR), exist_ok=True)
-    except Exception:
-        pass
-
-def _list_dir_names(subdir: str):
-    dir_path = os.path.join(settings.MEDIA_ROOT, subdir)
-    try:
-        return {f for f in os.listdir(dir_path) if os.path.isfile(os.path.join(dir_path, f))}
-    except Exception:
-        return set()
-
-def _migrate_legacy_images():
-    _ensure_images_dir()
-    legacy_dir = os.path.join(settings.MEDIA_ROOT, LEGACY_IMAGES_SUBDIR)
-    try:
-        legacy_names = [f for f in os.listdir(legacy_dir) if os.path.isfile(os.path.join(legacy_dir, f))]
-    except Exception:
-        legacy_names = []
-    for name in legacy_names:
-        safe = os.path.basename(name)
-        if safe != name:
-            continue
-        new_path = os.path.join(IMAGES_SUBDIR, safe)
-        if default_storage.exists(new_path):
-            continue
-        legacy_path = os.path.join(LEGACY_IMAGES_SUBDIR, safe)
-        try:
-            with default_storage.open(legacy_path, 'rb') as fh:
-                default_storage.save(new_path, ContentFile(fh.read()))
-        except Exception:
-            continue
-
-def _ensure_audio_dir():
-    try:
-        os.makedirs(os.path.join(settings.MEDIA_ROOT, AUDIO_SUBDIR), exist_ok=True)
-    except Exception:
-        pass
-
-def _audio_storage_path(word: str):
-    raw = (word or '').strip()
-    if not raw:
-        return None
-    h = hashlib.sha1(raw.encode('utf-8')).hexdigest()[:16]
-    base = slugify(raw)[:40] or 'word'
-    filename = f'{base}-{h}.mp3'
-    return os.path.join(AUDIO_SUBDIR, filename)
-
-def _audio_file_name(word: str):
-    p = _audio_storage_path(word)
-    return os.path.basename(p) if p else None
-
-def _ensure_audio_for_words(words):
-    _ensure_audio_dir()
-    try:
-        from gtts import gTTS
-    except Exception:
-        return False
-
-    for w in words:
-        storage_path = _audio_storage_path(w)
-        if not storage_path:
-            continue
-        if default_storage.exists(storage_path):
-            continue
-        try:
-            tts = gTTS(text=w, lang='es')
-            buf = BytesIO()
-            tts.write_to_fp(buf)
-            buf.seek(0)
-            default_storage.save(storage_path, ContentFile(buf.read()))
-        except Exception:
-            continue
-    return True
-
-def _get_random_other_words(exclude_word: str, k: int):
-    qs = VocabularyEntry.objects.exclude(word__iexact=exclude_word).values_list('word', flat=True).distinct()
-    pool = list(qs)
-    if len(pool) <= k:
-        return pool
-    return random.sample(pool, k)
-
-def _get_random_other_images(exclude_image: str, k: int):
-    qs = VocabularyEntry.objects.exclude(image_name=exclude_image).values_list('image_name', flat=True).distinct()
-    pool = list(qs)
-    if len(pool) <= k:
-        return pool
-    return random.sample(pool, k)
-
-def _existing_image_names():
-    _migrate_legacy_images()
-    return _list_dir_names(IMAGES_SUBDIR)
-
-def _preferred_storage_path(name: str):
+def _preferred_storage_path(name: str, catalog):
     safe = os.path.basename(name)
     if safe != name:
         return None
-    new_path = os.path.join(IMAGES_SUBDIR, safe)
-    if default_storage.exists(new_path):
-        return new_path
-    legacy_path = os.path.join(LEGACY_IMAGES_SUBDIR, safe)
-    if default_storage.exists(legacy_path):
-        try:
-            with default_storage.open(legacy_path, 'rb') as fh:
-                default_storage.save(new_path, ContentFile(fh.read()))
-            return new_path
-        except Exception:
-            return None
-    return None
-
-def read_document(file):
-    name = file.name.lower()
-    if name.endswith('.docx'):
-        try:
-            from docx import Document
-            doc = Document(file)
-            lines = []
-            for p in doc.paragraphs:
-                lines.append(p.text)
-            return lines
-        except Exception:
-            try:
-                import zipfile
-                import xml.etree.ElementTree as ET
-                file.seek(0)
-                with zipfile.ZipFile(file) as z:
-                    xml_bytes = z.read('word/document.xml')
-                root = ET.fromstring(xml_bytes)
-                ns = {'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'}
-                lines = []
-                for p in root.findall('.//w:p', ns):
-                    texts = []
-                    for t in p.findall('.//w:t', ns):
-                        if t.text:
-                            texts.append(t.text)
-                    line = ''.join(texts).strip()
-                    if line:
-                        lines.append(line)
-                return lines
-            except Exception:
-                return None
-    if name.endswith('.pdf'):
-        try:
-            from pdfminer.high_level import extract_text
-            text = extract_text(file)
-            return text.splitlines()
-        except Exception:
-            try:
-                import PyPDF2
-                file.seek(0)
-                reader = PyPDF2.PdfReader(file)
-                texts = []
-                for page in reader.pages:
-                    texts.append(page.extract_text() or '')
-                content = '\n'.join(texts)
-                return content.splitlines()
-            except Exception:
-                return None
-    return []
+    return catalog.get(safe)
+
+def _parse_document(document):
+    """Stream the document through the parser.
+
+    Returns ``(parsed, has_lines)``; raises ``DocumentReadError`` if the
+    document cannot be read.
+    """
+    line_count = 0
+
+    def counted(lines):
+        nonlocal line_count
+        for line in lines:
+            line_count += 1
+            yield line
+
+    parsed = parse_text_lines(counted(iter_document_lines(document)))
+    return parsed, line_count > 0
+
+def _load_parsed_document(document):
+    """Parse a document once per content hash.
+
+    Returns ``(token, entry)`` where ``entry`` holds the document ``name``,
+    ``parsed`` result and ``has_lines``; a cached entry is reused when the
+    same bytes were parsed within ``VOCABULARY_PARSE_CACHE_TTL``.
+    """
+    token = document_token(document)
+    entry = get_parsed(token)
+    if entry is None:
+        parsed, has_lines = _parse_document(document)
+        store_parsed(token, document.name, parsed, has_lines)
+        entry = {'name': document.name, 'parsed': parsed, 'has_lines': has_lines}
+    return token, entry
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def list_exercises(request):
-    qs = Exercise.objects.select_related('vocabulary').order_by('-created_at')
-    return Response(ExerciseSerializer(qs, many=True).data)
+    try:
+        fields = parse_fields(request, ExerciseSerializer.Meta.fields)
+        qs = Exercise.objects.order_by('-created_at')
+        if fields is None or 'vocabulary_word' in fields:
+            qs = qs.select_related('vocabulary')
+        if not wants_page(request):
+            return Response(ExerciseSerializer(qs, many=True, context={'fields': fields}).data)
+        rows, next_cursor = keyset_page(request, qs)
+    except InvalidPageRequest as e:
+        return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    return Response({
+        'results': ExerciseSerializer(rows, many=True, context={'fields': fields}).data,
+        'next_cursor': next_cursor,
+    })
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def stats(request):
+    totals = VocabularyExerciseSet.objects.aggregate(words=Sum('entry_count'), sets=Count('pk'))
     return Response({
-        'total_words': VocabularyEntry.objects.count(),
-        'total_exercises': VocabularyExerciseSet.objects.count(),
+        'total_words': totals['words'] or 0,
+        'total_exercises': totals['sets'],
         'pending_uploads': 0,
         'errors': 0,
     })
@@ -207,16 +109,17 @@ def parse(request):
     document = request.FILES.get('document')
     if not document:
         return Response({'detail': 'Document is required'}, status=status.HTTP_400_BAD_REQUEST)
-    lines = read_document(document)
-    if lines is None:
+    try:
+        token, entry = _load_parsed_document(document)
+    except DocumentReadError:
         return Response({'detail': 'Document parser is not installed'}, status=status.HTTP_400_BAD_REQUEST)
-    if not lines:
+    if not entry['has_lines']:
         return Response({'detail': 'No readable content found in document'}, status=status.HTTP_400_BAD_REQUEST)
-    parsed = parse_text_lines(lines)
+    parsed = entry['parsed']
     errors = []
     seen_words = set()
     seen_filenames = set()
-    image_names = _existing_image_names()
+    image_names = existing_image_names()
     for v in parsed['vocabulary']:
         w = v.get('word')
         img = v.get('imageName')
@@ -242,6 +145,7 @@ def parse(request):
         if t == 'IMAGE_TO_WORD' and q not in image_names:
             errors.append(f'Exercise image missing: {q}')
     parsed['errors'] = errors
+    parsed['token'] = token
     if not parsed['vocabulary'] and not parsed['exercises']:
         return Response({'detail': 'No vocabulary or exercises found. Please check the document format.'}, status=status.HTTP_400_BAD_REQUEST)
     return Response(parsed)
@@ -250,21 +154,37 @@ def parse(request):
 @permission_classes([IsAuthenticated])
 @parser_classes([MultiPartParser, FormParser])
 def upload(request):
-    document = request.FILES.get('document')
-    if not document:
-        return Response({'detail': 'Document is required'}, status=status.HTTP_400_BAD_REQUEST)
-    lines = read_document(document)
-    if lines is None:
-        return Response({'detail': 'Document parser is not installed'}, status=status.HTTP_400_BAD_REQUEST)
-    if not lines:
+    timings = {}
+    started = time.perf_counter()
+
+    def lap(stage):
+        nonlocal started
+        now = time.perf_counter()
+        timings[stage] = round((now - started) * 1000, 2)
+        started = now
+
+    # A token from a prior /parse call skips re-reading the document.
+    entry = get_parsed((request.data.get('token') or '').strip())
+    if entry is None:
+        document = request.FILES.get('document')
+        if not document:
+            return Response({'detail': 'Document is required'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            _, entry = _load_parsed_document(document)
+        except DocumentReadError:
+            return Response({'detail': 'Document parser is not installed'}, status=status.HTTP_400_BAD_REQUEST)
+    if not entry['has_lines']:
         return Response({'detail': 'No readable content found in document'}, status=status.HTTP_400_BAD_REQUEST)
-    parsed = parse_text_lines(lines)
+    parsed = entry['parsed']
+    lap('parse')
+
     errors = []
-    available_images = _existing_image_names()
+    catalog = existing_images()
+    lap('resolve_images')
     for v in parsed['vocabulary']:
         w = v.get('word')
         img = v.get('imageName')
-        if not w or not img or img not in available_images:
+        if not w or not img or img not in catalog:
             errors.append(f'Invalid vocabulary entry: {w} / {img}')
     for e in parsed['exercises']:
         t = e.get('type')
@@ -274,21 +194,36 @@ def upload(request):
         return Response({'detail': 'No vocabulary or exercises found. Please check the document format.'}, status=status.HTTP_400_BAD_REQUEST)
     if errors:
         return Response({'detail': 'Validation failed', 'errors': errors}, status=status.HTTP_400_BAD_REQUEST)
+
+    # Build every row in memory first; later duplicates in the document win,
+    # matching the upsert applied to rows that already exist.
+    vocab_rows = {}
+    for v in parsed['vocabulary']:
+        storage_path = _preferred_storage_path(v['imageName'], catalog)
+        if storage_path:
+            vocab_rows[v['word']] = Vocabulary(word=v['word'], image=storage_path)
+    lap('validate')
+
     with transaction.atomic():
-        lc = LessonContent.objects.create(title=os.path.splitext(document.name)[0], created_by=request.user)
+        lc = LessonContent.objects.create(title=os.path.splitext(entry['name'])[0], created_by=request.user)
+        Vocabulary.objects.bulk_create(
+            list(vocab_rows.values()),
+            batch_size=UPLOAD_BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=['word'],
+            update_fields=['image'],
+        )
         vocab_index = {}
-        for v in parsed['vocabulary']:
-            img_name = v['imageName']
-            storage_path = _preferred_storage_path(img_name)
-            if not storage_path:
-                continue
-            vocab = Vocabulary.objects.create(word=v['word'])
-            vocab.image.name = storage_path
-            vocab.save(update_fields=['image'])
-            vocab_index[v['word']] = vocab
+        words = list(vocab_rows)
+        for i in range(0, len(words), UPLOAD_BATCH_SIZE):
+            for vocab in Vocabulary.objects.filter(word__in=words[i:i + UPLOAD_BATCH_SIZE]):
+                vocab_index[vocab.word] = vocab
+        lap('insert_vocabulary')
+
+        exercise_rows = {}
         for e in parsed['exercises']:
             vocab = vocab_index.get(e['answer']) if e['type'] == 'IMAGE_TO_WORD' else vocab_index.get(e['question'])
-            Exercise.objects.create(
+            exercise_rows[(e['type'], e['question'])] = Exercise(
                 type=e['type'],
                 question=e['question'],
                 options=e['options'],
@@ -296,14 +231,28 @@ def upload(request):
                 vocabulary=vocab,
                 lesson_content=lc,
             )
-    return Response({'detail': 'Saved'}, status=status.HTTP_201_CREATED)
+        Exercise.objects.bulk_create(
+            list(exercise_rows.values()),
+            batch_size=UPLOAD_BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=['type', 'question'],
+            update_fields=['options', 'answer', 'vocabulary', 'lesson_content'],
+        )
+        lap('insert_exercises')
+
+    return Response({
+        'detail': 'Saved',
+        'vocabulary_count': len(vocab_rows),
+        'exercise_count': len(exercise_rows),
+        'timings_ms': timings,
+    }, status=status.HTTP_201_CREATED)
 
 @api_view(['GET', 'POST', 'DELETE'])
 @permission_classes([IsAuthenticated])
 @parser_classes([MultiPartParser, FormParser, JSONParser])
 def images(request):
     if request.method == 'GET':
-        names = sorted(_existing_image_names())
+        names = sorted(existing_image_names())
         return Response({'images': names})
     if request.method == 'DELETE':
         names = request.data.get('images') or []
@@ -313,42 +262,15 @@ def images(request):
                 names = [single]
         if not names:
             return Response({'detail': 'No images specified'}, status=status.HTTP_400_BAD_REQUEST)
-        deleted = []
-        for name in names:
-            # prevent path traversal
-            safe = os.path.basename(name)
-            if safe != name:
-                continue
-            storage_paths = [
-                os.path.join(IMAGES_SUBDIR, safe),
-                os.path.join(LEGACY_IMAGES_SUBDIR, safe),
-            ]
-            try:
-                did_delete = False
-                for p in storage_paths:
-                    if default_storage.exists(p):
-                        default_storage.delete(p)
-                        did_delete = True
-                if did_delete:
-                    deleted.append(safe)
-            except Exception:
-                continue
+        # delete_images skips names with path components (path traversal).
+        deleted = delete_images(names)
         return Response({'detail': 'Deleted', 'images': deleted})
     files = request.FILES.getlist('images')
     if not files:
         return Response({'detail': 'No images provided'}, status=status.HTTP_400_BAD_REQUEST)
-    saved = []
-    _ensure_images_dir()
-    for f in files:
-        name = os.path.basename(f.name)
-        if not name:
-            continue
-        storage_path = os.path.join(IMAGES_SUBDIR, name)
-        if default_storage.exists(storage_path):
-            default_storage.delete(storage_path)
-        default_storage.save(storage_path, f)
-        saved.append(name)
-    return Response({'detail': 'Uploaded', 'images': saved}, status=status.HTTP_201_CREATED)
+    results = store_uploaded_images(files)
+    saved = [r['name'] for r in results if r['status'] != UPLOAD_ERROR]
+    return Response({'detail': 'Uploaded', 'images': saved, 'results': results}, status=status.HTTP_201_CREATED)
 
 
 def _next_exercise_title():
@@ -382,41 +304,60 @@ def _parse_words_payload(payload):
     return out
 
 
+def _set_detail_data(ex_set):
+    words = ex_set.entries.values_list('word', flat=True)
+    context = {'audio_status': audio_status_for_words(words)}
+    return VocabularyExerciseSetDetailSerializer(ex_set, context=context).data
+
+
 @api_view(['GET', 'POST'])
 @permission_classes([IsAuthenticated])
 @parser_classes([JSONParser])
 def exercise_sets(request):
     if request.method == 'GET':
-        qs = VocabularyExerciseSet.objects.annotate(word_count=Count('entries')).order_by('-created_at')
-        return Response(VocabularyExerciseSetSerializer(qs, many=True).data)
+        try:
+            fields = parse_fields(request, VocabularyExerciseSetSerializer.Meta.fields)
+            qs = VocabularyExerciseSet.objects.order_by('-created_at')
+            if not wants_page(request):
+                return Response(VocabularyExerciseSetSerializer(qs, many=True, context={'fields': fields}).data)
+            rows, next_cursor = keyset_page(request, qs)
+        except InvalidPageRequest as e:
+            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({
+            'results': VocabularyExerciseSetSerializer(rows, many=True, context={'fields': fields}).data,
+            'next_cursor': next_cursor,
+        })
 
     items = _parse_words_payload(request.data.get('words'))
     if not items:
         return Response({'detail': 'No words provided'}, status=status.HTTP_400_BAD_REQUEST)
 
+    catalog = existing_images()
     valid = []
     seen = set()
     for word, img_name in items:
-        if word.lower() in seen:
+        key = normalize_key(word)
+        if key in seen:
             continue
-        storage_path = _preferred_storage_path(img_name)
+        storage_path = _preferred_storage_path(img_name, catalog)
         if not storage_path:
             continue
         valid.append((word, os.path.basename(img_name)))
-        seen.add(word.lower())
+        seen.add(key)
 
     if not valid:
         return Response({'detail': 'No valid rows (missing images)'}, status=status.HTTP_400_BAD_REQUEST)
 
-    _ensure_audio_for_words([w for (w, _) in valid])
-
     with transaction.atomic():
-        ex_set = VocabularyExerciseSet.objects.create(title=_next_exercise_title(), created_by=request.user)
+        ex_set = VocabularyExerciseSet.objects.create(
+            title=_next_exercise_title(), created_by=request.user, entry_count=len(valid),
+        )
         VocabularyEntry.objects.bulk_create([
             VocabularyEntry(exercise_set=ex_set, word=w, image_name=img) for (w, img) in valid
         ])
+        enqueue_words([w for (w, _) in valid])
 
-    data = VocabularyExerciseSetDetailSerializer(ex_set).data
+    data = _set_detail_data(ex_set)
     return Response(data, status=status.HTTP_201_CREATED)
 
 
@@ -430,36 +371,46 @@ def exercise_set_detail(request, set_id: int):
         return Response({'detail': 'Not found'}, status=status.HTTP_404_NOT_FOUND)
 
     if request.method == 'GET':
-        return Response(VocabularyExerciseSetDetailSerializer(ex_set).data)
+        return Response(_set_detail_data(ex_set))
 
     if request.method == 'DELETE':
         ex_set.delete()
         return Response({'detail': 'Deleted'}, status=status.HTTP_200_OK)
 
     items = _parse_words_payload(request.data.get('words'))
+    catalog = existing_images()
     valid = []
     seen = set()
     for word, img_name in items:
-        if word.lower() in seen:
+        key = normalize_key(word)
+        if key in seen:
             continue
-        storage_path = _preferred_storage_path(img_name)
+        storage_path = _preferred_storage_path(img_name, catalog)
         if not storage_path:
             continue
         valid.append((word, os.path.basename(img_name)))
-        seen.add(word.lower())
+        seen.add(key)
 
     if not valid:
         return Response({'detail': 'No valid rows (missing images)'}, status=status.HTTP_400_BAD_REQUEST)
 
-    _ensure_audio_for_words([w for (w, _) in valid])
-
     with transaction.atomic():
-        VocabularyEntry.objects.filter(exercise_set=ex_set).delete()
-        VocabularyEntry.objects.bulk_create([
-            VocabularyEntry(exercise_set=ex_set, word=w, image_name=img) for (w, img) in valid
-        ])
-
-    return Response(VocabularyExerciseSetDetailSerializer(ex_set).data, status=status.HTTP_200_OK)
+        ex_set = VocabularyExerciseSet.objects.select_for_update().get(pk=ex_set.pk)
+        changes, touched = sync_entries(
+            VocabularyEntry.objects.filter(exercise_set=ex_set),
+            [{'word': w, 'image_name': img} for (w, img) in valid],
+            key='word',
+            fields=('word', 'image_name'),
+            build=lambda row: VocabularyEntry(exercise_set=ex_set, **row),
+        )
+        bump_entry_count(VocabularyExerciseSet, ex_set.pk, changes['created'] - changes['deleted'])
+        enqueue_words([row['word'] for row in touched])
+        if changes['created'] or changes['updated'] or changes['deleted']:
+            invalidate_question_bank([ex_set.pk])
+
+    data = _set_detail_data(ex_set)
+    data['changes'] = changes
+    return Response(data, status=status.HTTP_200_OK)
 
 
 @api_view(['GET'])
@@ -470,40 +421,47 @@ def exercise_set_questions(request, set_id: int):
     except VocabularyExerciseSet.DoesNotExist:
         return Response({'detail': 'Not found'}, status=status.HTTP_404_NOT_FOUND)
 
-    entries = list(VocabularyEntry.objects.filter(exercise_set=ex_set).values('word', 'image_name'))
-    if not entries:
+    seed = (request.query_params.get('seed') or '').strip()[:64] or default_seed(request.user, ex_set.id)
+    questions, etag = seeded_questions(ex_set, seed)
+    if not questions:
         return Response({'detail': 'No words in this exercise'}, status=status.HTTP_400_BAD_REQUEST)
 
-    questions = []
-    for idx, e in enumerate(entries):
-        mode = 'image_to_text' if idx % 2 == 0 else 'audio_to_image'
-        if mode == 'image_to_text':
-            distractors = _get_random_other_words(e['word'], 2)
-            options = [e['word'], *distractors]
-            random.shuffle(options)
-            questions.append({
-                'mode': mode,
-                'prompt': {'image_name': e['image_name']},
-                'options': [{'word': w} for w in options],
-                'answer': {'word': e['word']},
-            })
-        else:
-            distractors = _get_random_other_images(e['image_name'], 2)
-            options = [e['image_name'], *distractors]
-            random.shuffle(options)
-            questions.append({
-                'mode': mode,
-                'prompt': {'audio_name': _audio_file_name(e['word']), 'word': e['word']},
-                'options': [{'image_name': n} for n in options],
-                'answer': {'image_name': e['image_name']},
-            })
-
-    random.shuffle(questions)
+    if etag in [t.strip() for t in request.META.get('HTTP_IF_NONE_MATCH', '').split(',')]:
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = Response({
+            'id': ex_set.id,
+            'title': ex_set.title,
+            'seed': seed,
+            'count': len(questions),
+            'questions': questions,
+        })
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def exercise_set_audio_status(request, set_id: int):
+    try:
+        ex_set = VocabularyExerciseSet.objects.get(pk=set_id)
+    except VocabularyExerciseSet.DoesNotExist:
+        return Response({'detail': 'Not found'}, status=status.HTTP_404_NOT_FOUND)
+
+    words = list(ex_set.entries.values_list('word', flat=True))
+    statuses = audio_status_for_words(words)
+    counts = {'ready': 0, 'pending': 0, 'failed': 0, 'missing': 0}
+    for st in statuses.values():
+        counts[st] = counts.get(st, 0) + 1
     return Response({
         'id': ex_set.id,
-        'title': ex_set.title,
-        'count': len(questions),
-        'questions': questions,
+        'total': len(words),
+        **counts,
+        'words': [
+            {'word': w, 'audio_name': audio_file_name(w), 'audio_status': statuses.get(w)}
+            for w in words
+        ],
     })
 
 
@@ -539,3 +497,51 @@ def mark_completed(request, set_id: int):
     obj.updated_at = timezone.now()
     obj.save(update_fields=['correct_count', 'total_count', 'completed_at', 'updated_at'])
     return Response({'detail': 'Saved'})
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+@parser_classes([JSONParser])
+def progress_sync(request):
+    records = request.data.get('records')
+    if not isinstance(records, list) or not records:
+        return Response({'detail': 'No records provided'}, status=status.HTTP_400_BAD_REQUEST)
+    if len(records) > MAX_SYNC_ITEMS:
+        return Response({'detail': f'At most {MAX_SYNC_ITEMS} records per request'}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        with transaction.atomic():
+            results = sync_progress(
+                request.user, records, VocabularyExerciseSet, VocabularyExerciseProgress, VocabularyProgressEvent,
+                'vocabulary',
+            )
+    except IntegrityError:
+        return Response({'detail': 'These events are already being synced; retry'}, status=status.HTTP_409_CONFLICT)
+    return Response(sync_response_data(results))
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+@parser_classes([JSONParser])
+def answer_events(request):
+    events = request.data.get('events')
+    if not isinstance(events, list) or not events:
+        return Response({'detail': 'No events provided'}, status=status.HTTP_400_BAD_REQUEST)
+    if len(events) > MAX_EVENTS_PER_REQUEST:
+        return Response({'detail': f'At most {MAX_EVENTS_PER_REQUEST} events per request'}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        accepted, rejected = ingest_events(request.user, events)
+    except OverflowError:
+        return Response({'detail': 'Too many pending events, retry later'}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+    return Response({'accepted': accepted, 'rejected': rejected}, status=status.HTTP_202_ACCEPTED)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def review_now(request):
+    try:
+        limit = int(request.query_params.get('limit') or REVIEW_DEFAULT_LIMIT)
+    except ValueError:
+        return Response({'detail': 'Invalid limit'}, status=status.HTTP_400_BAD_REQUEST)
+    limit = max(1, min(limit, REVIEW_MAX_LIMIT))
+    questions = review_questions(request.user, limit)
+    return Response({'count': len(questions), 'questions': questions})
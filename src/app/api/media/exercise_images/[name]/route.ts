@@ -2,25 +2,39 @@ import type { NextRequest } from 'next/server';
 
 export const dynamic = 'force-dynamic';
 
+const FORWARDED_REQUEST_HEADERS = ['range', 'if-range', 'if-none-match', 'if-modified-since'];
+const FORWARDED_RESPONSE_HEADERS = [
+  'content-type',
+  'content-length',
+  'content-range',
+  'accept-ranges',
+  'etag',
+  'last-modified',
+  'cache-control',
+];
+
 export async function GET(req: NextRequest, context: { params: Promise<{ name: string }> }) {
   try {
     const apiBase = process.env.NEXT_PUBLIC_API_BASE_URL || 'http://localhost:8000';
     const backend = apiBase.replace(/\/+$/, '');
     const { name } = await context.params;
     const safe = name;
-    const url = `${backend}/media/exercise_images/${encodeURIComponent(safe)}`;
-    const res = await fetch(url, { cache: 'no-store' });
-    if (!res.ok) {
+    const url = `${backend}/media/exercise_images/${encodeURIComponent(safe)}${req.nextUrl.search}`;
+    const headers: Record<string, string> = {};
+    for (const h of FORWARDED_REQUEST_HEADERS) {
+      const v = req.headers.get(h);
+      if (v) headers[h] = v;
+    }
+    const res = await fetch(url, { cache: 'no-store', headers });
+    if (!res.ok && res.status !== 304 && res.status !== 416) {
       return new Response('Not found', { status: res.status });
     }
-    const contentType = res.headers.get('content-type') || 'application/octet-stream';
-    const body = await res.arrayBuffer();
-    return new Response(body, {
-      headers: {
-        'content-type': contentType,
-        'cache-control': 'public, max-age=3600',
-      },
-    });
+    const out = new Headers();
+    for (const h of FORWARDED_RESPONSE_HEADERS) {
+      const v = res.headers.get(h);
+      if (v) out.set(h, v);
+    }
+    return new Response(res.status === 304 ? null : res.body, { status: res.status, headers: out });
   } catch {
     return new Response('Error', { status: 500 });
   }